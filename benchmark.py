@@ -0,0 +1,175 @@
+"""
+Benchmark memori dan alokasi partikel kembang api.
+Mengukur byte per partikel dan alokasi per frame saat salvo kembang api
+diluncurkan berturut-turut (seperti menekan spasi berkali-kali).
+
+Cara pakai:
+    python benchmark.py                      # ukur implementasi saat ini
+    python benchmark.py --compare DIR        # bandingkan dengan salinan lama
+                                             # (mis. hasil `git worktree add`)
+"""
+import argparse
+import gc
+import inspect
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+def deep_size(obj, seen=None):
+    # Ukuran objek beserta isi list/dict/__dict__ di dalamnya
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), seen)
+    return size
+
+def bytes_per_particle(fireworks):
+    # Implementasi array: ukuran satu baris semua array + handle Particle
+    systems = [fw.system for fw in fireworks if hasattr(fw, "system")]
+    if systems:
+        system = systems[0]
+        arrays = [value for value in vars(system).values() if hasattr(value, "nbytes")]
+        arrays += [value for value in vars(system.trails).values() if hasattr(value, "nbytes")]
+        row = sum(array.nbytes for array in arrays) / system.capacity
+        handles = system.views()[:1]
+        return row + (sys.getsizeof(handles[0]) if handles else 0)
+
+    # Implementasi objek: rata-rata ukuran objek Particle beserta ekornya
+    particles = [p for fw in fireworks for p in fw.particles]
+    return sum(deep_size(p) for p in particles) / max(1, len(particles))
+
+def run_show(firework, frames, salvo, interval, dt, seed, on_frame=None):
+    # Luncurkan `salvo` kembang api setiap `interval` frame dan render-akses semua partikel
+    shared = hasattr(firework, "update_fireworks")  # Sistem partikel bersama
+    if shared:
+        firework.particle_system.clear()
+    # Implementasi dengan stream acak per kembang api diberi stream yang
+    # diturunkan dari seed seperti Show.launch, agar bentuk ledakan sama di
+    # setiap run; implementasi lama memakai modul random yang sudah di-seed
+    streams = "rng" in inspect.signature(firework.Firework).parameters
+    if streams:
+        from show import derive_rng, FIREWORK_STREAM, TRAIL_STREAM
+        firework.particle_system.rng = derive_rng(seed, TRAIL_STREAM)
+    fireworks = []
+    launched = 0
+    peak = 0
+    for frame in range(frames):
+        if frame % interval == 0:
+            for _ in range(salvo):
+                position = [random.uniform(-5, 5), -8.0]
+                if streams:
+                    fireworks.append(firework.Firework(position, rng=derive_rng(seed, FIREWORK_STREAM, launched)))
+                else:
+                    fireworks.append(firework.Firework(position))
+                launched += 1
+        if shared:
+            fireworks = firework.update_fireworks(fireworks, dt)
+            particles = firework.particle_system.views()
+        else:
+            for fw in fireworks:
+                fw.update(dt)
+            fireworks = [fw for fw in fireworks if len(fw.particles) > 0]
+            particles = [p for fw in fireworks for p in fw.particles]
+        for p in particles:
+            (p.position, p.color, p.size, p.rotation, p.shape, p.trail, p.is_curve_end)
+        peak = max(peak, len(particles))
+        if on_frame:
+            on_frame(frame, fireworks)
+    return peak
+
+def measure(args):
+    if args.path:
+        sys.path.insert(0, os.path.abspath(args.path))
+    import firework
+
+    # Pass 1: waktu, jumlah koleksi GC, dan jeda GC terpanjang
+    collections = [0, 0, 0]
+    pauses = []
+    started = {}
+
+    def gc_callback(phase, info):
+        if phase == "start":
+            started["t"] = time.perf_counter()
+        else:
+            collections[info["generation"]] += 1
+            pauses.append(time.perf_counter() - started["t"])
+
+    sizes = []
+    def sample_size(frame, fireworks):
+        if frame == args.frames // 2:
+            sizes.append(bytes_per_particle(fireworks))
+
+    random.seed(args.seed)
+    gc.collect()
+    gc.callbacks.append(gc_callback)
+    t0 = time.perf_counter()
+    peak = run_show(firework, args.frames, args.salvo, args.interval, args.dt, args.seed, sample_size)
+    elapsed = time.perf_counter() - t0
+    gc.callbacks.remove(gc_callback)
+
+    # Pass 2: byte yang dialokasikan sementara per frame (tracemalloc)
+    transient = []
+    def sample_alloc(frame, fireworks):
+        current, frame_peak = tracemalloc.get_traced_memory()
+        transient.append(frame_peak - current)
+        tracemalloc.reset_peak()
+
+    random.seed(args.seed)
+    tracemalloc.start()
+    run_show(firework, args.frames, args.salvo, args.interval, args.dt, args.seed, sample_alloc)
+    tracemalloc.stop()
+
+    threshold = gc.get_threshold()[0]
+    return {
+        "path": os.path.abspath(args.path or "."),
+        "frames": args.frames,
+        "peak_particles": peak,
+        "bytes_per_particle": round(sizes[0] if sizes else 0.0, 1),
+        "gc_collections": collections,
+        # Perkiraan kasar: koleksi generasi 0 x ambang GC, hanya menghitung
+        # objek yang dilacak GC (alokasi dikurangi dealokasi), bukan alokasi nyata
+        "gc_tracked_allocations_per_frame": round(collections[0] * threshold / args.frames, 1),
+        "transient_kib_per_frame": round(sum(transient) / len(transient) / 1024, 1),
+        "max_gc_pause_ms": round(max(pauses, default=0.0) * 1000, 2),
+        "ms_per_frame": round(elapsed / args.frames * 1000, 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memori partikel kembang api")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--salvo", type=int, default=4, help="kembang api per salvo")
+    parser.add_argument("--interval", type=int, default=20, help="jarak antar salvo (frame)")
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--path", help="direktori implementasi yang diukur")
+    parser.add_argument("--compare", help="direktori implementasi lama sebagai pembanding")
+    args = parser.parse_args()
+
+    if not args.compare:
+        print(json.dumps(measure(args), indent=2))
+        return
+
+    # Jalankan setiap implementasi di proses terpisah agar modul tidak bercampur
+    results = {}
+    for label, path in (("before", args.compare), ("after", args.path or ".")):
+        command = [sys.executable, __file__, "--path", path]
+        for name in ("frames", "salvo", "interval", "dt", "seed"):
+            command += ["--" + name, str(getattr(args, name))]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        results[label] = json.loads(output[output.index("{"):])
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
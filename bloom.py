@@ -0,0 +1,147 @@
+"""
+Post-process bloom untuk cahaya kembang api dan bulan.
+Konten emisif digambar ke tekstur beresolusi rendah dan diblur terpisah
+(horizontal lalu vertikal); hasilnya diturunkan lagi ke level yang lebih
+kecil dan diblur untuk pendar lebar, digabung kembali ke level pertama,
+lalu ditambahkan secara aditif ke layar dengan satu persegi. Biayanya tetap per
+frame karena ukuran tekstur tidak bergantung pada jumlah partikel.
+Hanya memakai pipeline fixed-function, sama seperti modul render lain.
+"""
+from OpenGL.GL import *
+from scene import BLOOM_LEVEL_SCALE, BLOOM_TAPS, BLOOM_SIGMA, BLOOM_LEVEL_WEIGHTS, gaussian_weights
+
+class BloomLevel:
+    """Satu level bloom: tekstur hasil dan tekstur sementara untuk blur, masing-masing dengan FBO."""
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.textures = list(glGenTextures(2))
+        self.fbos = list(glGenFramebuffers(2))
+        for texture, fbo in zip(self.textures, self.fbos):
+            glBindTexture(GL_TEXTURE_2D, texture)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+            glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA16F, width, height, 0, GL_RGBA, GL_FLOAT, None)
+            glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+            glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, texture, 0)
+            if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+                raise RuntimeError("Framebuffer bloom tidak lengkap")
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+    @property
+    def texture(self):
+        return self.textures[0]
+
+    def bind(self, index=0):
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbos[index])
+        glViewport(0, 0, self.width, self.height)
+
+    def delete(self):
+        glDeleteFramebuffers(2, self.fbos)
+        glDeleteTextures(self.textures)
+
+
+class Bloom:
+    """
+    Kelas untuk pass bloom: begin() mengarahkan gambar ke level pertama,
+    end() menurunkan resolusi dan memblur, composite() menambahkan hasilnya
+    ke framebuffer yang aktif sebelum begin().
+    """
+    def __init__(self, width, height, downsample):
+        self.size = (width, height, downsample)
+        self.downsample = downsample
+        current = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        first = BloomLevel(max(1, width // downsample), max(1, height // downsample))
+        second = BloomLevel(max(1, first.width // BLOOM_LEVEL_SCALE), max(1, first.height // BLOOM_LEVEL_SCALE))
+        self.levels = [first, second]
+        glBindFramebuffer(GL_FRAMEBUFFER, current)
+        self.weights = gaussian_weights(BLOOM_TAPS, BLOOM_SIGMA)
+        self.previous_fbo = 0
+        self.previous_viewport = (0, 0, width, height)
+
+    def begin(self):
+        """Simpan target aktif lalu kosongkan level pertama sebagai target gambar."""
+        self.previous_fbo = glGetIntegerv(GL_FRAMEBUFFER_BINDING)
+        self.previous_viewport = tuple(glGetIntegerv(GL_VIEWPORT))
+        self.levels[0].bind()
+        glClearColor(0.0, 0.0, 0.0, 0.0)
+        glClear(GL_COLOR_BUFFER_BIT)
+
+    def _quad(self, dx=0.0, dy=0.0):
+        # Persegi penuh (proyeksi 0..1) dengan koordinat tekstur digeser
+        glBegin(GL_QUADS)
+        glTexCoord2f(dx, dy); glVertex2f(0, 0)
+        glTexCoord2f(1 + dx, dy); glVertex2f(1, 0)
+        glTexCoord2f(1 + dx, 1 + dy); glVertex2f(1, 1)
+        glTexCoord2f(dx, 1 + dy); glVertex2f(0, 1)
+        glEnd()
+
+    def _begin_passes(self):
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        glOrtho(0, 1, 0, 1, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+        glEnable(GL_TEXTURE_2D)
+        glBlendFunc(GL_ONE, GL_ONE)
+
+    def _end_passes(self):
+        glDisable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glColor4f(1.0, 1.0, 1.0, 1.0)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glPopMatrix()
+
+    def _blur(self, level, source, target, dx, dy):
+        # Satu arah blur: jumlahkan tap bergeser dengan bobot Gauss
+        level.bind(target)
+        glClear(GL_COLOR_BUFFER_BIT)
+        glBindTexture(GL_TEXTURE_2D, level.textures[source])
+        for i, weight in enumerate(self.weights):
+            offset = i - BLOOM_TAPS
+            glColor4f(weight, weight, weight, weight)
+            self._quad(offset * dx, offset * dy)
+
+    def _copy(self, texture, weight):
+        # Gambar tekstur ke target aktif dengan interpolasi linear dan bobot `weight`
+        glBindTexture(GL_TEXTURE_2D, texture)
+        glColor4f(weight, weight, weight, weight)
+        self._quad()
+
+    def end(self):
+        """Blur dan turunkan resolusi ke level kedua, gabungkan kembali, lalu kembalikan target semula."""
+        first, second = self.levels
+        self._begin_passes()
+        self._blur(first, 0, 1, 1.0 / first.width, 0.0)
+        self._blur(first, 1, 0, 0.0, 1.0 / first.height)
+
+        # Level pertama sudah diblur, jadi sampel linear cukup untuk menurunkan resolusi
+        second.bind()
+        glClear(GL_COLOR_BUFFER_BIT)
+        self._copy(first.texture, 1.0)
+        self._blur(second, 0, 1, 1.0 / second.width, 0.0)
+        self._blur(second, 1, 0, 0.0, 1.0 / second.height)
+
+        # Pendar lebar ditambahkan ke level pertama agar composite cukup satu persegi
+        first.bind()
+        self._copy(second.texture, BLOOM_LEVEL_WEIGHTS[1] / BLOOM_LEVEL_WEIGHTS[0])
+        self._end_passes()
+        glBindFramebuffer(GL_FRAMEBUFFER, self.previous_fbo)
+        glViewport(*self.previous_viewport)
+
+    def composite(self, intensity):
+        """Tambahkan hasil bloom ke framebuffer aktif dengan kekuatan `intensity`."""
+        self._begin_passes()
+        self._copy(self.levels[0].texture, intensity * BLOOM_LEVEL_WEIGHTS[0])
+        self._end_passes()
+
+    def delete(self):
+        for level in self.levels:
+            level.delete()
\ No newline at end of file
@@ -1,73 +1,375 @@
 """
 Kelas Building dan fungsi terkait untuk mengelola gedung di latar belakang.
+Kota dibuat sesuai kebutuhan dalam chunk selebar CHUNK_WIDTH piksel yang
+deterministik menurut indeks chunk, sehingga panorama bisa digeser sejauh
+apa pun. Chunk yang sudah dibuat disimpan di cache LRU berukuran tetap.
+Jendela setiap chunk dikumpulkan ke satu CityWindows, sehingga bisa
+digambar dengan satu panggilan dan dianimasikan secara vektor. Geometri
+chunk juga disimpan di disk (city_cache.py) untuk start berikutnya.
 """
 import random
-from config import width
+import struct
+import zlib
+from collections import OrderedDict
+import numpy as np
+from config import settings
+from camera import camera
+from city_cache import GeometryCache
 
-# Struktur data untuk menyimpan gedung
-buildings = {
-    "back": [],  # Layer belakang (siluet)
-    "main": [],  # Layer utama (dengan jendela)
-    "front": []  # Layer depan (opsional)
-}
+CHUNK_WIDTH = 1024          # Lebar satu chunk kota (piksel)
+MIN_BUILDING_WIDTH = 20     # Gedung terakhir chunk dipersempit sampai batas kanan, tapi tidak di bawah ini
+CHUNK_CACHE_SIZE = 8        # Jumlah chunk maksimum di cache (minimal sebanyak yang terlihat)
+
+WINDOW_WIDTH = 6
+WINDOW_HEIGHT = 10
+WINDOW_LIT = (1.0, 1.0, 0.7)        # Warna jendela menyala penuh
+WINDOW_DARK = (0.05, 0.05, 0.15)    # Warna jendela padam (sama dengan dinding gedung)
+WINDOW_STAY_LIT = 0.3               # Bagian jendela yang menyala sepanjang malam
+WINDOW_FLICKER = 0.04               # Bagian jendela yang berkedip (misal televisi)
+WINDOW_SEED = 42
+
+SHAPES = ("flat", "step", "tower", "eiffel", "chimney")
+CITY_GENERATOR = 2          # Naikkan jika algoritma pembangkit kota berubah (membuat kunci cache baru)
+
+# Parameter layer kota: belakang (siluet saja) lalu depan (dengan jendela)
+LAYERS = (
+    dict(min_height=250, max_height=350, density=0.8, with_window=False, y_offset=30),
+    dict(min_height=200, max_height=280, density=1.0, with_window=True, y_offset=0),
+)
+
+def stable_seed(*values):
+    """Seed dari bilangan bulat yang sama di semua proses dan versi Python (tidak seperti hash())."""
+    return zlib.crc32(struct.pack("<%dq" % len(values), *values))
+
+# Bertambah setiap kali kota dibuat ulang (untuk invalidasi cache render)
+city_version = 0
 
 class Building:
     """
     Kelas untuk mengelola gedung di latar belakang.
     Menangani properti dan tampilan gedung.
     """
-    def __init__(self, x, width_b, height_b, shape, with_window):
+    def __init__(self, x, width_b, height_b, shape, with_window, windows=None, polygons=None):
         # Properti dasar
         self.x = x
         self.width = width_b
         self.height = height_b
         self.shape = shape
         self.with_window = with_window
-        self.windows = []
+        self.windows = [] if windows is None else windows
+        self.polygons = polygons            # Poligon dari cache disk (None = hitung dari bentuk)
         
-        # Generate jendela jika diperlukan
-        if with_window:
-            old_state = random.getstate()
-            random_seed = hash((x, width_b, height_b)) % 10000
-            random.seed(random_seed)
-            self.generate_windows()
-            random.setstate(old_state)
+        # Generate jendela jika diperlukan (tidak perlu jika dimuat dari cache)
+        if with_window and windows is None:
+            self.generate_windows(random.Random(stable_seed(int(x), int(width_b), int(height_b))))
     
-    def generate_windows(self):
+    def outlines(self):
+        """Daftar poligon (list titik x, y) yang membentuk siluet gedung."""
+        if self.polygons is not None:
+            return self.polygons
+        x, w, h = self.x, self.width, self.height
+        if self.shape == "step":
+            return [[(x, 0), (x + w, 0), (x + w, h - 20), (x + w * 0.7, h - 20),
+                     (x + w * 0.7, h), (x + w * 0.3, h), (x + w * 0.3, h - 20), (x, h - 20)]]
+        if self.shape == "tower":
+            tower_w = w * 0.3
+            tower_x = x + (w - tower_w) / 2
+            return [[(x, 0), (x + w, 0), (x + w, h - 30), (tower_x + tower_w, h - 30),
+                     (tower_x + tower_w, h), (tower_x, h), (tower_x, h - 30), (x, h - 30)]]
+        if self.shape == "eiffel":
+            # Ujung seperti menara Eiffel (lebih tinggi & ramping)
+            return [[(x, 0), (x + w, 0), (x + w, h - 40), (x + w / 2 + 5, h - 40),
+                     (x + w / 2, h + 20), (x + w / 2 - 5, h - 40), (x, h - 40)]]
+        body = [(x, 0), (x + w, 0), (x + w, h), (x, h)]
+        if self.shape == "chimney":
+            # Cerobong asap
+            chimney_w = w * 0.2
+            chimney_x = x + (w - chimney_w) / 2
+            chimney_h = 25
+            return [body, [(chimney_x, h), (chimney_x + chimney_w, h),
+                           (chimney_x + chimney_w, h + chimney_h), (chimney_x, h + chimney_h)]]
+        return [body]
+    
+    def generate_windows(self, rng):
         col_count = int(self.width // 15)
         row_count = int(self.height // 15)  # Lebih banyak jendela secara vertikal
         for i in range(col_count):
             for j in range(row_count):
-                if random.random() > 0.5:  # Lebih banyak jendela (probabilitas tinggi)
+                if rng.random() > 0.5:  # Lebih banyak jendela (probabilitas tinggi)
                     continue
                 wx = self.x + 5 + i * 12
                 wy = 5 + j * 15  # Jarak antar jendela lebih pendek
-                if wy + 10 < self.height:
+                if wy + WINDOW_HEIGHT < self.height:
                     self.windows.append((wx, wy))
 
-def generate_building_layer(min_height, max_height, density=1.0, with_window=True, y_offset=0):
-    # Set seed agar konsisten
-    old_state = random.getstate()
-    random.seed(42 + hash(min_height + max_height) % 100)
+class CityWindows:
+    """
+    Kelas untuk menyimpan semua jendela kota sebagai array.
+    Setiap jendela punya kecerahan dasar, waktu padam, dan parameter kedip;
+    update() menghitung kecerahan semua jendela sekaligus dari waktu
+    simulasi, jadi animasinya sama untuk seed dan waktu yang sama.
+    """
+    def __init__(self):
+        self.positions = np.zeros((0, 2), dtype=np.float32)     # Pojok kiri bawah (x, y)
+        self.level = np.zeros(0, dtype=np.float32)              # Kecerahan saat menyala
+        self.off_time = np.zeros(0, dtype=np.float32)           # Waktu padam (inf = tidak padam)
+        self.flicker_rate = np.zeros(0, dtype=np.float32)       # Frekuensi kedip (0 = tidak berkedip)
+        self.flicker_phase = np.zeros(0, dtype=np.float32)
+        self.brightness = np.zeros(0, dtype=np.float32)         # Hasil update() terakhir
+        self.version = 0                                        # Bertambah saat kecerahan berubah
+
+    @property
+    def count(self):
+        return len(self.positions)
+
+    def build(self, positions, seed=WINDOW_SEED):
+        """Simpan posisi jendela (n, 2) dan acak parameter animasinya."""
+        self.positions = np.array(positions, dtype=np.float32).reshape(-1, 2)
+        n = len(self.positions)
+        rng = np.random.default_rng(seed)
+        self.level = rng.uniform(0.8, 1.0, n).astype(np.float32)
+        self.off_time = rng.uniform(0.1, 1.0, n).astype(np.float32) * settings.night_length
+        self.off_time[rng.random(n) < WINDOW_STAY_LIT] = np.inf
+        if settings.night_length <= 0:
+            self.off_time[:] = np.inf
+        flicker = rng.random(n) < WINDOW_FLICKER
+        self.flicker_rate = np.where(flicker, rng.uniform(2.0, 6.0, n), 0.0).astype(np.float32)
+        self.flicker_phase = rng.uniform(0.0, 2 * np.pi, n).astype(np.float32)
+        self.brightness = self.level.copy()
+        self.version += 1
+
+    def update(self, time):
+        """Hitung kecerahan semua jendela pada waktu `time`; kembalikan True jika berubah."""
+        brightness = np.where(time < self.off_time, self.level, 0.0).astype(np.float32)
+        if settings.night_length > 0:
+            flickering = self.flicker_rate > 0
+            wave = np.sin(self.flicker_rate[flickering] * time + self.flicker_phase[flickering])
+            brightness[flickering] *= 0.75 + 0.25 * wave
+        if np.array_equal(brightness, self.brightness):
+            return False
+        self.brightness = brightness
+        self.version += 1
+        return True
+
+    def colors(self):
+        """Warna RGB per jendela (n, 3) dari kecerahan saat ini."""
+        dark, lit = np.array(WINDOW_DARK, dtype=np.float32), np.array(WINDOW_LIT, dtype=np.float32)
+        return dark + (lit - dark) * self.brightness[:, None]
+
+def generate_building_layer(min_height, max_height, density=1.0, with_window=True, y_offset=0,
+                            start=0, end=None, chunk=0):
+    # Stream acak lokal agar konsisten (per layer dan per chunk; chunk 0
+    # memakai seed lama) tanpa menyentuh state random global
+    seed = 42 + (min_height + max_height) % 100
+    rng = random.Random(seed if chunk == 0 else stable_seed(seed, chunk))
     
     layer = []
-    x = 0
-    while x < width:
-        w = random.randint(50, 90)
-        h = random.randint(min_height, max_height)
-        shape = random.choice(["flat", "step", "tower", "eiffel", "chimney"])
+    x = start
+    end = settings.width if end is None else end
+    while x < end:
+        w = rng.randint(50, 90)
+        h = rng.randint(min_height, max_height)
+        shape = rng.choice(SHAPES)
+        # Gedung tidak boleh melewati batas kanan, tempat chunk berikutnya
+        # dimulai; sisa ruang diisi gedung yang lebih sempit
+        w = min(w, end - x)
+        if w < MIN_BUILDING_WIDTH:
+            break
         building = Building(x, w, h + y_offset, shape, with_window)
         layer.append(building)
-        x += int(w * density) + random.randint(3, 12)
-    
-    # Kembalikan state random
-    random.setstate(old_state)
+        x += int(w * density) + rng.randint(3, 12)
     return layer
 
+class CityChunk:
+    """
+    Kelas untuk satu potong kota selebar CHUNK_WIDTH mulai dari index * CHUNK_WIDTH.
+    Isinya hanya bergantung pada indeks, jadi chunk yang digusur dari cache
+    dibuat ulang persis sama. Geometri disimpan sebagai array paket (lihat
+    pack()), yang dari cache disk berupa view memory map; objek Building
+    (`back`, `main`) baru dibuat saat backend render pertama kali memakainya.
+    `baked` menyimpan geometri siap gambar milik backend render (misal
+    display list atau masker piksel).
+    """
+    def __init__(self, index, data=None):
+        self.index = index
+        self.start = index * CHUNK_WIDTH
+        self.end = self.start + CHUNK_WIDTH
+        self._layers = None
+        if data is None:
+            # Chunk baru juga dibaca dari array paketnya, sehingga geometrinya
+            # sama persis dengan yang nanti dimuat dari disk
+            self._layers = [generate_building_layer(start=self.start, end=self.end, chunk=index, **params)
+                            for params in LAYERS]
+            data = self.pack()
+            self._layers = None
+        self.data = data
+        self.tables = self._tables(data)
+        buildings, polygons, vertices, windows = self.tables
+        # Puncak tertinggi chunk untuk culling vertikal (dasar chunk di y = 0)
+        self.top = float(vertices[:, 1].max()) if len(vertices) else 0.0
+        positions = windows[:, 1:].astype(np.float64)
+        positions[:, 0] += self.start
+        self.windows = CityWindows()
+        self.windows.build(positions, seed=stable_seed(WINDOW_SEED, index))
+        self.baked = {}
+
+    @property
+    def back(self):
+        """Gedung layer belakang (siluet saja)."""
+        return self._buildings()[0]
+
+    @property
+    def main(self):
+        """Gedung layer depan (dengan jendela)."""
+        return self._buildings()[1]
+
+    def _buildings(self):
+        if self._layers is None:
+            self._layers = self._unpack()
+        return self._layers
+
+    def pack(self):
+        """
+        Geometri chunk sebagai satu array float32 datar: jumlah (gedung,
+        poligon, vertex, jendela), lalu tabel gedung (layer, x, lebar, tinggi,
+        bentuk), poligon (gedung, vertex awal, jumlah vertex), vertex (x, y),
+        dan jendela (gedung, x, y). Koordinat x relatif terhadap awal chunk
+        agar tetap presisi untuk indeks chunk yang besar.
+        """
+        buildings, polygons, vertices, windows = [], [], [], []
+        for layer, items in enumerate((self.back, self.main)):
+            for item in items:
+                owner = len(buildings)
+                buildings.append((layer, item.x - self.start, item.width, item.height, SHAPES.index(item.shape)))
+                for outline in item.outlines():
+                    polygons.append((owner, len(vertices), len(outline)))
+                    vertices += [(x - self.start, y) for x, y in outline]
+                windows += [(owner, x - self.start, y) for x, y in item.windows]
+        header = [len(buildings), len(polygons), len(vertices), len(windows)]
+        return np.concatenate([np.array(header, dtype=np.float32)] +
+                              [np.array(table, dtype=np.float32).reshape(-1) for table in
+                               (buildings, polygons, vertices, windows)])
+
+    @staticmethod
+    def _tables(data):
+        # Pecah array paket menjadi view tabel (gedung, poligon, vertex,
+        # jendela); ValueError jika isinya tidak konsisten (file cache rusak)
+        if data.ndim != 1 or data.dtype != np.float32 or len(data) < 4:
+            raise ValueError("array chunk tidak valid")
+        header = np.asarray(data[:4], dtype=np.float64)
+        if not np.all(np.isfinite(header)) or np.any(header < 0) or np.any(header != np.floor(header)):
+            raise ValueError("header chunk tidak valid")
+        counts = header.astype(np.intp)
+        columns = (5, 3, 2, 3)
+        if len(data) != 4 + int(np.dot(counts, columns)):
+            raise ValueError("panjang chunk tidak sesuai header")
+        tables, offset = [], 4
+        for count, width in zip(counts, columns):
+            tables.append(np.asarray(data[offset:offset + count * width]).reshape(count, width))
+            offset += count * width
+        buildings, polygons, vertices, windows = tables
+        owners = len(buildings)
+        if not (np.all(np.isfinite(data)) and np.isin(buildings[:, 0], (0, 1)).all() and
+                ((buildings[:, 4] >= 0) & (buildings[:, 4] < len(SHAPES))).all() and
+                ((polygons[:, 0] >= 0) & (polygons[:, 0] < owners)).all() and
+                ((polygons[:, 1] >= 0) & (polygons[:, 2] > 0) &
+                 (polygons[:, 1] + polygons[:, 2] <= len(vertices))).all() and
+                ((windows[:, 0] >= 0) & (windows[:, 0] < owners)).all()):
+            raise ValueError("tabel chunk tidak valid")
+        return tables
+
+    def _unpack(self):
+        # Kebalikan pack(): bangun objek Building tanpa membangkitkan ulang
+        buildings, polygons, vertices, windows = self.tables
+        vertices = vertices.astype(np.float64)
+        vertices[:, 0] += self.start
+        windows = windows.astype(np.float64)
+        windows[:, 1] += self.start
+
+        outlines = [[] for _ in buildings]
+        for owner, first, count in polygons.astype(np.intp):
+            outlines[owner].append([tuple(vertex) for vertex in vertices[first:first + count].tolist()])
+        owned = [[] for _ in buildings]
+        for owner, x, y in windows.tolist():
+            owned[int(owner)].append((x, y))
+
+        layers = ([], [])
+        for i, (layer, x, width_b, height_b, shape) in enumerate(buildings.tolist()):
+            layers[int(layer)].append(Building(int(x) + self.start, int(width_b), int(height_b), SHAPES[int(shape)],
+                                               bool(layer), windows=owned[i], polygons=outlines[i]))
+        return layers
+
+
+class City:
+    """
+    Kelas untuk kota yang dibuat per chunk sesuai pandangan.
+    Chunk disimpan di cache LRU berukuran tetap, sehingga memori tetap datar
+    sejauh apa pun pandangan digeser. `view_x` adalah geseran panorama dalam
+    piksel kota; posisi kota di layar ditentukan kamera (camera.py).
+    """
+    def __init__(self, maxsize=CHUNK_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.chunks = OrderedDict()
+        self.view_x = 0.0
+        self.disk = GeometryCache(dict(generator=CITY_GENERATOR, chunk_width=CHUNK_WIDTH, layers=LAYERS,
+                                       window=(WINDOW_WIDTH, WINDOW_HEIGHT)))
+
+    def chunk(self, index):
+        """Chunk `index` dari cache, lalu dari cache disk, dan dibangkitkan jika belum ada."""
+        chunk = self.chunks.get(index)
+        if chunk is not None:
+            self.chunks.move_to_end(index)
+            return chunk
+        chunk = None
+        data = self.disk.load(index)
+        if data is not None:
+            try:
+                chunk = CityChunk(index, data)
+            except ValueError:
+                # File cache rusak atau terpotong: hapus lalu bangkitkan ulang
+                self.disk.discard(index)
+        if chunk is None:
+            chunk = CityChunk(index)
+            self.disk.save(index, chunk.data)
+        self.chunks[index] = chunk
+        return chunk
+
+    def visible(self, left=None, right=None):
+        """
+        Chunk yang beririsan dengan rentang x [left, right) piksel kota, urut
+        dari kiri. Tanpa argumen rentangnya adalah pandangan kamera, dan chunk
+        yang seluruhnya di bawah atau di atas pandangan juga dibuang.
+        """
+        bottom, top = -np.inf, np.inf
+        if left is None:
+            left, right, bottom, top = camera.city_bounds(self.view_x)
+        first = int(left // CHUNK_WIDTH)
+        last = int(np.ceil(right / CHUNK_WIDTH))
+        chunks = [self.chunk(index) for index in range(first, last)] if top > 0 else []
+        # Gusur chunk yang paling lama tidak dipakai, tapi jangan yang sedang terlihat
+        while len(self.chunks) > max(self.maxsize, len(chunks)):
+            self.chunks.popitem(last=False)
+        return [chunk for chunk in chunks if chunk.top > bottom]
+
+    def contains(self, chunk):
+        """True jika objek chunk ini masih ada di cache (belum digusur)."""
+        return self.chunks.get(chunk.index) is chunk
+
+    def update(self, time):
+        """Geser pandangan sesuai settings.scroll_speed dan animasikan jendela chunk yang terlihat."""
+        self.view_x = time * settings.scroll_speed
+        for chunk in self.visible():
+            chunk.windows.update(time)
+
+    def clear(self):
+        self.chunks.clear()
+
+# Kota bersama untuk semua backend render
+city = City()
+
 def generate_city():
-    # Layer belakang - gedung tinggi, siluet saja
-    buildings["back"] = generate_building_layer(min_height=250, max_height=350, density=0.8, with_window=False, y_offset=30)
-    # Layer depan - gedung utama dengan jendela
-    buildings["main"] = generate_building_layer(min_height=200, max_height=280, density=1.0, with_window=True)
-    # Hapus layer pengisi (front)
-    buildings["front"] = [] 
\ No newline at end of file
+    """Buang semua chunk sehingga kota dibuat ulang saat berikutnya terlihat."""
+    global city_version
+    city.clear()
+    city.view_x = 0.0
+    city_version += 1 
\ No newline at end of file
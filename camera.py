@@ -0,0 +1,117 @@
+"""
+Kamera 2D: satu transformasi dunia -> layar untuk kota dan kembang api.
+Satuan dunia adalah satuan kembang api dan tidak bergantung resolusi: pada
+zoom 1 layar setinggi settings.view_height satuan, sehingga layar yang lebih
+tinggi hanya memperhalus gambar dan layar yang lebih lebar memperlihatkan
+lebih banyak panorama. Kota dibangkitkan dalam piksel kota (CITY_UNIT per
+satuan dunia) dan ditempatkan di dunia mulai CITY_ORIGIN. Langit, bintang,
+dan bulan tetap di ruang layar (jauh tak berhingga).
+"""
+import numpy as np
+from config import settings
+
+CITY_UNIT = 100.0           # Piksel kota per satuan dunia
+CITY_ORIGIN = (-6.4, -1.0)  # Posisi dunia titik (0, 0) kota: tepi kiri chunk 0 di permukaan tanah
+ZOOM_LIMITS = (0.25, 16.0)  # Batas zoom kamera interaktif
+
+class Camera:
+    """
+    Kelas untuk pusat pandangan (x, y) dalam satuan dunia dan zoom.
+    Transformasi dipakai dalam format (geser x, geser y, skala) yang sama
+    dengan transformasi RenderQueue.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Kembalikan pandangan ke posisi awal dari settings."""
+        self.x = settings.camera_x
+        self.y = settings.camera_y
+        self.zoom = settings.camera_zoom
+        self._clamp()
+
+    def _clamp(self):
+        # Pandangan tidak boleh keluar dari world_bounds (tepi bawahnya
+        # permukaan tanah), karena simulasi membuang partikel di luarnya
+        self.zoom = min(max(self.zoom, ZOOM_LIMITS[0]), ZOOM_LIMITS[1])
+        left, right, bottom, top = world_bounds()
+        half_width = settings.width / 2 / self.scale
+        half_height = settings.height / 2 / self.scale
+        self.x = min(max(self.x, left + half_width), right - half_width)
+        self.y = min(max(self.y, bottom + half_height), top - half_height)
+
+    @property
+    def scale(self):
+        """Piksel layar per satuan dunia."""
+        return self.zoom * settings.height / settings.view_height
+
+    def transform(self):
+        """Transformasi dunia -> layar (geser x, geser y, skala)."""
+        scale = self.scale
+        return (settings.width / 2 - self.x * scale, settings.height / 2 - self.y * scale, scale)
+
+    def to_screen(self, position):
+        """Konversi array posisi dunia (n, 2) ke koordinat layar (piksel)."""
+        tx, ty, scale = self.transform()
+        screen = np.empty_like(position)
+        screen[:, 0] = position[:, 0] * scale + tx
+        screen[:, 1] = position[:, 1] * scale + ty
+        return screen
+
+    def to_world(self, sx, sy):
+        """Konversi satu titik layar (piksel, y ke atas) ke koordinat dunia."""
+        tx, ty, scale = self.transform()
+        return (sx - tx) / scale, (sy - ty) / scale
+
+    def bounds(self, margin=0.0):
+        """Batas dunia yang terlihat (kiri, kanan, bawah, atas), diperlebar `margin` satuan."""
+        half_width = settings.width / 2 / self.scale + margin
+        half_height = settings.height / 2 / self.scale + margin
+        return (self.x - half_width, self.x + half_width, self.y - half_height, self.y + half_height)
+
+    def city_transform(self, view_x):
+        """
+        Transformasi piksel kota (digeser panorama sejauh `view_x`) -> layar.
+        Geserannya dibulatkan ke piksel utuh agar tepi gedung tetap tajam.
+        """
+        tx, ty, scale = self.transform()
+        return (float(round(tx + (CITY_ORIGIN[0] - view_x / CITY_UNIT) * scale)),
+                float(round(ty + CITY_ORIGIN[1] * scale)), scale / CITY_UNIT)
+
+    def city_bounds(self, view_x):
+        """Batas terlihat (kiri, kanan, bawah, atas) dalam piksel kota, digeser panorama `view_x`."""
+        left, right, bottom, top = self.bounds()
+        return ((left - CITY_ORIGIN[0]) * CITY_UNIT + view_x, (right - CITY_ORIGIN[0]) * CITY_UNIT + view_x,
+                (bottom - CITY_ORIGIN[1]) * CITY_UNIT, (top - CITY_ORIGIN[1]) * CITY_UNIT)
+
+    def pan(self, dx, dy):
+        """Seret isi layar sejauh (dx, dy) piksel (pandangan bergerak berlawanan arah)."""
+        self.x -= dx / self.scale
+        self.y -= dy / self.scale
+        self._clamp()
+
+    def zoom_at(self, factor, sx, sy):
+        """Kalikan zoom dengan `factor` sambil menahan titik layar (sx, sy) di tempatnya."""
+        wx, wy = self.to_world(sx, sy)
+        self.zoom = min(max(self.zoom * factor, ZOOM_LIMITS[0]), ZOOM_LIMITS[1])
+        self.x = wx - (sx - settings.width / 2) / self.scale
+        self.y = wy - (sy - settings.height / 2) / self.scale
+        self._clamp()
+
+def world_bounds(margin=0.0):
+    """
+    Batas dunia yang bisa dicapai kamera (kiri, kanan, bawah, atas):
+    pandangan pada zoom terkecil, berpusat mendatar di panggung dengan tepi
+    bawah di permukaan tanah. Kamera dijepit di dalamnya dan simulasi
+    membuang partikel di luarnya, sehingga pan dan zoom tidak mengubah
+    partikel mana yang dibuang dan partikel tidak pernah hilang di tengah
+    pandangan.
+    """
+    half_width = settings.width / 2 * settings.view_height / settings.height / ZOOM_LIMITS[0] + margin
+    height = settings.view_height / ZOOM_LIMITS[0]
+    bottom = CITY_ORIGIN[1]
+    return (settings.camera_x - half_width, settings.camera_x + half_width,
+            bottom - margin, bottom + height + margin)
+
+# Kamera bersama untuk semua backend render
+camera = Camera()
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Cache geometri kota di disk untuk start yang lebih cepat.
+Setiap chunk kota disimpan sebagai satu array float32 .npy di direktori yang
+namanya diturunkan dari parameter tata letak, lalu dibaca kembali dengan
+memory map, sehingga gedung dan jendela tidak perlu dibangkitkan ulang.
+Parameter yang berubah memberi direktori (kunci) baru; file lama tidak
+pernah dipakai untuk tata letak yang berbeda.
+"""
+import json
+import os
+import zlib
+import numpy as np
+from config import settings
+
+CACHE_FORMAT = 1            # Naikkan jika susunan array chunk berubah
+
+def layout_key(params):
+    """Kunci heksadesimal pendek dari parameter tata letak (nilai yang bisa di-JSON-kan)."""
+    text = json.dumps([CACHE_FORMAT, params], sort_keys=True)
+    return "%08x" % zlib.crc32(text.encode("utf-8"))
+
+class GeometryCache:
+    """
+    Kelas untuk membaca dan menulis array geometri per chunk.
+    Direktori dibaca dari settings.city_cache saat dipakai (string kosong
+    mematikan cache); kegagalan baca/tulis hanya membuat chunk dibangkitkan
+    ulang, tidak pernah menghentikan program.
+    """
+    def __init__(self, params):
+        self.key = layout_key(params)
+
+    @property
+    def directory(self):
+        if not settings.city_cache:
+            return None
+        return os.path.join(os.path.expanduser(settings.city_cache), self.key)
+
+    def path(self, index):
+        return os.path.join(self.directory, "chunk_%d.npy" % index)
+
+    def load(self, index):
+        """Array chunk `index` sebagai memory map hanya-baca, atau None jika belum ada."""
+        if self.directory is None:
+            return None
+        try:
+            data = np.load(self.path(index), mmap_mode="r")
+        except (OSError, ValueError, EOFError):
+            return None
+        return data
+
+    def discard(self, index):
+        """Hapus file chunk `index` (misal karena isinya rusak)."""
+        if self.directory is None:
+            return
+        try:
+            os.remove(self.path(index))
+        except OSError:
+            pass
+
+    def save(self, index, data):
+        """Tulis array chunk secara atomik (file sementara lalu rename)."""
+        if self.directory is None:
+            return
+        path = self.path(index)
+        temporary = "%s.%d.tmp" % (path, os.getpid())
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary, "wb") as f:
+                np.save(f, np.asarray(data, dtype=np.float32))
+            os.replace(temporary, path)
+        except OSError:
+            pass
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""
+Jam simulasi dengan langkah waktu tetap (fixed timestep).
+Waktu nyata antar frame dikumpulkan di akumulator lalu dipecah menjadi
+langkah simulasi berukuran sama, sehingga fisika tidak bergantung pada FPS.
+"""
+
+class FixedStepClock:
+    """
+    Kelas untuk membagi waktu frame menjadi langkah simulasi tetap.
+    Menyediakan faktor interpolasi untuk render di antara dua langkah.
+    """
+    def __init__(self, step, max_steps):
+        self.step = step                    # Durasi satu langkah (detik)
+        self.max_steps = max_steps          # Batas langkah kejar per frame
+        self.accumulator = 0.0              # Sisa waktu yang belum disimulasikan
+
+    def advance(self, frame_time):
+        """Tambahkan waktu frame dan kembalikan jumlah langkah yang harus dijalankan."""
+        self.accumulator += max(0.0, frame_time)
+        steps = min(int(self.accumulator / self.step), self.max_steps)
+        self.accumulator -= steps * self.step
+
+        # Jika tersendat (misal jendela digeser), buang sisa waktu daripada
+        # menjalankan langkah kejar yang terus menumpuk
+        if self.accumulator >= self.step:
+            self.accumulator %= self.step
+        return steps
+
+    @property
+    def alpha(self):
+        """Posisi render di antara langkah sebelumnya (0) dan terakhir (1)."""
+        return self.accumulator / self.step
\ No newline at end of file
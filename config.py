@@ -1,22 +1,184 @@
 """
 Konfigurasi dan konstanta untuk simulasi kembang api.
+Semua nilai disimpan di satu objek `settings` yang dibaca modul lain saat
+dipakai. Preset kinerja, file konfigurasi JSON, dan argumen baris perintah
+diterapkan dengan configure() di awal program.
 """
+import json
+import math
+from dataclasses import dataclass, fields, asdict
+from typing import Optional, Tuple
 
-# Konfigurasi layar
-WINDOW_WIDTH = 1280
-WINDOW_HEIGHT = 720
-FPS = 60
+@dataclass
+class Config:
+    # Konfigurasi layar
+    width: int = 1280
+    height: int = 720
+    fps: int = 60                           # Target FPS mode jendela
 
-# Konfigurasi partikel
-PARTICLE_COUNT = 150
-GRAVITY = [0.0, -9.8]
-EXPANSION_BOOST = 1.2
-DRAG_FACTOR = 0.2
+    # Konfigurasi simulasi (langkah waktu tetap, tidak ikut preset agar
+    # rekaman peluncuran tetap bisa diputar ulang)
+    simulation_rate: int = 60               # Langkah simulasi per detik
+    max_simulation_steps: int = 5           # Batas langkah kejar per frame
 
-# Konfigurasi kembang api
-FIREWORK_LAUNCH_SPEED = 15.0
-FIREWORK_LIFETIME = 2.0
-FIREWORK_SIZE = 0.15
+    # Kamera (satuan dunia = satuan kembang api, tidak bergantung resolusi)
+    view_height: float = 7.2                # Tinggi dunia yang terlihat pada zoom 1
+    camera_x: float = 0.0                   # Pusat pandangan awal (satuan dunia)
+    camera_y: float = 2.6
+    camera_zoom: float = 1.0
 
-# Variabel global
-width, height = WINDOW_WIDTH, WINDOW_HEIGHT 
\ No newline at end of file
+    # Konfigurasi render final_bgt.py (koordinat kembang api -> piksel)
+    particle_scale: float = 100.0
+    particle_offset_y: float = 100.0
+
+    # Konfigurasi partikel
+    gravity: Tuple[float, float] = (0.0, -9.8)
+    expansion_boost: float = 1.2
+    drag_factor: float = 0.2
+
+    # Konfigurasi kembang api
+    firework_launch_speed: float = 15.0
+    firework_lifetime: float = 2.0
+    firework_size: float = 0.15
+
+    # Kenop kinerja (diatur oleh preset)
+    preset: str = "high"
+    points_scale: float = 1.0               # Pengali titik per kurva ledakan
+    max_particles: Optional[int] = None     # Batas partikel hidup (None = tanpa batas)
+    circle_segments: int = 16               # Tesselasi maksimum lingkaran partikel (LOD menurut radius)
+    glow: bool = True                       # Pass bloom (pendar) kembang api dan bulan
+    bloom_intensity: float = 1.0            # Kekuatan bloom saat digabung ke layar
+    bloom_downsample: int = 4               # Pembagi resolusi tekstur bloom
+    trail_interval: float = 0.02            # Jeda antar ekor (detik)
+    trail_count: int = 2                    # Ekor per emisi partikel ujung kurva
+    star_count: int = 150                   # Detail latar: jumlah bintang
+    moon_segments: int = 100                # Detail latar: segmen lingkaran bulan
+    night_length: float = 240.0             # Detik sampai jendela yang padam semuanya mati (0 = jendela statis)
+    scroll_speed: float = 0.0               # Kecepatan geser panorama kota (piksel/detik)
+    city_cache: str = "~/.cache/fireworks/city"  # Direktori cache geometri kota ("" = tanpa cache)
+    adaptive_quality: bool = True           # Governor kualitas di mode jendela
+
+    @property
+    def simulation_step(self):
+        return 1.0 / self.simulation_rate
+
+# Preset kinerja dari termurah ke termahal; "high" adalah nilai bawaan
+PRESETS = {
+    "low": dict(fps=30, points_scale=0.5, max_particles=3000, circle_segments=6, glow=False,
+                trail_interval=0.06, trail_count=1, star_count=60, moon_segments=32),
+    "medium": dict(fps=60, points_scale=0.75, max_particles=6000, circle_segments=10, glow=True,
+                   trail_interval=0.035, trail_count=1, star_count=100, moon_segments=64),
+    "high": dict(),
+    "ultra": dict(fps=120, points_scale=1.25, circle_segments=24, trail_interval=0.015,
+                  star_count=300, moon_segments=160),
+}
+
+# Kenop yang boleh diubah governor kualitas saat program berjalan. Setiap
+# perubahan dicatat rekaman pertunjukan (Show.set_quality) agar replay sama
+QUALITY_KNOBS = ("points_scale", "max_particles", "circle_segments", "glow", "trail_interval", "trail_count")
+
+# Nilai yang mengubah hasil simulasi, bukan hanya gambarnya (termasuk ukuran
+# layar, pandangan, dan pusat kamera awal yang menentukan batas dunia tempat
+# partikel dibuang). Disimpan di rekaman pertunjukan dan diterapkan kembali
+# saat replay
+SIMULATION_KNOBS = ("simulation_rate", "width", "height", "view_height", "camera_x", "gravity",
+                    "expansion_boost", "drag_factor", "firework_launch_speed", "firework_lifetime",
+                    "firework_size", "points_scale", "max_particles", "trail_interval", "trail_count")
+
+# Rentang nilai angka yang valid; field angka lain boleh bernilai berapa saja
+POSITIVE = ("width", "height", "fps", "simulation_rate", "max_simulation_steps", "view_height", "camera_zoom",
+            "particle_scale", "firework_lifetime", "firework_size", "points_scale", "max_particles",
+            "circle_segments", "bloom_downsample", "trail_interval", "trail_count", "moon_segments")
+NON_NEGATIVE = ("expansion_boost", "drag_factor", "firework_launch_speed", "bloom_intensity", "star_count",
+                "night_length")
+
+def _coerce(name, value):
+    # Samakan tipe nilai dengan tipe bawaan field (int dari JSON, list -> tuple)
+    # lalu periksa rentangnya, agar nilai salah ditolak di sini dan bukan
+    # menjadi ZeroDivisionError atau crash di tengah program
+    default = getattr(Config, name)
+    try:
+        if isinstance(default, str):
+            if not isinstance(value, str):
+                raise TypeError
+            return value
+        if default is None:                 # Optional[int]
+            if value is None:
+                return value
+            default = 0
+        if isinstance(default, bool):
+            if not isinstance(value, bool):
+                raise TypeError
+            return value
+        if isinstance(default, tuple):
+            vector = tuple(float(v) for v in value)
+            if len(vector) != len(default) or not all(math.isfinite(v) for v in vector):
+                raise ValueError
+            return vector
+        if isinstance(value, (bool, str)) or value is None:
+            raise TypeError
+        number = float(value)
+        if not math.isfinite(number) or (isinstance(default, int) and not number.is_integer()):
+            raise ValueError
+        value = type(default)(value)
+    except (TypeError, ValueError):
+        raise ValueError("Nilai tidak valid untuk %s: %r" % (name, value))
+    if name in POSITIVE and value <= 0:
+        raise ValueError("Nilai %s harus lebih dari 0: %r" % (name, value))
+    if name in NON_NEGATIVE and value < 0:
+        raise ValueError("Nilai %s tidak boleh negatif: %r" % (name, value))
+    return value
+
+def make_config(preset="high", overrides=None):
+    """Buat Config dari preset lalu timpa dengan `overrides` (dict nama -> nilai)."""
+    if preset not in PRESETS:
+        raise ValueError("Preset tidak dikenal: %r (pilih %s)" % (preset, ", ".join(PRESETS)))
+    values = dict(PRESETS[preset], preset=preset)
+    names = {f.name for f in fields(Config)}
+    for name, value in (overrides or {}).items():
+        if name not in names:
+            raise ValueError("Kunci konfigurasi tidak dikenal: %r" % name)
+        values[name] = _coerce(name, value)
+    return Config(**values)
+
+def load_config(path=None, preset=None, assignments=()):
+    """
+    Buat Config dari file JSON, preset, dan penugasan "nama=nilai" baris perintah.
+    Urutan prioritas: penugasan > file > preset. Nilai penugasan dibaca sebagai
+    JSON jika bisa (misal `glow=false`, `gravity=[0,-5]`), selain itu sebagai teks.
+    """
+    overrides = {}
+    if path:
+        with open(path) as f:
+            overrides.update(json.load(f))
+    for assignment in assignments:
+        name, sep, text = assignment.partition("=")
+        if not sep:
+            raise ValueError("Format harus nama=nilai: %r" % assignment)
+        try:
+            overrides[name.strip()] = json.loads(text)
+        except ValueError:
+            overrides[name.strip()] = text
+    preset = preset or overrides.pop("preset", "high")
+    overrides.pop("preset", None)
+    return make_config(preset, overrides)
+
+def configure(config):
+    """Terapkan `config` ke objek `settings` bersama (di tempat, agar referensi tetap berlaku)."""
+    for name, value in asdict(config).items():
+        setattr(settings, name, value)
+    return settings
+
+def update_settings(values):
+    """Periksa lalu terapkan sebagian nilai (dict nama -> nilai) ke `settings`."""
+    names = {f.name for f in fields(Config)}
+    for name in values:
+        if name not in names:
+            raise ValueError("Kunci konfigurasi tidak dikenal: %r" % name)
+    values = {name: _coerce(name, value) for name, value in values.items()}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    return settings
+
+# Konfigurasi aktif yang dibaca semua modul
+settings = Config()
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Cache template ledakan untuk Firework.explode.
+Template menyimpan bagian satu kurva ledakan yang tidak acak (arah satuan
+setiap titik untuk kurva bersudut dasar 0, profil kecepatan sepanjang kurva,
+dan penanda ujung kurva) per jumlah titik. Saat meledak, template setiap
+kurva diputar ke sudut dasarnya lalu disusun menjadi satu array, sehingga
+setiap kurva tetap bisa punya jumlah titik sendiri. Ukuran cache dibatasi
+dengan penggusuran LRU.
+"""
+import math
+from collections import OrderedDict
+import numpy as np
+
+TEMPLATE_CACHE_SIZE = 64    # Jumlah template maksimum (jauh di atas semua jumlah titik per kurva)
+CURVE_BEND = 0.5            # Lengkungan sudut di tengah kurva (radian)
+CURVE_SPEEDUP = 0.4         # Tambahan kecepatan di tengah kurva
+
+class ExplosionTemplate:
+    """
+    Kelas untuk menyimpan geometri satuan satu kurva ledakan.
+    Array bersifat hanya-baca karena dipakai bersama oleh banyak ledakan.
+    """
+    def __init__(self, num_points):
+        self.num_points = num_points
+
+        # Variasi sudut untuk membuat kurva; kecepatan lebih tinggi di tengah kurva
+        i = np.arange(num_points)
+        bend = np.sin(i / num_points * math.pi)
+        angle = bend * CURVE_BEND
+        self.directions = np.column_stack((np.cos(angle), np.sin(angle)))
+        self.speed_profile = 1.0 + bend * CURVE_SPEEDUP
+        self.ends = (i == 0) | (i == num_points - 1)
+        for array in (self.directions, self.speed_profile, self.ends):
+            array.flags.writeable = False
+
+    def __len__(self):
+        return self.num_points
+
+
+class ExplosionBurst:
+    """
+    Kelas untuk geometri satu ledakan: template kurva yang disusun per kurva.
+    `points` adalah jumlah titik setiap kurva; kurva ke-k berarah dasar
+    2 * pi * k / jumlah kurva.
+    """
+    def __init__(self, points, cache=None):
+        cache = cache if cache is not None else template_cache
+        templates = [cache.get(int(n)) for n in points]
+        num_curves = len(templates)
+        self.curve = np.repeat(np.arange(num_curves), [len(t) for t in templates])
+        base = 2 * math.pi * self.curve / num_curves
+        cos, sin = np.cos(base), np.sin(base)
+        unit = np.concatenate([t.directions for t in templates])
+        self.directions = np.column_stack((unit[:, 0] * cos - unit[:, 1] * sin,
+                                           unit[:, 0] * sin + unit[:, 1] * cos))
+        self.speed_profile = np.concatenate([t.speed_profile for t in templates])
+        self.ends = np.concatenate([t.ends for t in templates])
+
+    def __len__(self):
+        return len(self.curve)
+
+
+class TemplateCache:
+    """
+    Kelas untuk cache template kurva dengan batas ukuran (LRU).
+    Kunci: titik per kurva; sudut dasar dan warna tema diterapkan setelahnya,
+    sehingga satu template dipakai bersama oleh semua kurva dan tema.
+    """
+    def __init__(self, maxsize=TEMPLATE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.templates = OrderedDict()
+
+    def get(self, num_points):
+        template = self.templates.get(num_points)
+        if template is not None:
+            self.templates.move_to_end(num_points)
+            return template
+
+        template = ExplosionTemplate(num_points)
+        self.templates[num_points] = template
+        if len(self.templates) > self.maxsize:
+            self.templates.popitem(last=False)  # Buang template yang paling lama tidak dipakai
+        return template
+
+    def clear(self):
+        self.templates.clear()
+
+    def __len__(self):
+        return len(self.templates)
+
+# Cache bersama untuk semua kembang api
+template_cache = TemplateCache()
@@ -0,0 +1,225 @@
+"""
+Mode ekspor: merender pertunjukan ke urutan gambar tanpa layar.
+Frame digambar ke FBO pada konteks GL offscreen dan dibaca kembali lewat dua
+PBO, atau dirasterisasi oleh backend NumPy (soft_renderer) tanpa GL, lalu
+diserahkan ke thread penulis yang menyimpan PNG atau RGBA mentah, sehingga
+render hanya menunggu kompresi atau disk saat antrian penulis penuh.
+"""
+import json
+import math
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+import numpy as np
+
+from config import settings
+from clock import FixedStepClock
+from show import Show
+from headless import launch_schedule
+
+# Variabel lingkungan PyOpenGL per platform offscreen
+PLATFORMS = {
+    "egl": {"PYOPENGL_PLATFORM": "egl", "EGL_PLATFORM": "surfaceless"},
+    "osmesa": {"PYOPENGL_PLATFORM": "osmesa"},
+}
+
+def select_platform(name):
+    """Pilih platform PyOpenGL; harus dipanggil sebelum OpenGL diimpor."""
+    for key, value in PLATFORMS[name].items():
+        os.environ.setdefault(key, value)
+
+def encode_png(pixels):
+    """Kodekan array RGB/RGBA (tinggi, lebar, kanal) ke byte PNG."""
+    height, width, channels = pixels.shape
+    # Setiap baris diawali byte filter 0 (tanpa filter)
+    rows = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    rows[:, 1:] = pixels.reshape(height, -1)
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+    color_type = 6 if channels == 4 else 2
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(rows.tobytes(), 3)) + chunk(b"IEND", b""))
+
+# Batas memori frame yang menunggu di antrian penulis (RGBA 1280x720 = 3.5 MiB)
+WRITER_QUEUE_BYTES = 512 * 1024 * 1024
+MAX_WRITER_THREADS = 8
+
+class FrameWriter:
+    """
+    Kelas thread penulis frame.
+    Beberapa thread mengodekan dan menulis frame bersamaan (zlib melepas GIL
+    saat kompresi). Antrian dibatasi WRITER_QUEUE_BYTES agar render yang lebih
+    cepat dari disk tidak menimbun gigabyte frame; submit() baru memblokir
+    saat batas itu tercapai. Puncak antrian dicatat untuk melihat apakah
+    penulis mengejar render.
+    """
+    def __init__(self, directory, fmt="png", frame_bytes=None, threads=None):
+        self.directory = directory
+        self.fmt = fmt
+        if frame_bytes is None:
+            frame_bytes = settings.width * settings.height * 4
+        if threads is None:
+            threads = min(MAX_WRITER_THREADS, os.cpu_count() or 1)
+        self.queue = queue.Queue(max(2 * threads, WRITER_QUEUE_BYTES // frame_bytes))
+        self.written = 0
+        self.bytes_written = 0
+        self.peak_backlog = 0
+        self.busy_time = 0.0                # Waktu kerja semua thread (kodekan + tulis)
+        self.error = None                   # Pengecualian pertama dari thread penulis
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.threads = [threading.Thread(target=self._run, name="frame-writer-%d" % i, daemon=True)
+                        for i in range(threads)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, index, pixels):
+        # Kegagalan penulis dilaporkan segera, bukan setelah semua frame dirender
+        if self.error is not None:
+            raise self.error
+        self.queue.put((index, pixels))
+        self.peak_backlog = max(self.peak_backlog, self.queue.qsize())
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            if self.error is not None:
+                continue
+            started = time.perf_counter()
+            try:
+                size = self._write(*item)
+            except Exception as error:
+                # Simpan galat apa pun agar tidak hilang bersama thread
+                with self._lock:
+                    if self.error is None:
+                        self.error = error
+                continue
+            with self._lock:
+                self.written += 1
+                self.bytes_written += size
+                self.busy_time += time.perf_counter() - started
+
+    def _write(self, index, pixels):
+        # GL membaca dari baris bawah; balik agar baris pertama adalah atas
+        pixels = pixels[::-1]
+        if self.fmt == "png":
+            data = encode_png(pixels[:, :, :3])
+        else:
+            # Tulis langsung dari buffer array, tanpa salinan bytes kedua
+            data = memoryview(np.ascontiguousarray(pixels)).cast("B")
+        path = os.path.join(self.directory, "frame_%05d.%s" % (index, "png" if self.fmt == "png" else "rgba"))
+        with open(path, "wb") as f:
+            f.write(data)
+        return len(data)
+
+    def close(self):
+        """Tunggu semua frame dalam antrian selesai ditulis."""
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        if self.error is not None:
+            raise self.error
+
+def run_export(args):
+    """
+    Merender pertunjukan ke direktori args.export dan mencetak statistik JSON.
+    Waktu pertunjukan maju tetap 1/fps per frame, tidak bergantung kecepatan
+    render, sehingga urutan gambar sama untuk seed yang sama.
+    """
+    from building import generate_city, city
+    from camera import camera
+    from particle_system import particle_system
+
+    # Rekaman menerapkan konfigurasi simulasinya (termasuk ukuran layar), jadi
+    # dimuat sebelum backend dan kota disiapkan
+    if args.replay:
+        show = Show.load(args.replay)
+        schedule = []
+    else:
+        show = Show(args.seed if args.seed is not None else 42)
+        schedule = launch_schedule(args.shells, args.launch_rate, settings.simulation_step)
+
+    # Backend numpy tidak membutuhkan konteks GL sama sekali
+    context = reader = None
+    if args.backend == "numpy":
+        import soft_renderer as backend
+    else:
+        select_platform(args.gl_platform)
+        from offscreen import OffscreenContext, PixelReader
+        import renderer as backend
+        context = OffscreenContext(settings.width, settings.height, args.gl_platform)
+        reader = PixelReader(settings.width, settings.height)
+    writer = FrameWriter(args.export, args.export_format)
+    backend.init_gl()
+    generate_city()
+    camera.reset()
+
+    frame_time = 1.0 / settings.fps
+    frames = args.frames if args.frames is not None else int(math.ceil(args.duration / frame_time))
+    sim_clock = FixedStepClock(settings.simulation_step, settings.max_simulation_steps)
+    next_launch = 0
+    steps_done = 0
+
+    started = time.perf_counter()
+    for frame in range(frames):
+        for _ in range(sim_clock.advance(frame_time)):
+            while next_launch < len(schedule) and schedule[next_launch] <= steps_done:
+                show.launch()
+                next_launch += 1
+            show.update(sim_clock.step)
+            steps_done += 1
+        particle_system.interpolate(sim_clock.alpha)
+        city.update(particle_system.time)
+
+        backend.begin_frame()
+        backend.draw_background()
+        backend.draw_particles(particle_system)
+        backend.submit_frame()
+
+        if reader is None:
+            writer.submit(frame, backend.read_pixels())
+            continue
+        # Mulai baca frame ini ke PBO; frame sebelumnya yang sudah siap
+        # langsung diserahkan ke thread penulis
+        done = reader.read()
+        if done is not None:
+            writer.submit(*done)
+    if reader is not None:
+        for done in reader.finish():
+            writer.submit(*done)
+    render_elapsed = time.perf_counter() - started
+
+    writer.close()
+    total_elapsed = time.perf_counter() - started
+    if reader is not None:
+        reader.close()
+        context.close()
+    if args.record_launches:
+        show.save(args.record_launches)
+
+    stats = {
+        "frames": frames,
+        "frames_written": writer.written,
+        "format": args.export_format,
+        "backend": args.backend,
+        "size": [settings.width, settings.height],
+        "directory": args.export,
+        "seed": show.seed,
+        "render_fps": round(frames / render_elapsed, 1) if render_elapsed > 0 else None,
+        "writer_threads": len(writer.threads),
+        "writer_fps": (round(writer.written * len(writer.threads) / writer.busy_time, 1)
+                       if writer.busy_time > 0 else None),
+        "export_fps": round(frames / total_elapsed, 1) if total_elapsed > 0 else None,
+        "writer_peak_backlog": writer.peak_backlog,
+        "megabytes_written": round(writer.bytes_written / (1024 * 1024), 1),
+    }
+    print(json.dumps(stats, indent=2))
+    return stats
\ No newline at end of file
@@ -30,28 +30,16 @@ import random
 import math
 import time
 import sys
+import argparse
 
 # ================== KONFIGURASI ==================
-# Konfigurasi layar
-WINDOW_WIDTH = 1280
-WINDOW_HEIGHT = 720
-FPS = 60
-
-# Konfigurasi partikel
-PARTICLE_COUNT = 150
-GRAVITY = [0.0, -9.8]
-EXPANSION_BOOST = 1.2
-DRAG_FACTOR = 0.2
-
-# Konfigurasi kembang api
-FIREWORK_LAUNCH_SPEED = 15.0
-FIREWORK_LIFETIME = 2.0
-FIREWORK_SIZE = 0.15
+# Semua nilai dibaca dari objek konfigurasi bersama di config.py
+from config import settings, PRESETS, load_config, configure
 
 # ================== VARIABEL GLOBAL ==================
-width, height = WINDOW_WIDTH, WINDOW_HEIGHT
+width, height = settings.width, settings.height
 random.seed(42)  # Seed tetap untuk konsistensi
-stars = [(random.randint(0, width), random.randint(height // 2, height)) for _ in range(PARTICLE_COUNT)]
+stars = [(random.randint(0, width), random.randint(height // 2, height)) for _ in range(settings.star_count)]
 
 # Struktur data untuk menyimpan gedung
 buildings = {
@@ -220,9 +208,9 @@ class Firework:
         self.particles.append(Particle(
             position=self.launch_pos,
             color=main_color,
-            velocity=[0, 15.0],  # Lebih tinggi dari fireworks_v1.py (aslinya 5.0)
-            lifetime=2.0,
-            size=0.15,  # Ukuran lebih kecil dari sebelumnya (0.3)
+            velocity=[0, settings.firework_launch_speed],  # Lebih tinggi dari fireworks_v1.py (aslinya 5.0)
+            lifetime=settings.firework_lifetime,
+            size=settings.firework_size,  # Ukuran lebih kecil dari sebelumnya (0.3)
             is_launch_particle=True
         ))
 
@@ -238,6 +226,7 @@ class Firework:
             base_angle = 2 * math.pi * curve_idx / num_curves
             # Jumlah titik dalam kurva
             num_points = random.randint(10, 15)  # Lebih banyak partikel (aslinya 8-12)
+            num_points = max(3, int(round(num_points * settings.points_scale)))
             
             # Warna untuk kurva ini
             curve_color = self.get_color_variation(self.color_theme)
@@ -283,9 +272,9 @@ class Firework:
         if self.exploded:
             self.explosion_time += dt
         
-        gravity = [0.0, -9.8]  # Sama seperti fireworks_v1.py
-        expansion_boost = 1.2  # Kurangi faktor boost pada fase ekspansi (aslinya 1.5)
-        drag_factor = 0.2  # Tambahkan faktor hambatan untuk memperlambat partikel
+        gravity = settings.gravity  # Sama seperti fireworks_v1.py
+        expansion_boost = settings.expansion_boost  # Kurangi faktor boost pada fase ekspansi (aslinya 1.5)
+        drag_factor = settings.drag_factor  # Tambahkan faktor hambatan untuk memperlambat partikel
         
         for p in self.particles:
             # Periksa apakah partikel mencapai puncak (kecepatan vertikal berubah dari positif ke negatif)
@@ -321,7 +310,7 @@ class Firework:
             
             # Tambahkan partikel ke ekor setiap beberapa frame
             p.trail_counter += dt
-            if p.trail_counter > 0.02:  # Tambahkan ekor lebih sering (aslinya 0.03)
+            if p.trail_counter > settings.trail_interval:  # Tambahkan ekor lebih sering (aslinya 0.03)
                 p.trail_counter = 0
                 # Buat salinan posisi dan warna yang memudar untuk ekor
                 trail_color = p.color.copy()
@@ -330,7 +319,7 @@ class Firework:
                 # Lebih banyak partikel ekor untuk partikel ujung
                 trail_count = 1
                 if p.is_curve_end:
-                    trail_count = 2  # Partikel ujung lebih banyak ekor
+                    trail_count = settings.trail_count  # Partikel ujung lebih banyak ekor
                 
                 for _ in range(trail_count):
                     p.trail.append({
@@ -392,7 +381,7 @@ class Firework:
             # Update ukuran
             if p.is_launch_particle:
                 # Partikel peluncuran membesar mendekati puncak
-                vel_ratio = abs(p.velocity[1]) / 15.0  # 15.0 adalah kecepatan awal
+                vel_ratio = abs(p.velocity[1]) / settings.firework_launch_speed  # Relatif terhadap kecepatan awal
                 size_factor = 1.0 + 2.0 * (1.0 - vel_ratio)  # Maksimum 3x ukuran awal
                 p.size = p.initial_size * size_factor
             else:
@@ -490,9 +479,9 @@ def draw_glowing_moon():
         glow_radius = radius + i * 15
         alpha = 0.05
         glColor4f(1.0, 1.0, 0.6, alpha)
-        draw_circle(center_x, center_y, glow_radius)
+        draw_circle(center_x, center_y, glow_radius, settings.moon_segments)
     glColor3f(1.0, 1.0, 0.6)
-    draw_circle(center_x, center_y, radius)
+    draw_circle(center_x, center_y, radius, settings.moon_segments)
 
 def draw_building(building):
     x = building.x
@@ -622,8 +611,8 @@ def draw_particle(position, color, size=0.2, rotation=0.0, shape="circle", trail
     
     # Konversi koordinat dari kembang api ke koordinat layar
     screen_pos = [
-        (position[0] * 100) + width/2,  # Skala dan geser ke tengah
-        position[1] * 100 + 100         # Skala dan geser ke atas sedikit
+        (position[0] * settings.particle_scale) + width/2,  # Skala dan geser ke tengah
+        position[1] * settings.particle_scale + settings.particle_offset_y  # Skala dan geser ke atas sedikit
     ]
     
     # Gambar ekor terlebih dahulu (sebelum partikel utama)
@@ -635,8 +624,8 @@ def draw_particle(position, color, size=0.2, rotation=0.0, shape="circle", trail
             glBegin(GL_LINE_STRIP)
             for trail_segment in trail:
                 trail_screen_pos = [
-                    (trail_segment['pos'][0] * 100) + width/2,
-                    (trail_segment['pos'][1] * 100) + 100
+                    (trail_segment['pos'][0] * settings.particle_scale) + width/2,
+                    (trail_segment['pos'][1] * settings.particle_scale) + settings.particle_offset_y
                 ]
                 glColor4f(*trail_segment['color'])
                 glVertex2f(trail_screen_pos[0], trail_screen_pos[1])
@@ -645,8 +634,8 @@ def draw_particle(position, color, size=0.2, rotation=0.0, shape="circle", trail
         # Gambar partikel trail individual untuk efek yang lebih baik
         for trail_segment in trail:
             trail_screen_pos = [
-                (trail_segment['pos'][0] * 100) + width/2,
-                (trail_segment['pos'][1] * 100) + 100
+                (trail_segment['pos'][0] * settings.particle_scale) + width/2,
+                (trail_segment['pos'][1] * settings.particle_scale) + settings.particle_offset_y
             ]
             # Ukuran bergantung pada partikel trail
             trail_size = size * 20 * (1.0 - trail_segment['age'] / trail_segment['max_age'])  # Kurangi ukuran trail (aslinya 25)
@@ -674,13 +663,13 @@ def draw_particle(position, color, size=0.2, rotation=0.0, shape="circle", trail
             display_color[i] = min(1.0, color[i] * 1.3)  # Kurangi kecerahan (aslinya 1.5)
     
     # Gambar glow untuk partikel yang lebih besar
-    if is_curve_end or size > 0.3:
+    if settings.glow and (is_curve_end or size > 0.3):
         glow_size = actual_size * 1.3  # Kurangi ukuran glow (aslinya 1.5)
         glow_color = display_color.copy()
         glow_color[3] *= 0.3  # Transparansi untuk glow
         
         if shape == "circle":
-            segments = 16
+            segments = settings.circle_segments
             glBegin(GL_TRIANGLE_FAN)
             glColor4f(*glow_color)
             glVertex2f(0, 0)  # Titik tengah
@@ -702,7 +691,7 @@ def draw_particle(position, color, size=0.2, rotation=0.0, shape="circle", trail
     
     # Gambar partikel berdasarkan bentuknya
     if shape == "circle":
-        segments = 16  # Jumlah segmen lingkaran
+        segments = settings.circle_segments  # Jumlah segmen lingkaran
         glBegin(GL_TRIANGLE_FAN)
         glColor4f(*display_color)
         glVertex2f(0, 0)  # Titik tengah
@@ -745,6 +734,23 @@ def main():
     Fungsi utama program.
     Menangani inisialisasi, game loop, dan cleanup.
     """
+    global width, height, stars
+    
+    # Konfigurasi dari preset, file JSON, atau --set nama=nilai
+    parser = argparse.ArgumentParser(description="Simulasi kembang api di kota malam")
+    parser.add_argument("--preset", choices=list(PRESETS), help="preset kinerja (default: high)")
+    parser.add_argument("--config", metavar="PATH", help="file konfigurasi JSON")
+    parser.add_argument("--set", metavar="NAMA=NILAI", action="append", default=[],
+                        help="timpa satu nilai konfigurasi")
+    args = parser.parse_args()
+    try:
+        configure(load_config(args.config, args.preset, args.set))
+    except (OSError, ValueError) as error:
+        sys.exit("Konfigurasi tidak valid: %s" % error)
+    width, height = settings.width, settings.height
+    random.seed(42)
+    stars = [(random.randint(0, width), random.randint(height // 2, height)) for _ in range(settings.star_count)]
+    
     # Inisialisasi
     pygame.init()
     display = pygame.display.set_mode((width, height), DOUBLEBUF | OPENGL)
@@ -806,7 +812,7 @@ def main():
         # Finalisasi render
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
         pygame.display.flip()
-        clock.tick(FPS)
+        clock.tick(settings.fps)
     
     # Cleanup
     pygame.quit()
@@ -0,0 +1,105 @@
+"""
+Governor kualitas adaptif.
+Memantau waktu kerja setiap frame (tanpa jeda tunggu clock.tick) dan
+menurunkan atau menaikkan tingkat kualitas secara bertahap agar frame tetap
+di dalam anggaran FPS. Governor hanya memilih tingkat; kenopnya diterapkan
+lewat Show.set_quality, yang memeriksa nilainya dan mencatatnya di rekaman
+pertunjukan (kenop simulasi ikut berubah) agar replay tetap identik.
+Setiap keputusan dicetak dan dapat ditulis ke CSV untuk penyetelan ambang.
+"""
+import csv
+import time
+from collections import deque
+
+from config import settings, PRESETS, QUALITY_KNOBS, make_config
+from tessellation import QUAD
+
+# Tingkat terendah di bawah preset "low": semua partikel digambar sebagai persegi
+FLOOR_LEVEL = dict(points_scale=0.4, max_particles=2000, circle_segments=QUAD, glow=False,
+                   trail_interval=0.08, trail_count=1)
+
+def quality_levels():
+    """
+    Tingkat kualitas dari tertinggi (0) ke terendah: konfigurasi aktif,
+    lalu setiap preset yang lebih murah, lalu FLOOR_LEVEL. Tingkat yang
+    sama dengan tingkat sebelumnya dilewati.
+    """
+    levels = [{name: getattr(settings, name) for name in QUALITY_KNOBS}]
+    names = list(PRESETS)
+    start = names.index(settings.preset) if settings.preset in names else len(names)
+    candidates = [make_config(name) for name in reversed(names[:start])]
+    candidates = [{knob: getattr(preset, knob) for knob in QUALITY_KNOBS} for preset in candidates]
+    for level in candidates + [dict(FLOOR_LEVEL)]:
+        if level != levels[-1]:
+            levels.append(level)
+    return levels
+
+DEGRADE_RATIO = 0.9         # Turunkan kualitas jika rata-rata > 90% anggaran
+RECOVER_RATIO = 0.5         # Naikkan kualitas jika rata-rata < 50% anggaran
+DEGRADE_FRAMES = 15         # Frame pengamatan sebelum menurunkan kualitas
+RECOVER_FRAMES = 120        # Frame pengamatan sebelum menaikkan kualitas (lebih hati-hati)
+
+class QualityGovernor:
+    """
+    Kelas untuk mengatur tingkat kualitas berdasarkan waktu kerja frame.
+    Setelah setiap perubahan, jendela pengamatan dikosongkan agar keputusan
+    berikutnya hanya melihat frame dengan tingkat kualitas yang baru.
+    """
+    def __init__(self, budget, levels=None, log_path=None):
+        self.budget = budget                # Anggaran waktu per frame (detik)
+        self.levels = levels or quality_levels()
+        self.level = 0
+        self.frame = 0
+        self.frame_times = deque(maxlen=RECOVER_FRAMES)
+        self._started = time.perf_counter()
+        self._log_file = None
+        self._log_writer = None
+        if log_path:
+            self._log_file = open(log_path, "w", newline="")
+            self._log_writer = csv.writer(self._log_file)
+            self._log_writer.writerow(["time", "frame", "average_ms", "budget_ms", "from", "to"])
+
+    def apply(self, level):
+        """Pilih tingkat `level` dan kembalikan kenop kualitasnya (dict); settings tidak diubah."""
+        self.level = level
+        return dict(self.levels[level])
+
+    def record(self, work_time):
+        """
+        Catat waktu kerja satu frame. Jika tingkat kualitas berubah, kembalikan
+        kenop tingkat baru untuk diterapkan pemanggil; selain itu None.
+        """
+        self.frame += 1
+        self.frame_times.append(work_time)
+        if len(self.frame_times) >= DEGRADE_FRAMES and self.level < len(self.levels) - 1:
+            recent = list(self.frame_times)[-DEGRADE_FRAMES:]
+            average = sum(recent) / DEGRADE_FRAMES
+            if average > self.budget * DEGRADE_RATIO:
+                return self._change(self.level + 1, average)
+        if len(self.frame_times) >= RECOVER_FRAMES and self.level > 0:
+            average = sum(self.frame_times) / len(self.frame_times)
+            if average < self.budget * RECOVER_RATIO:
+                return self._change(self.level - 1, average)
+        return None
+
+    def _change(self, level, average):
+        decision = {
+            "time": round(time.perf_counter() - self._started, 3),
+            "frame": self.frame,
+            "average_ms": round(average * 1000, 3),
+            "budget_ms": round(self.budget * 1000, 3),
+            "from": self.level,
+            "to": level,
+        }
+        print("Kualitas %d -> %d (rata-rata %.2f ms, anggaran %.2f ms)"
+              % (self.level, level, decision["average_ms"], decision["budget_ms"]))
+        if self._log_writer is not None:
+            self._log_writer.writerow(list(decision.values()))
+        self.frame_times.clear()
+        return self.apply(level)
+
+    def close(self):
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+            self._log_writer = None
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Mode headless: menjalankan simulasi kembang api tanpa jendela dan tanpa
+konteks OpenGL, dengan jadwal peluncuran terskrip, lalu mencetak statistik
+throughput dalam format JSON (untuk profiling dan uji regresi di server).
+"""
+import json
+import math
+import sys
+import time
+import numpy as np
+
+from config import settings
+from particle_system import particle_system
+from show import Show
+
+def peak_memory_mb():
+    # Memori puncak proses (high-water mark); None jika tidak tersedia (Windows)
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KiB, macOS melaporkan byte
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def launch_schedule(shells, launch_rate, step):
+    """Langkah simulasi tempat setiap kembang api diluncurkan."""
+    return [int(round(i / launch_rate / step)) for i in range(shells)]
+
+def run_headless(args):
+    """
+    Menjalankan simulasi headless sesuai argumen dan mencetak statistik JSON.
+    Menggunakan langkah tetap settings.simulation_step sehingga hasilnya sama di
+    setiap mesin untuk seed yang sama.
+    """
+    # Rekaman peluncuran (beserta konfigurasi simulasinya) menggantikan jadwal
+    # terskrip; tanpa rekaman, semua sumber acak diturunkan dari seed agar
+    # hasilnya dapat diulang
+    if args.replay:
+        show = Show.load(args.replay)
+        schedule = []
+    else:
+        show = Show(args.seed if args.seed is not None else 42)
+        schedule = launch_schedule(args.shells, args.launch_rate, settings.simulation_step)
+    step = settings.simulation_step
+    frames = args.frames if args.frames is not None else int(math.ceil(args.duration / step))
+
+    batch = None
+    if args.geometry:
+        from particle_batch import ParticleBatch
+        batch = ParticleBatch()
+
+    update_times = np.zeros(frames)
+    next_launch = 0
+    peak_particles = 0
+    # Checksum berjalan atas jumlah dan posisi partikel di setiap langkah,
+    # sehingga perubahan perilaku terdeteksi walau semua partikel sudah mati
+    checksum = 0.0
+
+    started = time.perf_counter()
+    for frame in range(frames):
+        # Luncurkan kembang api yang dijadwalkan pada langkah ini
+        while next_launch < len(schedule) and schedule[next_launch] <= frame:
+            show.launch()
+            next_launch += 1
+
+        t0 = time.perf_counter()
+        show.update(step)
+        if batch is not None:
+            particle_system.interpolate(1.0)
+            batch.build(particle_system)
+        update_times[frame] = time.perf_counter() - t0
+
+        peak_particles = max(peak_particles, particle_system.count)
+        checksum += particle_system.count + float(np.abs(particle_system.position[:particle_system.count]).sum())
+    elapsed = time.perf_counter() - started
+    if args.record_launches:
+        show.save(args.record_launches)
+
+    update_ms = update_times * 1000
+    memory = peak_memory_mb()
+    stats = {
+        "frames": frames,
+        "simulated_seconds": round(frames * step, 3),
+        "shells_launched": show.launch_index,
+        "seed": show.seed,
+        "sim_fps": round(frames / elapsed, 1) if elapsed > 0 else None,
+        "realtime_factor": round(frames * step / elapsed, 2) if elapsed > 0 else None,
+        "peak_particles": peak_particles,
+        "final_particles": particle_system.count,
+        "culled_particles": particle_system.culled,
+        "update_ms_mean": round(float(update_ms.mean()), 4) if frames else 0.0,
+        "update_ms_p99": round(float(np.percentile(update_ms, 99)), 4) if frames else 0.0,
+        "update_ms_max": round(float(update_ms.max()), 4) if frames else 0.0,
+        "memory_peak_mb": round(memory, 1) if memory is not None else None,
+        "checksum": round(checksum, 6),
+    }
+    print(json.dumps(stats, indent=2))
+    return stats
\ No newline at end of file
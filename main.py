@@ -20,93 +20,112 @@ Anggota Kelompok:
 Grafika Komputer, 2025
 """
 
-import pygame
-from pygame.locals import *
-from OpenGL.GL import *
-from OpenGL.GLUT import *
-import random
-import time
+import argparse
 import sys
 
-from config import width, height, FPS
-from building import generate_city
-from renderer import (
-    init_gl, draw_gradient_sky, draw_stars,
-    draw_glowing_moon, draw_city_background,
-    draw_particle
-)
-from firework import Firework
+from config import PRESETS, load_config, configure
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulasi kembang api di kota malam")
+    
+    # Seed dan rekaman peluncuran berlaku di kedua mode
+    show = parser.add_argument_group("pertunjukan")
+    show.add_argument("--seed", type=int, default=None,
+                      help="seed pertunjukan (default: 42 di headless, acak di jendela)")
+    show.add_argument("--replay", metavar="PATH",
+                      help="putar ulang rekaman peluncuran dari file JSON")
+    show.add_argument("--record-launches", metavar="PATH",
+                      help="simpan seed dan jadwal peluncuran ke file JSON saat selesai")
+    
+    # Mode headless: simulasi tanpa jendela/konteks OpenGL untuk profiling
+    headless = parser.add_argument_group("headless")
+    headless.add_argument("--headless", action="store_true",
+                          help="jalankan simulasi tanpa jendela dan cetak statistik JSON")
+    headless.add_argument("--frames", type=int, default=None,
+                          help="jumlah langkah simulasi (default: dari --duration)")
+    headless.add_argument("--duration", type=float, default=10.0,
+                          help="durasi simulasi dalam detik")
+    headless.add_argument("--shells", type=int, default=40,
+                          help="jumlah kembang api yang diluncurkan")
+    headless.add_argument("--launch-rate", type=float, default=8.0,
+                          help="kembang api yang diluncurkan per detik")
+    headless.add_argument("--geometry", action="store_true",
+                          help="ikut ukur pembangunan buffer vertex partikel")
+    
+    # Ekspor: render offscreen ke urutan gambar (memakai --frames/--duration,
+    # --shells, dan --launch-rate di atas)
+    export = parser.add_argument_group("ekspor")
+    export.add_argument("--export", metavar="DIR",
+                        help="render tanpa layar ke urutan gambar di direktori DIR")
+    export.add_argument("--export-format", choices=("png", "raw"), default="png",
+                        help="format frame: PNG atau RGBA mentah (default: png)")
+    export.add_argument("--backend", choices=("gl", "numpy"), default="gl",
+                        help="backend render: OpenGL offscreen atau rasterizer NumPy tanpa GPU")
+    export.add_argument("--gl-platform", choices=("egl", "osmesa"), default="egl",
+                        help="konteks GL offscreen (default: egl surfaceless)")
+    
+    # Konfigurasi: preset kinerja, file JSON, dan penimpaan per nilai
+    quality = parser.add_argument_group("konfigurasi dan kualitas")
+    quality.add_argument("--preset", choices=list(PRESETS),
+                         help="preset kinerja (default: high)")
+    quality.add_argument("--config", metavar="PATH",
+                         help="file konfigurasi JSON berisi nilai yang ditimpa")
+    quality.add_argument("--set", metavar="NAMA=NILAI", action="append", default=[],
+                         help="timpa satu nilai konfigurasi, misal --set glow=false")
+    quality.add_argument("--fixed-quality", action="store_true",
+                         help="matikan penyesuaian kualitas otomatis")
+    quality.add_argument("--quality-log", metavar="PATH",
+                         help="catat setiap keputusan governor kualitas ke file CSV")
+    
+    # Profiling mode jendela: HUD (toggle dengan F3) dan ekspor CSV per frame
+    profiling = parser.add_argument_group("profiling")
+    profiling.add_argument("--profile", action="store_true",
+                           help="tampilkan HUD profiler sejak awal (toggle dengan F3)")
+    profiling.add_argument("--profile-csv", metavar="PATH",
+                           help="tulis waktu fase setiap frame ke file CSV")
+    args = parser.parse_args(argv)
+    
+    # Jadwal peluncuran membagi dengan --launch-rate, jadi tolak nilai yang
+    # tidak masuk akal di sini, bukan sebagai ZeroDivisionError di tengah run
+    if args.launch_rate <= 0:
+        parser.error("--launch-rate harus lebih dari 0: %r" % args.launch_rate)
+    if args.shells < 0:
+        parser.error("--shells tidak boleh negatif: %r" % args.shells)
+    if args.frames is not None and args.frames < 0:
+        parser.error("--frames tidak boleh negatif: %r" % args.frames)
+    if args.duration < 0:
+        parser.error("--duration tidak boleh negatif: %r" % args.duration)
+    return args
+
+def main(argv=None):
     """
     Fungsi utama program.
-    Menangani inisialisasi, game loop, dan cleanup.
+    Memilih mode jendela, headless, atau ekspor berdasarkan argumen.
     """
-    # Inisialisasi
-    pygame.init()
-    display = pygame.display.set_mode((width, height), DOUBLEBUF | OPENGL)
-    pygame.display.set_caption("Kota Malam dengan Kembang Api - PyOpenGL")
-    glutInit()
-    
-    init_gl()
-    generate_city()
-    
-    # Setup variabel game
-    fireworks = []
-    last_time = time.time()
-    clock = pygame.time.Clock()
+    args = parse_args(argv)
+    assignments = list(args.set)
+    if args.fixed_quality:
+        assignments.append("adaptive_quality=false")
+    try:
+        configure(load_config(args.config, args.preset, assignments))
+    except (OSError, ValueError) as error:
+        sys.exit("Konfigurasi tidak valid: %s" % error)
     
-    # Game loop
-    running = True
-    while running:
-        # Update waktu
-        current_time = time.time()
-        dt = current_time - last_time
-        last_time = current_time
-        
-        # Handle events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
-                    # Luncurkan kembang api
-                    old_state = random.getstate()
-                    random.seed(int(time.time() * 1000) % 10000)
-                    launch_pos = [random.uniform(-5, 5), -8.0]
-                    fireworks.append(Firework(launch_pos))
-                    random.setstate(old_state)
-                elif event.key == pygame.K_ESCAPE:
-                    running = False
-        
-        # Update
-        for fw in fireworks:
-            fw.update(dt)
-        fireworks = [fw for fw in fireworks if len(fw.particles) > 0]
-        
-        # Render
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        glLoadIdentity()
-        
-        # Gambar latar belakang
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        draw_gradient_sky()
-        draw_stars()
-        draw_glowing_moon()
-        draw_city_background()
-        
-        # Gambar kembang api
-        for fw in fireworks:
-            for p in fw.particles:
-                draw_particle(p.position, p.color, p.size, p.rotation, p.shape, p.trail, p.is_curve_end)
-        
-        # Finalisasi render
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-        pygame.display.flip()
-        clock.tick(FPS)
+    if args.backend == "numpy" and not args.export:
+        sys.exit("Backend numpy hanya tersedia untuk mode --export")
     
-    # Cleanup
-    pygame.quit()
+    # Modul OpenGL hanya diimpor di mode jendela, agar mode headless
+    # bisa berjalan di server tanpa GPU/libGL; mode ekspor memilih platform
+    # GL offscreen sebelum OpenGL diimpor
+    if args.headless:
+        from headless import run_headless
+        run_headless(args)
+    elif args.export:
+        from export import run_export
+        run_export(args)
+    else:
+        from window import run_window
+        run_window(args)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""
+Render offscreen tanpa jendela: konteks OpenGL tersembunyi (EGL surfaceless
+atau OSMesa) dengan framebuffer object sebagai target render, serta
+pembacaan piksel asinkron lewat dua pixel buffer object (PBO).
+Modul ini mengimpor OpenGL, jadi platform PyOpenGL harus sudah dipilih
+(lihat export.select_platform) sebelum modul ini diimpor.
+"""
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+
+class OffscreenContext:
+    """
+    Kelas untuk membuat konteks GL tanpa jendela dan FBO RGBA berukuran tetap.
+    """
+    def __init__(self, width, height, platform="egl"):
+        self.width = width
+        self.height = height
+        self.platform = platform
+        if platform == "egl":
+            self._create_egl()
+        elif platform == "osmesa":
+            self._create_osmesa()
+        else:
+            raise ValueError("Platform GL offscreen tidak dikenal: %r" % platform)
+
+        # Target render: satu renderbuffer warna RGBA8
+        self.fbo = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        self.color = glGenRenderbuffers(1)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.color)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, self.color)
+        if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError("Framebuffer offscreen tidak lengkap")
+
+    def _create_egl(self):
+        from OpenGL import EGL
+        self._egl = EGL
+        self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(self.display, ctypes.pointer(major), ctypes.pointer(minor)):
+            raise RuntimeError("EGL tidak dapat diinisialisasi")
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        config, count = EGL.EGLConfig(), EGL.EGLint()
+        attributes = (EGL.EGLint * 5)(EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+                                      EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT, EGL.EGL_NONE)
+        EGL.eglChooseConfig(self.display, attributes, ctypes.pointer(config), 1, ctypes.pointer(count))
+        if count.value == 0:
+            raise RuntimeError("Tidak ada konfigurasi EGL untuk OpenGL")
+        self.context = EGL.eglCreateContext(self.display, config, EGL.EGL_NO_CONTEXT, None)
+        # Surfaceless: semua render masuk ke FBO, tanpa surface EGL
+        if not EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, self.context):
+            raise RuntimeError("Konteks EGL tidak dapat diaktifkan")
+
+    def _create_osmesa(self):
+        from OpenGL import osmesa
+        self._osmesa = osmesa
+        self.context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 0, 0, None)
+        # OSMesa tetap membutuhkan buffer default; render tetap ke FBO
+        self._default_buffer = np.zeros((self.height, self.width, 4), dtype=np.uint8)
+        if not osmesa.OSMesaMakeCurrent(self.context, self._default_buffer, GL_UNSIGNED_BYTE,
+                                        self.width, self.height):
+            raise RuntimeError("Konteks OSMesa tidak dapat diaktifkan")
+
+    def close(self):
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        glDeleteRenderbuffers(1, [self.color])
+        glDeleteFramebuffers(1, [self.fbo])
+        if self.platform == "egl":
+            EGL = self._egl
+            EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+            EGL.eglDestroyContext(self.display, self.context)
+            EGL.eglTerminate(self.display)
+        else:
+            self._osmesa.OSMesaDestroyContext(self.context)
+
+
+class PixelReader:
+    """
+    Kelas untuk membaca piksel frame secara asinkron dengan dua PBO.
+    glReadPixels frame N diarahkan ke satu PBO (tanpa menunggu GPU), lalu
+    PBO frame N-1 yang sudah selesai dipetakan dan disalin, sehingga CPU
+    tidak menunggu transfer frame yang baru saja digambar.
+    """
+    def __init__(self, width, height, buffers=2):
+        self.width = width
+        self.height = height
+        self.size = width * height * 4
+        self.pbos = list(glGenBuffers(buffers))
+        for pbo in self.pbos:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self.size, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.frame = 0                      # Jumlah frame yang sudah dibaca ke PBO
+        self._pending = []                  # Indeks frame per PBO yang belum dipetakan
+
+    def read(self):
+        """Mulai membaca frame saat ini; kembalikan (indeks, piksel) frame sebelumnya atau None."""
+        pbo = self.pbos[self.frame % len(self.pbos)]
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        self._pending.append((self.frame, pbo))
+        self.frame += 1
+        result = None
+        if len(self._pending) == len(self.pbos):
+            result = self._map(*self._pending.pop(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        return result
+
+    def finish(self):
+        """Petakan semua PBO yang tersisa; kembalikan daftar (indeks, piksel)."""
+        frames = [self._map(index, pbo) for index, pbo in self._pending]
+        self._pending = []
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        return frames
+
+    def _map(self, index, pbo):
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        address = glMapBuffer(GL_PIXEL_PACK_BUFFER, GL_READ_ONLY)
+        pixels = np.ctypeslib.as_array((ctypes.c_ubyte * self.size).from_address(address)).copy()
+        glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        return index, pixels.reshape(self.height, self.width, 4)
+
+    def close(self):
+        glDeleteBuffers(len(self.pbos), self.pbos)
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Palet warna tema kembang api.
+Setiap tema disimpan sebagai data (warna peluncuran + spesifikasi variasi),
+dan warna ledakan dibuat sekaligus untuk N kurva dalam satu panggilan
+vektor. Tema baru cukup didaftarkan dengan register_theme atau load_themes.
+"""
+import json
+import numpy as np
+
+# Urutan kanal sektor HSV sederhana: 0 = penuh (1.0), 1 = f, 2 = 0.5
+HSV_SECTORS = np.array([
+    [0, 1, 2],      # Merah -> kuning
+    [1, 0, 2],      # Kuning -> hijau
+    [2, 0, 1],      # Hijau -> cyan
+    [2, 1, 0],      # Cyan -> biru
+    [1, 2, 0],      # Biru -> magenta
+    [0, 2, 1],      # Magenta -> merah
+])
+HSV_FLOOR = 0.5             # Nilai kanal terendah warna rainbow
+DEFAULT_LAUNCH_COLOR = [1.0, 1.0, 0.0, 1.0]  # Kuning untuk tema tanpa warna peluncuran
+
+def _range_colors(spec, n, rng):
+    # Setiap kanal RGB acak seragam di antara batas bawah dan atas
+    return rng.uniform(spec["low"], spec["high"], (n, 3))
+
+def _hsv_colors(spec, n, rng):
+    # Hue acak dikonversi ke RGB per sektor (lingkaran warna sederhana)
+    h = rng.random(n) * 6.0
+    sector = h.astype(int)
+    f = h - sector
+    f = np.where(sector % 2 == 0, 1 - f, f)
+    values = np.column_stack((np.ones(n), f, np.full(n, spec.get("floor", HSV_FLOOR))))
+    return np.take_along_axis(values, HSV_SECTORS[sector], axis=1)
+
+def _gray_colors(spec, n, rng):
+    # Abu-abu acak dengan sedikit pergeseran di kanal biru
+    v = rng.uniform(spec["low"], spec["high"], n)
+    tint = rng.uniform(-spec["tint"], spec["tint"], n)
+    return np.column_stack((v, v, v + tint))
+
+# Jenis variasi -> pembuat warna (n, 3)
+GENERATORS = {
+    "range": _range_colors,
+    "hsv": _hsv_colors,
+    "gray": _gray_colors,
+}
+
+THEMES = []                 # Nama tema terdaftar, sesuai urutan pendaftaran
+_themes = {}                # Nama tema -> (warna peluncuran, spesifikasi variasi)
+
+def register_theme(name, launch_color, kind="range", **spec):
+    """Daftarkan (atau ganti) tema dari data."""
+    if kind not in GENERATORS:
+        raise ValueError("Jenis variasi warna tidak dikenal: %r" % kind)
+    spec["kind"] = kind
+    if name not in _themes:
+        THEMES.append(name)
+    _themes[name] = (list(launch_color), spec)
+
+def load_themes(path):
+    """Daftarkan tema dari file JSON berisi daftar {"name", "launch_color", "kind", ...}."""
+    with open(path) as f:
+        for entry in json.load(f):
+            entry = dict(entry)
+            register_theme(entry.pop("name"), entry.pop("launch_color", DEFAULT_LAUNCH_COLOR), **entry)
+
+def launch_color(theme):
+    """Warna partikel peluncuran untuk tema."""
+    return list(_themes[theme][0]) if theme in _themes else list(DEFAULT_LAUNCH_COLOR)
+
+def colors(theme, n, rng):
+    """Buat n warna RGBA variasi tema sekaligus."""
+    spec = _themes[theme][1]
+    out = np.ones((n, 4))
+    out[:, :3] = GENERATORS[spec["kind"]](spec, n, rng)
+    return out
+
+# Tema bawaan
+register_theme("red", [1.0, 0.3, 0.0, 1.0], low=[0.8, 0.0, 0.0], high=[1.0, 0.5, 0.2])      # Merah-oranye-kuning
+register_theme("blue", [0.2, 0.4, 1.0, 1.0], low=[0.0, 0.3, 0.8], high=[0.2, 0.8, 1.0])     # Biru-cyan-hijau
+register_theme("purple", [0.7, 0.2, 1.0, 1.0], low=[0.5, 0.0, 0.8], high=[0.9, 0.4, 1.0])   # Ungu-pink-magenta
+register_theme("gold", [1.0, 0.8, 0.0, 1.0], low=[0.8, 0.7, 0.0], high=[1.0, 1.0, 0.3])     # Emas-kuning-oranye
+register_theme("green", [0.1, 0.8, 0.2, 1.0], low=[0.0, 0.7, 0.0], high=[0.3, 1.0, 0.5])    # Hijau-lime-cyan
+register_theme("rainbow", [1.0, 1.0, 1.0, 1.0], kind="hsv")                                 # Warna-warni
+register_theme("silver", [0.8, 0.8, 1.0, 1.0], kind="gray", low=0.7, high=1.0, tint=0.1)    # Putih-abu-abu-biru muda
+register_theme("pink", [1.0, 0.5, 0.8, 1.0], low=[0.9, 0.4, 0.7], high=[1.0, 0.8, 1.0])     # Pink-magenta-ungu muda
\ No newline at end of file
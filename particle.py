@@ -1,38 +1,65 @@
 """
 Kelas Particle untuk mengelola partikel kembang api.
 """
-import random
-import math
+
+# Nama bentuk partikel sesuai kode bentuk di ParticleSystem
+SHAPE_NAMES = ("circle", "square")
+
+def _field(name):
+    # Properti yang membaca/menulis satu baris array di ParticleSystem
+    def fget(self):
+        return getattr(self._system, name)[self._index]
+
+    def fset(self, value):
+        getattr(self._system, name)[self._index] = value
+
+    return property(fget, fset)
 
 class Particle:
     """
-    Kelas untuk mengelola partikel kembang api.
-    Menangani properti dan perilaku partikel individual.
+    Kelas untuk mengakses partikel kembang api.
+    Data partikel disimpan di array ParticleSystem; objek ini hanya
+    handle ringan (__slots__) ke satu baris, dan dipakai ulang oleh
+    ParticleSystem sehingga tidak dibuat ulang setiap frame.
     """
-    def __init__(self, position, color, velocity, lifetime, size=0.2, is_launch_particle=False):
-        # Properti dasar
-        self.position = list(position)      # [x, y]
-        self.color = list(color)            # [R, G, B, A]
-        self.velocity = list(velocity)      # [vx, vy]
-        self.lifetime = lifetime            # Waktu hidup (detik)
-        self.age = 0.0                      # Usia partikel
-        
-        # Properti visual
-        self.initial_size = size            # Ukuran awal
-        self.size = size                    # Ukuran saat ini
-        self.shape = random.choice(["circle", "square"])  # Bentuk partikel
-        self.rotation = 0.0                 # Rotasi (derajat)
-        self.rotation_speed = random.uniform(-180, 180)  # Kecepatan rotasi
-        
-        # Properti perilaku
-        self.is_launch_particle = is_launch_particle  # Partikel peluncuran
-        self.is_curve_end = False           # Partikel ujung kurva
-        self.expansion_phase = True         # Fase ekspansi
-        self.expansion_time = random.uniform(0.2, 0.5)  # Durasi ekspansi
-        self.has_peaked = False             # Status puncak
-        self.peak_time = 0                  # Waktu puncak
-        
-        # Efek visual
-        self.trail = []                     # Ekor partikel
-        self.trail_counter = 0              # Counter ekor
-        self.fall_fade_speed = random.uniform(0.5, 1.5)  # Kecepatan memudar 
\ No newline at end of file
+    __slots__ = ("_system", "_index")
+
+    def __init__(self, system, index):
+        self._system = system               # ParticleSystem pemilik data
+        self._index = index                 # Baris partikel di array
+
+    # Properti dasar
+    position = _field("position")           # [x, y]
+    render_position = _field("render_position")  # [x, y] hasil interpolasi
+    color = _field("color")                 # [R, G, B, A]
+    velocity = _field("velocity")           # [vx, vy]
+    lifetime = _field("lifetime")           # Waktu hidup (detik)
+    age = _field("age")                     # Usia partikel
+
+    # Properti visual
+    initial_size = _field("initial_size")   # Ukuran awal
+    size = _field("size")                   # Ukuran saat ini
+    rotation = _field("rotation")           # Rotasi (derajat)
+    rotation_speed = _field("rotation_speed")  # Kecepatan rotasi
+
+    # Properti perilaku
+    is_launch_particle = _field("is_launch_particle")  # Partikel peluncuran
+    is_curve_end = _field("is_curve_end")   # Partikel ujung kurva
+    expansion_phase = _field("expansion_phase")  # Fase ekspansi
+    expansion_time = _field("expansion_time")    # Durasi ekspansi
+    has_peaked = _field("has_peaked")       # Status puncak
+    peak_time = _field("peak_time")         # Waktu puncak
+
+    # Efek visual
+    trail_counter = _field("trail_counter")  # Counter ekor
+    fall_fade_speed = _field("fall_fade_speed")  # Kecepatan memudar
+
+    @property
+    def shape(self):
+        return SHAPE_NAMES[self._system.shape[self._index]]  # Bentuk partikel
+
+    @property
+    def trail(self):
+        # Ekor partikel (TrailView yang dipakai ulang, valid sampai dibaca lagi)
+        system = self._system
+        return system.trails.view.load(self._index, system.color[self._index], system.time)
\ No newline at end of file
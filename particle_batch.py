@@ -0,0 +1,75 @@
+"""
+Pembangun geometri partikel secara batch.
+Mengubah seluruh populasi ParticleSystem menjadi satu array vertex
+(x, y, r, g, b, a) berbentuk segitiga dalam koordinat layar kamera, siap
+diunggah ke vertex buffer.
+"""
+import numpy as np
+from config import settings
+from camera import camera
+from particle_system import SHAPE_CIRCLE, SHAPE_SQUARE
+from tessellation import circle_fan, segments_for_radius
+
+VERTEX_SIZE = 6             # x, y, r, g, b, a
+PARTICLE_SIZE = 0.35        # Ukuran partikel dalam satuan dunia per satuan size
+CURVE_END_BRIGHTNESS = 1.3  # Pengali kecerahan partikel ujung kurva
+
+# Persegi satuan (radius 1) untuk partikel berbentuk persegi
+SQUARE_TEMPLATE = np.array([(-1, -1), (1, -1), (1, 1), (-1, -1), (1, 1), (-1, 1)], dtype=np.float64)
+
+
+class ParticleBatch:
+    """
+    Kelas untuk membangun buffer segitiga semua partikel.
+    Pendar partikel dibuat oleh pass bloom (bloom.py), bukan geometri tambahan.
+    Lingkaran memakai tesselasi bersama (tessellation.py) dengan jumlah segmen
+    menurut radius di layar, dibatasi settings.circle_segments.
+    Buffer dipakai ulang antar frame dan hanya diperbesar saat kurang.
+    """
+    def __init__(self):
+        self.vertices = np.zeros((0, VERTEX_SIZE), dtype=np.float32)
+        self.count = 0                      # Jumlah vertex terisi
+
+    def _reserve(self, count):
+        if count > len(self.vertices):
+            self.vertices = np.zeros((max(count, 2 * len(self.vertices)), VERTEX_SIZE), dtype=np.float32)
+
+    def build(self, system):
+        """Isi buffer dari populasi partikel; kembalikan jumlah vertex."""
+        # Partikel di luar pandangan kamera dibuang sebelum perhitungan apa
+        # pun, sehingga zoom ke satu ledakan hanya membayar partikel ledakan itu
+        visible = np.flatnonzero(system.on_screen())
+        center = camera.to_screen(system.render_position[visible])
+        size = system.size[visible]
+        shape = system.shape[visible]
+        curve_end = system.is_curve_end[visible]
+        angle = np.radians(system.rotation[visible])
+        cos, sin = np.cos(angle), np.sin(angle)
+
+        # Partikel ujung kurva digambar lebih cerah (alpha tidak diubah)
+        color = system.color[visible]
+        color[curve_end, :3] = np.minimum(1.0, color[curve_end, :3] * CURVE_END_BRIGHTNESS)
+
+        # Radius di layar ikut zoom, sehingga LOD lingkaran juga mengikutinya
+        radius = size * (PARTICLE_SIZE / 2 * camera.scale)
+        groups = [(np.flatnonzero(shape == SHAPE_SQUARE), SQUARE_TEMPLATE)]
+        circles = np.flatnonzero(shape == SHAPE_CIRCLE)
+        lod = segments_for_radius(radius[circles], settings.circle_segments)
+        for segments in np.unique(lod):
+            groups.append((circles[lod == segments], circle_fan(segments)))
+
+        self._reserve(sum(len(rows) * len(template) for rows, template in groups))
+        offset = 0
+        for rows, template in groups:
+            k = len(template)
+            out = self.vertices[offset:offset + len(rows) * k].reshape(len(rows), k, VERTEX_SIZE)
+            r = radius[rows, None]
+            c, s = cos[rows, None], sin[rows, None]
+            tx, ty = template[None, :, 0], template[None, :, 1]
+            out[:, :, 0] = center[rows, 0, None] + r * (tx * c - ty * s)
+            out[:, :, 1] = center[rows, 1, None] + r * (tx * s + ty * c)
+            out[:, :, 2:] = color[rows, None, :]
+            offset += len(rows) * k
+
+        self.count = offset
+        return offset
\ No newline at end of file
@@ -0,0 +1,334 @@
+"""
+Mesin partikel berbasis array NumPy (structure-of-arrays).
+Seluruh populasi partikel disimpan dalam array kontigu dan di-update
+sekaligus dengan operasi vektor, menggantikan loop per objek Particle.
+Baris partikel yang mati dipakai ulang oleh emisi berikutnya, sehingga
+array hanya dialokasikan ulang saat populasi melampaui kapasitas.
+Semua kembang api memancarkan ke satu sistem bersama (`particle_system`);
+setiap partikel menyimpan ID emitter (kembang api) pemiliknya.
+"""
+import numpy as np
+from config import settings
+from camera import camera, world_bounds
+from particle import Particle
+from trail_buffer import TrailBuffer, TRAIL_MAX_AGE, trail_depth
+
+# Kode bentuk partikel
+SHAPE_CIRCLE = 0
+SHAPE_SQUARE = 1
+
+# Konstanta perilaku (sama dengan versi per-partikel sebelumnya)
+FADE_START = 0.6            # Mulai memudar pada 60% lifetime
+CULL_MARGIN = 0.3           # Pelebaran batas layar agar glow dan ekor di tepi tidak terpotong
+
+# Field per partikel: nama -> (lebar kolom, dtype). Lebar 0 berarti skalar.
+FIELDS = {
+    "position": (2, np.float64),
+    "previous_position": (2, np.float64),  # Posisi pada langkah sebelumnya
+    "render_position": (2, np.float64),    # Posisi hasil interpolasi render
+    "velocity": (2, np.float64),
+    "color": (4, np.float64),
+    "age": (0, np.float64),
+    "lifetime": (0, np.float64),
+    "initial_size": (0, np.float64),
+    "size": (0, np.float64),
+    "shape": (0, np.uint8),
+    "rotation": (0, np.float64),
+    "rotation_speed": (0, np.float64),
+    "is_launch_particle": (0, np.bool_),
+    "is_curve_end": (0, np.bool_),
+    "expansion_phase": (0, np.bool_),
+    "expansion_time": (0, np.float64),
+    "has_peaked": (0, np.bool_),
+    "peak_time": (0, np.float64),
+    "trail_counter": (0, np.float64),
+    "fall_fade_speed": (0, np.float64),
+    "last_seen": (0, np.float64),           # Waktu terakhir berada di dalam layar
+    "emitter": (0, np.int64),               # ID kembang api pemilik partikel
+}
+
+
+class ParticleSystem:
+    """
+    Kelas untuk mengelola populasi partikel dalam array NumPy.
+    Menangani emisi, update fisika, ekor, dan penghapusan partikel mati.
+    """
+    def __init__(self, capacity=4096):
+        self.count = 0                      # Jumlah partikel hidup
+        self.capacity = 0
+        self.time = 0.0                     # Waktu simulasi (untuk umur ekor)
+        self.rng = np.random.default_rng()  # Variasi acak ukuran ekor
+        self.next_emitter = 0               # ID emitter berikutnya
+        self.emitter_counts = {}            # ID emitter -> jumlah partikel hidup
+        self.finished_emitters = []         # Emitter yang partikelnya sudah habis
+        self.culled = 0                     # Partikel yang dihapus sebelum lifetime habis
+        # Ekor per partikel (ring buffer), sedalam yang dibutuhkan konfigurasi
+        self.trails = TrailBuffer(capacity, trail_depth(settings.trail_interval, settings.trail_count,
+                                                        settings.simulation_step))
+        self._handles = []                  # Pool handle Particle per baris
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        # Alokasi (atau perbesar) semua array dengan menyalin data lama
+        for name, (columns, dtype) in FIELDS.items():
+            shape = (capacity, columns) if columns else (capacity,)
+            array = np.zeros(shape, dtype=dtype)
+            if self.capacity:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        if capacity > self.trails.capacity:
+            self.trails.allocate(capacity, self.count)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """Hapus semua partikel dan emitter (misal saat memulai ulang pertunjukan)."""
+        self.count = 0
+        self.time = 0.0
+        self.culled = 0
+        self.emitter_counts.clear()
+        self.finished_emitters.clear()
+
+    def room(self):
+        """Sisa partikel yang boleh dipancarkan sebelum mencapai max_particles."""
+        if settings.max_particles is None:
+            return np.inf
+        return max(0, settings.max_particles - self.count)
+
+    def new_emitter(self):
+        """Daftarkan emitter baru dan kembalikan ID-nya."""
+        self.next_emitter += 1
+        return self.next_emitter
+
+    def emit(self, position, color, velocity, lifetime, size, rng, emitter=0,
+             is_launch_particle=False, is_curve_end=False):
+        """
+        Tambahkan sekumpulan partikel sekaligus.
+        Argumen boleh berupa nilai tunggal atau array per partikel;
+        jumlah partikel diambil dari panjang `velocity`.
+        """
+        velocity = np.asarray(velocity, dtype=np.float64).reshape(-1, 2)
+        n = len(velocity)
+        if self.count + n > self.capacity:
+            self._allocate(max(self.capacity * 2, self.count + n))
+
+        s = slice(self.count, self.count + n)
+        self.position[s] = position
+        self.previous_position[s] = self.position[s]
+        self.render_position[s] = self.position[s]
+        self.velocity[s] = velocity
+        self.color[s] = color
+        self.age[s] = 0.0
+        self.lifetime[s] = lifetime
+        self.initial_size[s] = size
+        self.size[s] = size
+        self.rotation[s] = 0.0
+        self.is_launch_particle[s] = is_launch_particle
+        self.is_curve_end[s] = is_curve_end
+        self.expansion_phase[s] = True
+        self.has_peaked[s] = False
+        self.peak_time[s] = 0.0
+        self.trail_counter[s] = 0.0
+        self.last_seen[s] = self.time
+        self.emitter[s] = emitter
+        self.emitter_counts[emitter] = self.emitter_counts.get(emitter, 0) + n
+
+        # Properti acak per partikel diambil sekaligus
+        self.shape[s] = rng.integers(0, 2, n)
+        self.rotation_speed[s] = rng.uniform(-180, 180, n)
+        self.expansion_time[s] = rng.uniform(0.2, 0.5, n)
+        self.fall_fade_speed[s] = rng.uniform(0.5, 1.5, n)
+
+        self.trails.clear(s)
+        self.count += n
+
+    def discard(self, index):
+        """Hapus partikel (indeks atau array indeks) dengan tetap menjaga urutan partikel lain."""
+        keep = np.ones(self.count, dtype=np.bool_)
+        keep[index] = False
+        self._compact(keep)
+
+    def _compact(self, keep):
+        self._release_emitters(self.emitter[:self.count][~keep])
+
+        # Geser partikel yang masih hidup ke awal array
+        indices = np.flatnonzero(keep)
+        n = len(indices)
+        for name in FIELDS:
+            array = getattr(self, name)
+            array[:n] = array[indices]
+        self.trails.compact(indices)
+        self.count = n
+
+    def _release_emitters(self, removed):
+        # Kurangi jumlah partikel per emitter; catat emitter yang sudah habis
+        ids, counts = np.unique(removed, return_counts=True)
+        for emitter, removed_count in zip(ids.tolist(), counts.tolist()):
+            left = self.emitter_counts[emitter] - removed_count
+            if left:
+                self.emitter_counts[emitter] = left
+            else:
+                del self.emitter_counts[emitter]
+                self.finished_emitters.append(emitter)
+
+    def rows_of(self, emitter):
+        """Indeks baris semua partikel milik satu emitter."""
+        return np.flatnonzero(self.emitter[:self.count] == emitter)
+
+    def peaked_launches(self):
+        """Indeks baris partikel peluncuran yang sudah mencapai puncak."""
+        n = self.count
+        return np.flatnonzero(self.is_launch_particle[:n] & (self.velocity[:n, 1] < 0))
+
+    def views(self):
+        """Daftar handle Particle untuk semua partikel hidup."""
+        # Handle terikat ke baris, jadi baris yang dipakai ulang oleh
+        # ledakan baru juga memakai ulang handle yang sama
+        handles = self._handles
+        for i in range(len(handles), self.count):
+            handles.append(Particle(self, i))
+        return handles[:self.count]
+
+    def interpolate(self, alpha):
+        """Hitung posisi render di antara langkah sebelumnya dan terakhir."""
+        n = self.count
+        previous = self.previous_position[:n]
+        np.subtract(self.position[:n], previous, out=self.render_position[:n])
+        self.render_position[:n] *= alpha
+        self.render_position[:n] += previous
+
+    def update(self, dt):
+        n = self.count
+        if n == 0:
+            return
+
+        pos = self.position[:n]
+        self.previous_position[:n] = pos
+        vel = self.velocity[:n]
+        color = self.color[:n]
+        age = self.age[:n]
+        expansion_phase = self.expansion_phase[:n]
+        expansion_time = self.expansion_time[:n]
+        has_peaked = self.has_peaked[:n]
+        explosive = ~self.is_launch_particle[:n]
+        curve_end = self.is_curve_end[:n]
+
+        # Periksa partikel yang mencapai puncak (kecepatan vertikal menjadi negatif)
+        peaking = explosive & ~has_peaked & (vel[:, 1] < 0)
+        has_peaked |= peaking
+        self.peak_time[:n][peaking] = age[peaking]
+
+        # Update fisika: fase ekspansi atau fase normal dengan hambatan
+        expanding = explosive & expansion_phase & (age < expansion_time)
+        expansion_phase &= expanding
+        speed = np.sqrt(vel[:, 0] ** 2 + vel[:, 1] ** 2)
+        dragged = explosive & ~expanding & (speed > 0.5)
+        scale = np.where(expanding, 1.0 + 0.1 * dt * settings.expansion_boost, 1.0)
+        scale = np.where(dragged, 1.0 - settings.drag_factor * speed * dt, scale)
+        gravity_scale = np.where(expanding, 0.3, 1.0)
+        vel *= scale[:, None]
+        gravity = settings.gravity
+        vel[:, 0] += gravity[0] * dt * gravity_scale
+        vel[:, 1] += gravity[1] * dt * gravity_scale
+        pos += vel * dt
+
+        self._update_trails(dt)
+        self.time += dt
+
+        # Update usia dan transparansi
+        age += dt
+        age_ratio = age / self.lifetime[:n]
+        fade = np.where(age_ratio < FADE_START, 1.0,
+                        1.0 - (age_ratio - FADE_START) / (1.0 - FADE_START))
+
+        # Partikel yang sudah melewati puncak memudar saat jatuh dan saat rendah
+        time_since_peak = age - self.peak_time[:n]
+        fall_fade_factor = np.minimum(1.0, np.abs(vel[:, 1]) / 5.0) * self.fall_fade_speed[:n]
+        fade_multiplier = np.maximum(0.0, 1.0 - time_since_peak * fall_fade_factor)
+        height_factor = np.clip((pos[:, 1] + 8) / 10.0, 0.0, 1.0)
+        fade = np.where(has_peaked, fade * fade_multiplier * height_factor, fade)
+        color[:, 3] = np.where(explosive, fade, 1.0 - age_ratio)
+
+        # Update ukuran
+        initial_size = self.initial_size[:n]
+        growing = expansion_phase & (age < expansion_time)
+        size_factor = np.where(growing, 1.0 + age / expansion_time * 0.5, 1.0 - age_ratio * 0.5)
+        size_factor = np.where(curve_end, 0.7 + 0.2 * np.sin(age * 8), size_factor)
+        launch_factor = 1.0 + 2.0 * (1.0 - np.abs(vel[:, 1]) / settings.firework_launch_speed)
+        size_factor = np.where(explosive, size_factor, launch_factor)
+        self.size[:n] = initial_size * size_factor
+
+        # Update rotasi hanya untuk partikel ledakan
+        self.rotation[:n] += np.where(explosive, self.rotation_speed[:n] * dt, 0.0)
+
+        # Hapus partikel yang sudah mati atau tidak akan terlihat lagi
+        alive = (age < self.lifetime[:n]) & ~self._invisible(n, explosive)
+        if not alive.all():
+            self._compact(alive)
+
+    def _invisible(self, n, explosive):
+        """Partikel ledakan yang dipastikan tidak akan terlihat lagi."""
+        pos = self.position[:n]
+        vel = self.velocity[:n]
+
+        # Setelah puncak, alpha hanya bisa turun; ekor memakai alpha partikel
+        # sehingga ikut tidak terlihat
+        transparent = explosive & self.has_peaked[:n] & (self.color[:n, 3] <= 0.0)
+
+        # Di luar layar dan bergerak menjauh: gravitasi hanya menarik ke bawah
+        # dan hambatan tidak membalik arah, jadi partikel tidak akan kembali.
+        # Ekor baru ikut di luar layar setelah TRAIL_MAX_AGE sejak terakhir terlihat.
+        # Batasnya seluruh dunia yang bisa dicapai kamera, bukan pandangan saat ini
+        view_left, view_right, view_bottom, view_top = world_bounds(CULL_MARGIN)
+        gravity = settings.gravity
+        inside = ((pos[:, 0] >= view_left) & (pos[:, 0] <= view_right) &
+                  (pos[:, 1] >= view_bottom) & (pos[:, 1] <= view_top))
+        last_seen = self.last_seen[:n]
+        last_seen[inside] = self.time
+        below = (pos[:, 1] < view_bottom) & (vel[:, 1] <= 0) & (gravity[1] <= 0)
+        left = (pos[:, 0] < view_left) & (vel[:, 0] <= 0) & (gravity[0] <= 0)
+        right = (pos[:, 0] > view_right) & (vel[:, 0] >= 0) & (gravity[0] >= 0)
+        leaving = explosive & (below | left | right) & (self.time - last_seen > TRAIL_MAX_AGE)
+        invisible = transparent | leaving
+        self.culled += int(np.count_nonzero(invisible & (self.age[:n] < self.lifetime[:n])))
+        return invisible
+
+    def on_screen(self):
+        """Penanda baris partikel yang posisi rendernya berada di dalam pandangan kamera."""
+        pos = self.render_position[:self.count]
+        view_left, view_right, view_bottom, view_top = camera.bounds(CULL_MARGIN)
+        return ((pos[:, 0] >= view_left) & (pos[:, 0] <= view_right) &
+                (pos[:, 1] >= view_bottom) & (pos[:, 1] <= view_top))
+
+    def _update_trails(self, dt):
+        n = self.count
+        counter = self.trail_counter[:n]
+        counter += dt
+        emitting = np.flatnonzero(counter > settings.trail_interval)
+        counter[emitting] = 0.0
+        if len(emitting) == 0:
+            return
+
+        # Konfigurasi bisa berubah setelah alokasi (preset, --set); ekor yang
+        # lebih rapat dari kapasitas ring buffer akan terpotong
+        depth = trail_depth(settings.trail_interval, settings.trail_count, dt)
+        if depth > self.trails.depth:
+            self.trails.deepen(depth, n)
+
+        # Tambahkan posisi saat ini ke ekor dengan ukuran bervariasi
+        position = self.position[emitting]
+        size = self.size[emitting]
+        self.trails.push(emitting, position, size * self.rng.uniform(0.6, 0.9, len(emitting)), self.time)
+
+        # Partikel ujung kurva mendapat trail_count ekor per emisi
+        ends = self.is_curve_end[emitting]
+        if settings.trail_count > 1 and ends.any():
+            for _ in range(settings.trail_count - 1):
+                self.trails.push(emitting[ends], position[ends],
+                                 size[ends] * self.rng.uniform(0.6, 0.9, np.count_nonzero(ends)), self.time)
+
+
+# Sistem partikel bersama untuk semua kembang api
+particle_system = ParticleSystem()
\ No newline at end of file
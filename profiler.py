@@ -0,0 +1,151 @@
+"""
+Profiler per frame untuk game loop.
+Mengukur waktu setiap fase (update, latar belakang, partikel, flip, ...)
+dengan perf_counter, menghitung partikel, segmen ekor, dan panggilan GL,
+lalu menyediakan rata-rata bergulir untuk HUD dan ekspor CSV per frame.
+"""
+import csv
+import time
+from collections import deque
+
+HUD_REFRESH = 0.5           # Jeda pembaruan teks HUD (detik)
+
+
+class GLCallCounter:
+    """
+    Penghitung panggilan GL dengan membungkus fungsi gl* di modul tertentu.
+    Hanya terpasang selama profiling aktif, sehingga tanpa biaya saat mati.
+    """
+    def __init__(self, modules):
+        self.modules = modules
+        self.calls = 0
+        self._originals = []
+
+    def _wrap(self, function):
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return function(*args, **kwargs)
+        return counted
+
+    def install(self):
+        if self._originals:
+            return
+        for module in self.modules:
+            for name, value in list(vars(module).items()):
+                if name.startswith("gl") and callable(value):
+                    self._originals.append((module, name, value))
+                    setattr(module, name, self._wrap(value))
+
+    def uninstall(self):
+        for module, name, value in self._originals:
+            setattr(module, name, value)
+        self._originals = []
+
+
+class FrameProfiler:
+    """
+    Kelas untuk mencatat waktu fase setiap frame.
+    Saat tidak aktif, setiap pemanggilan langsung kembali tanpa mengukur.
+    Kolom CSV diambil dari `phases` dan `counters` yang dideklarasikan di
+    awal, sehingga fase yang baru muncul belakangan (misal HUD dinyalakan
+    di tengah sesi) tetap punya kolom; nilai yang tidak ada ditulis kosong.
+    """
+    def __init__(self, gl_modules=(), csv_path=None, window=120, phases=(), counters=()):
+        self.enabled = False
+        self.show_hud = False
+        self.frame = 0
+        self.phases = {}                    # Nama fase -> durasi frame ini (detik)
+        self.counters = {}                  # Nama counter -> nilai frame ini
+        self.history = deque(maxlen=window)  # Baris frame untuk rata-rata bergulir
+        self.hud_lines = []
+        self.gl_counter = GLCallCounter(gl_modules)
+        self._last = 0.0
+        self._frame_start = 0.0
+        self._hud_time = 0.0
+        self._csv_file = None
+        self._csv_writer = None
+        self._csv_columns = (["frame", "total_ms"] + [name + "_ms" for name in phases]
+                             + list(counters) + ["gl_calls"])
+        if csv_path:
+            self._csv_file = open(csv_path, "w", newline="")
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(self._csv_columns)
+            self.set_enabled(True)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if enabled:
+            self.gl_counter.install()
+        elif self._csv_writer is None:
+            self.gl_counter.uninstall()
+
+    def toggle_hud(self):
+        # HUD ikut menyalakan profiling; mematikan HUD mematikan profiling
+        # kecuali ekspor CSV sedang berjalan
+        self.show_hud = not self.show_hud
+        self.set_enabled(self.show_hud or self._csv_writer is not None)
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.phases = {}
+        self.counters = {}
+        self.gl_counter.calls = 0
+        self._frame_start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """Tutup fase yang sedang berjalan dengan nama `phase`."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def count(self, name, value):
+        if not self.enabled:
+            return
+        self.counters[name] = value
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        row = {"frame": self.frame, "total_ms": (now - self._frame_start) * 1000}
+        row.update((name + "_ms", seconds * 1000) for name, seconds in self.phases.items())
+        row.update(self.counters)
+        row["gl_calls"] = self.gl_counter.calls
+        self.history.append(row)
+        self.frame += 1
+
+        if self._csv_writer is not None:
+            self._csv_writer.writerow([round(row[name], 4) if name in row else ""
+                                       for name in self._csv_columns])
+
+        if self.show_hud and now - self._hud_time > HUD_REFRESH:
+            self._hud_time = now
+            self.hud_lines = self._format_hud()
+
+    def averages(self):
+        """Rata-rata bergulir setiap kolom numerik."""
+        totals = {}
+        for row in self.history:
+            for name, value in row.items():
+                totals[name] = totals.get(name, 0) + value
+        return {name: value / len(self.history) for name, value in totals.items()}
+
+    def _format_hud(self):
+        avg = self.averages()
+        total = avg.get("total_ms", 0.0)
+        phases = [name for name in avg if name.endswith("_ms") and name != "total_ms"]
+        lines = ["FPS %.1f  frame %.2f ms" % (1000.0 / total if total else 0.0, total)]
+        lines.append("  ".join("%s %.2f" % (name[:-3], avg[name]) for name in phases))
+        counters = [name for name in avg if not name.endswith("_ms") and name != "frame"]
+        lines.append("  ".join("%s %d" % (name, avg[name]) for name in counters))
+        return lines
+
+    def close(self):
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+        self.gl_counter.uninstall()
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""
+Antrian render yang diurutkan berdasarkan state GL.
+Setiap item gambar diberi layer, mode blend, transformasi, buffer vertex,
+jenis primitif, dan ukuran titik/garis. Saat flush, item diurutkan per
+layer lalu per state sehingga state yang sama hanya diset sekali, dan
+jumlah perubahan state yang dihemat dicatat untuk profiler.
+"""
+import ctypes
+from OpenGL.GL import *
+
+# Mode blend
+BLEND_NORMAL = (GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+BLEND_ADDITIVE = (GL_SRC_ALPHA, GL_ONE)
+
+# Layer digambar berurutan; item di dalam satu layer harus bebas urutan
+# (misal semua aditif), karena urutannya diubah saat pengurutan state
+LAYER_BACKGROUND = 0
+LAYER_CITY_BACK = 1
+LAYER_CITY = 2
+LAYER_WINDOWS = 3
+LAYER_TRAILS = 4
+LAYER_PARTICLES = 5
+LAYER_GLOW = 6              # Hanya digambar ke sumber bloom (misal piringan bulan)
+
+class DrawItem:
+    """Satu panggilan gambar beserta state yang dibutuhkannya."""
+    __slots__ = ("layer", "blend", "transform", "buffer", "primitive", "size", "first", "count", "display_list")
+
+    def __init__(self, layer, blend, transform, buffer, primitive, size, first, count, display_list):
+        self.layer = layer
+        self.blend = blend
+        self.transform = transform          # (geser x, geser y, skala) atau None untuk koordinat layar
+        self.buffer = buffer                # Nama buffer vertex atau None
+        self.primitive = primitive
+        self.size = size                    # Ukuran titik (GL_POINTS) atau lebar garis (GL_LINES)
+        self.first = first
+        self.count = count
+        self.display_list = display_list
+
+    def sort_key(self):
+        return (self.layer, self.blend, self.transform or (), self.buffer or "",
+                self.primitive or 0, self.size or 0.0)
+
+    def state_count(self):
+        # Perubahan state jika item ini digambar sendiri (tanpa antrian)
+        return 1 + (self.transform is not None) + (self.buffer is not None) + (self.size is not None)
+
+
+class RenderQueue:
+    """
+    Kelas untuk mengumpulkan item gambar satu frame lalu mengirimnya ke GL
+    dengan perubahan state seminimal mungkin.
+    """
+    def __init__(self):
+        self.items = []
+        self.buffers = {}                   # Nama -> array vertex (x, y, r, g, b, a) frame ini
+        self.vbos = {}                      # Nama -> ID VBO
+        self.uploaded = set()               # Buffer yang sudah diunggah frame ini
+        self.draw_calls = 0                 # Statistik flush terakhir
+        self.state_changes = 0
+        self.state_saved = 0
+
+    def set_buffer(self, name, vertices):
+        """Daftarkan vertex frame ini untuk buffer `name` (diunggah saat pertama dipakai)."""
+        self.buffers[name] = vertices
+
+    def add(self, layer, blend, primitive=None, buffer=None, first=0, count=0,
+            transform=None, size=None, display_list=None):
+        self.items.append(DrawItem(layer, blend, transform, buffer, primitive, size,
+                                   first, count, display_list))
+
+    def _set_transform(self, current, transform):
+        if current is not None:
+            glPopMatrix()
+        if transform is not None:
+            glPushMatrix()
+            glTranslatef(transform[0], transform[1], 0)
+            glScalef(transform[2], transform[2], 1)
+
+    def _bind(self, name):
+        if name not in self.vbos:
+            self.vbos[name] = glGenBuffers(1)
+        vertices = self.buffers[name]
+        stride = vertices.strides[0]
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbos[name])
+        if name not in self.uploaded:
+            glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STREAM_DRAW)
+            self.uploaded.add(name)
+        glVertexPointer(2, GL_FLOAT, stride, ctypes.c_void_p(0))
+        glColorPointer(4, GL_FLOAT, stride, ctypes.c_void_p(2 * vertices.itemsize))
+
+    def flush(self, layers=None, keep=False):
+        """
+        Urutkan dan gambar semua item (atau hanya item di `layers`), lalu
+        kembalikan state ke blend normal. Dengan keep=True antrian dan buffer
+        yang sudah diunggah dipertahankan untuk flush berikutnya di frame ini
+        (misal pass sumber bloom).
+        """
+        items = sorted((item for item in self.items if layers is None or item.layer in layers),
+                       key=DrawItem.sort_key)
+        blend = transform = buffer = size = None
+        changes = 0
+        arrays = False
+        for item in items:
+            if item.blend != blend:
+                blend = item.blend
+                glBlendFunc(*blend)
+                changes += 1
+            if item.transform != transform:
+                self._set_transform(transform, item.transform)
+                transform = item.transform
+                changes += 1
+
+            if item.display_list is not None:
+                glCallList(item.display_list)
+                continue
+
+            if item.buffer != buffer:
+                if not arrays:
+                    glEnableClientState(GL_VERTEX_ARRAY)
+                    glEnableClientState(GL_COLOR_ARRAY)
+                    arrays = True
+                buffer = item.buffer
+                self._bind(buffer)
+                changes += 1
+            if item.size is not None and (item.primitive, item.size) != size:
+                size = (item.primitive, item.size)
+                if item.primitive == GL_POINTS:
+                    glPointSize(item.size)
+                else:
+                    glLineWidth(item.size)
+                changes += 1
+            glDrawArrays(item.primitive, item.first, item.count)
+
+        # Kembalikan state bersama ke kondisi awal frame
+        if arrays:
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self._set_transform(transform, None)
+        if blend != BLEND_NORMAL:
+            glBlendFunc(*BLEND_NORMAL)
+
+        if keep:
+            return len(items)
+        self.draw_calls = len(items)
+        self.state_changes = changes
+        self.state_saved = sum(item.state_count() for item in items) - changes
+        self.items = []
+        self.buffers = {}
+        self.uploaded = set()
+        return self.draw_calls
\ No newline at end of file
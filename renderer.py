@@ -1,19 +1,55 @@
 """
 Fungsi-fungsi rendering untuk menggambar elemen visual.
 """
-import random
-import math
+import numpy as np
+import pygame
 from OpenGL.GL import *
 from OpenGL.GLUT import *
 from OpenGL.GLU import *
-from config import width, height, PARTICLE_COUNT
-from building import buildings
+from config import settings
+from camera import camera
+from building import city, WINDOW_WIDTH, WINDOW_HEIGHT
+from particle_batch import ParticleBatch
+from trail_batch import TrailBatch
+from render_queue import (RenderQueue, BLEND_NORMAL, BLEND_ADDITIVE, LAYER_BACKGROUND, LAYER_CITY_BACK,
+                          LAYER_CITY, LAYER_WINDOWS, LAYER_TRAILS, LAYER_PARTICLES, LAYER_GLOW)
+from bloom import Bloom
+from scene import SKY_BOTTOM, SKY_TOP, MOON_COLOR, MOON_RADIUS, MOON_GLOW, moon_center, generate_stars
+from tessellation import unit_circle, segments_for_radius
+from trail_buffer import TRAIL_MAX_AGE
+from particle_system import CULL_MARGIN
 
-# Inisialisasi bintang
-stars = [(random.randint(0, width), random.randint(height // 2, height)) for _ in range(PARTICLE_COUNT)]
+# Bintang (dibuat ulang saat jumlah bintang atau ukuran layar berubah)
+stars = []
+
+# Buffer partikel dan ekor batch, serta antrian render per frame
+particle_batch = ParticleBatch()
+trail_batch = TrailBatch()
+render_queue = RenderQueue()
+
+# Cache latar belakang statis (display list) beserta kunci validitasnya, dan
+# display list piringan bulan sebagai sumber bloom
+background_list = None
+background_key = None
+moon_list = None
+
+# Chunk kota yang punya display list GL (dihapus saat chunk digusur dari cache)
+baked_chunks = []
+
+# Sudut dua segitiga satu jendela
+WINDOW_CORNERS = np.array([(0, 0), (WINDOW_WIDTH, 0), (WINDOW_WIDTH, WINDOW_HEIGHT),
+                           (0, 0), (WINDOW_WIDTH, WINDOW_HEIGHT), (0, WINDOW_HEIGHT)], dtype=np.float32)
+
+# Pass bloom (dibuat saat pertama dipakai, ulang jika ukurannya berubah)
+bloom = None
+
+# Cache teks HUD profiler: (baris teks, (lebar, tinggi, piksel RGBA))
+hud_font = None
+hud_cache = (None, None)
 
 def init_gl():
     """Inisialisasi OpenGL dan pengaturan dasar."""
+    width, height = settings.width, settings.height
     glViewport(0, 0, width, height)
     glMatrixMode(GL_PROJECTION)
     glLoadIdentity()
@@ -23,13 +59,19 @@ def init_gl():
     glEnable(GL_BLEND)
     glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
+def begin_frame():
+    """Kosongkan framebuffer dan matriks modelview untuk frame baru."""
+    glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+    glLoadIdentity()
+
 def draw_gradient_sky():
     """Menggambar latar langit dengan gradien."""
+    width, height = settings.width, settings.height
     glBegin(GL_QUADS)
-    glColor3f(0.0, 0.0, 0.1)
+    glColor3f(*SKY_BOTTOM)
     glVertex2f(0, 0)
     glVertex2f(width, 0)
-    glColor3f(0.0, 0.1, 0.2)
+    glColor3f(*SKY_TOP)
     glVertex2f(width, height)
     glVertex2f(0, height)
     glEnd()
@@ -42,223 +84,200 @@ def draw_stars():
         glVertex2f(*star)
     glEnd()
 
-def draw_circle(x, y, radius, segments=100):
+def draw_circle(x, y, radius, segments=None):
+    # Tanpa `segments`, tesselasi dipilih dari radius di layar (maksimal 100)
+    if segments is None:
+        segments = int(segments_for_radius(radius, 100))
     glBegin(GL_TRIANGLE_FAN)
     glVertex2f(x, y)
-    for i in range(segments + 1):
-        angle = 2 * math.pi * i / segments
-        glVertex2f(x + radius * math.cos(angle), y + radius * math.sin(angle))
+    for cx, cy in unit_circle(segments):
+        glVertex2f(x + radius * cx, y + radius * cy)
     glEnd()
 
-def draw_glowing_moon():
-    center_x, center_y = width // 2, int(height * 0.65)
-    radius = 120
-    for i in range(1, 6):
-        glow_radius = radius + i * 15
-        alpha = 0.05
-        glColor4f(1.0, 1.0, 0.6, alpha)
-        draw_circle(center_x, center_y, glow_radius)
-    glColor3f(1.0, 1.0, 0.6)
-    draw_circle(center_x, center_y, radius)
+def draw_moon(brightness=1.0):
+    # Halo bulan dibuat oleh pass bloom, bukan lingkaran transparan bertumpuk
+    center_x, center_y = moon_center(settings.width, settings.height)
+    glColor3f(*(brightness * c for c in MOON_COLOR))
+    draw_circle(center_x, center_y, MOON_RADIUS, settings.moon_segments)
 
 def draw_building(building):
-    x = building.x
-    width_b = building.width
-    height_b = building.height
-    shape = building.shape
-    
     # Tentukan warna berdasarkan jenis gedung
     if not building.with_window:  # Gedung belakang
         glColor3f(0.0, 0.0, 0.0)  # Hitam pekat
     else:  # Gedung depan dengan jendela
         glColor3f(0.05, 0.05, 0.15)  # Biru tua cenderung hitam
     
-    glBegin(GL_POLYGON)
+    for outline in building.outlines():
+        glBegin(GL_POLYGON)
+        for vertex in outline:
+            glVertex2f(*vertex)
+        glEnd()
 
-    if shape == "flat":
-        glVertex2f(x, 0)
-        glVertex2f(x + width_b, 0)
-        glVertex2f(x + width_b, height_b)
-        glVertex2f(x, height_b)
-    
-    elif shape == "step":
-        glVertex2f(x, 0)
-        glVertex2f(x + width_b, 0)
-        glVertex2f(x + width_b, height_b - 20)
-        glVertex2f(x + width_b * 0.7, height_b - 20)
-        glVertex2f(x + width_b * 0.7, height_b)
-        glVertex2f(x + width_b * 0.3, height_b)
-        glVertex2f(x + width_b * 0.3, height_b - 20)
-        glVertex2f(x, height_b - 20)
+def _window_vertices(chunk):
+    # Buffer segitiga jendela chunk: posisi dibangun sekali, warna hanya
+    # diperbarui saat kecerahan jendela chunk berubah
+    windows = chunk.windows
+    vertices, version = chunk.baked.get("gl_windows", (None, None))
+    if vertices is None:
+        vertices = np.empty((windows.count * len(WINDOW_CORNERS), 6), dtype=np.float32)
+        vertices[:, :2] = (windows.positions[:, None, :] + WINDOW_CORNERS[None]).reshape(-1, 2)
+        vertices[:, 5] = 1.0
+    if version != windows.version:
+        vertices[:, 2:5] = np.repeat(windows.colors(), len(WINDOW_CORNERS), axis=0)
+        chunk.baked["gl_windows"] = (vertices, windows.version)
+    return vertices
 
-    elif shape == "tower":
-        tower_w = width_b * 0.3
-        tower_x = x + (width_b - tower_w) / 2
-        glVertex2f(x, 0)
-        glVertex2f(x + width_b, 0)
-        glVertex2f(x + width_b, height_b - 30)
-        glVertex2f(tower_x + tower_w, height_b - 30)
-        glVertex2f(tower_x + tower_w, height_b)
-        glVertex2f(tower_x, height_b)
-        glVertex2f(tower_x, height_b - 30)
-        glVertex2f(x, height_b - 30)
+def _bake_chunk(chunk):
+    # Dua display list per chunk: gedung belakang lalu gedung depan
+    lists = glGenLists(2)
+    for offset, layer in enumerate((chunk.back, chunk.main)):
+        glNewList(lists + offset, GL_COMPILE)
+        for item in layer:
+            draw_building(item)
+        glEndList()
+    chunk.baked["gl"] = lists
+    baked_chunks.append(chunk)
+    return lists
 
-    elif shape == "eiffel":
-        # Ujung seperti menara Eiffel
-        glVertex2f(x, 0)
-        glVertex2f(x + width_b, 0)
-        glVertex2f(x + width_b, height_b - 40)
-        glVertex2f(x + width_b / 2 + 5, height_b - 40)
-        glVertex2f(x + width_b / 2, height_b + 20)  # lebih tinggi & ramping
-        glVertex2f(x + width_b / 2 - 5, height_b - 40)
-        glVertex2f(x, height_b - 40)
+def draw_city():
+    """
+    Memasukkan chunk kota yang terlihat ke antrian render: display list
+    gedung per chunk (dikompilasi sekali saat chunk pertama terlihat) dan
+    jendela semua chunk tersebut sebagai satu buffer segitiga. Semua
+    memakai transformasi kota dari kamera; chunk di luar pandangan kamera
+    tidak dimasukkan sama sekali.
+    """
+    chunks = city.visible()
+    for chunk in [chunk for chunk in baked_chunks if not city.contains(chunk)]:
+        glDeleteLists(chunk.baked.pop("gl"), 2)
+        baked_chunks.remove(chunk)
 
-    elif shape == "chimney":
-        # Cerobong asap
-        chimney_w = width_b * 0.2
-        chimney_x = x + (width_b - chimney_w) / 2
-        chimney_h = 25
-        glVertex2f(x, 0)
-        glVertex2f(x + width_b, 0)
-        glVertex2f(x + width_b, height_b)
-        glVertex2f(x, height_b)
-        glEnd()
-        glBegin(GL_POLYGON)
-        glVertex2f(chimney_x, height_b)
-        glVertex2f(chimney_x + chimney_w, height_b)
-        glVertex2f(chimney_x + chimney_w, height_b + chimney_h)
-        glVertex2f(chimney_x, height_b + chimney_h)
+    view = camera.city_transform(city.view_x)
+    for chunk in chunks:
+        lists = chunk.baked.get("gl") or _bake_chunk(chunk)
+        render_queue.add(LAYER_CITY_BACK, BLEND_NORMAL, display_list=lists, transform=view)
+        render_queue.add(LAYER_CITY, BLEND_NORMAL, display_list=lists + 1, transform=view)
 
-    glEnd()
+    if not chunks:
+        return
+    windows = np.concatenate([_window_vertices(chunk) for chunk in chunks])
+    if len(windows):
+        render_queue.set_buffer("windows", windows)
+        render_queue.add(LAYER_WINDOWS, BLEND_NORMAL, GL_TRIANGLES, "windows", 0, len(windows), transform=view)
 
-    # Gambar jendela hanya jika gedung memiliki jendela (gedung depan)
-    if building.with_window:
-        draw_saved_windows(building)
+def draw_background():
+    """
+    Memasukkan langit, bintang, dan bulan ke antrian render sebagai satu
+    display list yang hanya dikompilasi ulang saat ukuran layar atau
+    detailnya berubah, lalu kota yang terlihat lewat draw_city(). Jika bloom
+    aktif, piringan bulan juga dimasukkan sebagai sumber pendar.
+    """
+    global background_list, background_key, moon_list, stars
+    key = (settings.width, settings.height, settings.star_count, settings.moon_segments)
+    if background_key != key:
+        # Bintang dibuat ulang hanya jika ukuran layar atau jumlahnya berubah
+        if background_key is None or background_key[:3] != key[:3]:
+            stars = generate_stars(settings.width, settings.height, settings.star_count)
+        if background_list is None:
+            background_list = glGenLists(2)
+            moon_list = background_list + 1
+        glNewList(background_list, GL_COMPILE)
+        draw_gradient_sky()
+        draw_stars()
+        draw_moon()
+        glEndList()
+        glNewList(moon_list, GL_COMPILE)
+        draw_moon(MOON_GLOW)
+        glEndList()
+        background_key = key
+    render_queue.add(LAYER_BACKGROUND, BLEND_NORMAL, display_list=background_list)
+    draw_city()
+    if settings.glow:
+        render_queue.add(LAYER_GLOW, BLEND_ADDITIVE, display_list=moon_list)
 
-def draw_saved_windows(building):
-    glColor3f(1.0, 1.0, 0.7)  # Warna jendela sedikit lebih cerah
-    for wx, wy in building.windows:
-        glBegin(GL_QUADS)
-        glVertex2f(wx, wy)
-        glVertex2f(wx + 6, wy)
-        glVertex2f(wx + 6, wy + 10)
-        glVertex2f(wx, wy + 10)
-        glEnd()
-
-def draw_city_background():
-    # Gambar semua gedung dari data yang sudah dibuat
-    for building in buildings["back"]:
-        draw_building(building)
-    for building in buildings["main"]:
-        draw_building(building)
-
-def draw_particle(position, color, size=0.2, rotation=0.0, shape="circle", trail=None, is_curve_end=False):
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE)
-    
-    # Konversi koordinat dari kembang api ke koordinat layar
-    screen_pos = [
-        (position[0] * 100) + width/2,  # Skala dan geser ke tengah
-        position[1] * 100 + 100         # Skala dan geser ke atas sedikit
-    ]
-    
-    # Gambar ekor terlebih dahulu (sebelum partikel utama)
-    if trail:
-        # Gunakan garis untuk ekor, bukan titik
-        glLineWidth(2.0)  # Lebar garis ekor
-        
-        if len(trail) > 1:
-            glBegin(GL_LINE_STRIP)
-            for trail_segment in trail:
-                trail_screen_pos = [
-                    (trail_segment['pos'][0] * 100) + width/2,
-                    (trail_segment['pos'][1] * 100) + 100
-                ]
-                glColor4f(*trail_segment['color'])
-                glVertex2f(trail_screen_pos[0], trail_screen_pos[1])
-            glEnd()
-        
-        # Gambar partikel trail individual untuk efek yang lebih baik
-        for trail_segment in trail:
-            trail_screen_pos = [
-                (trail_segment['pos'][0] * 100) + width/2,
-                (trail_segment['pos'][1] * 100) + 100
-            ]
-            # Ukuran bergantung pada partikel trail
-            trail_size = size * 20 * (1.0 - trail_segment['age'] / trail_segment['max_age'])  # Kurangi ukuran trail (aslinya 25)
-            
-            if 'size' in trail_segment:
-                trail_size = trail_segment['size'] * 20  # Kurangi ukuran trail (aslinya 25)
-                
-            glPointSize(trail_size)
-            glBegin(GL_POINTS)
-            glColor4f(*trail_segment['color'])
-            glVertex2f(trail_screen_pos[0], trail_screen_pos[1])
-            glEnd()
-    
-    # Perbesar ukuran partikel agar lebih terlihat
-    actual_size = size * 35  # Kurangi ukuran (aslinya 50)
+def draw_trails(system):
+    """
+    Memasukkan ekor semua partikel dari TrailBatch ke antrian render: satu
+    item untuk semua garis dan satu per kelompok ukuran titik.
+    """
+    # Ekor hanya bisa terlihat jika partikelnya berada di layar dalam
+    # rentang umur ekor, dan hanya dibangun jika beririsan dengan pandangan kamera
+    rows = np.flatnonzero(system.time - system.last_seen[:system.count] <= TRAIL_MAX_AGE)
+    if not len(rows) or not trail_batch.build(system, rows, camera.scale, camera.bounds(CULL_MARGIN)):
+        return
     
-    glPushMatrix()
-    glTranslatef(screen_pos[0], screen_pos[1], 0)
-    glRotatef(rotation, 0, 0, 1)  # Rotasi di sumbu Z
+    # Koordinat ekor dalam satuan dunia; transformasi ke layar oleh matriks kamera
+    world = camera.transform()
     
-    # Jika ini adalah partikel ujung kurva, gambar dengan warna yang lebih cerah
-    display_color = color.copy()
-    if is_curve_end:
-        for i in range(3):  # Terangkan RGB, jangan ubah alpha
-            display_color[i] = min(1.0, color[i] * 1.3)  # Kurangi kecerahan (aslinya 1.5)
+    # Gunakan garis untuk ekor, bukan titik
+    if trail_batch.line_count:
+        render_queue.set_buffer("trail_lines", trail_batch.lines[:trail_batch.line_count])
+        render_queue.add(LAYER_TRAILS, BLEND_ADDITIVE, GL_LINES, "trail_lines", 0, trail_batch.line_count,
+                         transform=world, size=2.0)
     
-    # Gambar glow untuk partikel yang lebih besar
-    if is_curve_end or size > 0.3:
-        glow_size = actual_size * 1.3  # Kurangi ukuran glow (aslinya 1.5)
-        glow_color = display_color.copy()
-        glow_color[3] *= 0.3  # Transparansi untuk glow
-        
-        if shape == "circle":
-            segments = 16
-            glBegin(GL_TRIANGLE_FAN)
-            glColor4f(*glow_color)
-            glVertex2f(0, 0)  # Titik tengah
-            for i in range(segments + 1):
-                angle = 2 * math.pi * i / segments
-                x = math.cos(angle) * glow_size / 2
-                y = math.sin(angle) * glow_size / 2
-                glVertex2f(x, y)
-            glEnd()
-        else:  # square
-            half_size = glow_size / 2
-            glBegin(GL_QUADS)
-            glColor4f(*glow_color)
-            glVertex2f(-half_size, -half_size)
-            glVertex2f(half_size, -half_size)
-            glVertex2f(half_size, half_size)
-            glVertex2f(-half_size, half_size)
-            glEnd()
-    
-    # Gambar partikel berdasarkan bentuknya
-    if shape == "circle":
-        segments = 16  # Jumlah segmen lingkaran
-        glBegin(GL_TRIANGLE_FAN)
-        glColor4f(*display_color)
-        glVertex2f(0, 0)  # Titik tengah
-        for i in range(segments + 1):
-            angle = 2 * math.pi * i / segments
-            x = math.cos(angle) * actual_size / 2
-            y = math.sin(angle) * actual_size / 2
-            glVertex2f(x, y)
-        glEnd()
-    else:  # square
-        half_size = actual_size / 2
-        glBegin(GL_QUADS)
-        glColor4f(*display_color)
-        glVertex2f(-half_size, -half_size)
-        glVertex2f(half_size, -half_size)
-        glVertex2f(half_size, half_size)
-        glVertex2f(-half_size, half_size)
-        glEnd()
+    # Gambar partikel trail individual untuk efek yang lebih baik
+    render_queue.set_buffer("trail_points", trail_batch.points[:trail_batch.point_count])
+    for pixels, start, count in trail_batch.buckets:
+        render_queue.add(LAYER_TRAILS, BLEND_ADDITIVE, GL_POINTS, "trail_points", start, count,
+                         transform=world, size=float(pixels))
+
+def draw_particles(system):
+    """
+    Memasukkan seluruh populasi partikel beserta ekornya ke antrian render.
+    Semua memakai blending aditif, sehingga urutan gambarnya bebas.
+    """
+    draw_trails(system)
+    count = particle_batch.build(system)
+    if count:
+        render_queue.set_buffer("particles", particle_batch.vertices[:count])
+        render_queue.add(LAYER_PARTICLES, BLEND_ADDITIVE, GL_TRIANGLES, "particles", 0, count)
+
+def submit_frame():
+    """
+    Kirim antrian render frame ini ke GL; kembalikan jumlah panggilan gambar.
+    Jika glow aktif, partikel dan bulan lebih dulu digambar ke tekstur bloom
+    beresolusi rendah (dengan buffer vertex yang sama, tanpa geometri
+    tambahan), lalu hasil blurnya ditambahkan di atas frame.
+    """
+    global bloom
+    if not settings.glow:
+        return render_queue.flush()
+    size = (settings.width, settings.height, settings.bloom_downsample)
+    if bloom is None or bloom.size != size:
+        if bloom is not None:
+            bloom.delete()
+        bloom = Bloom(*size)
+    bloom.begin()
+    render_queue.flush((LAYER_GLOW, LAYER_PARTICLES), keep=True)
+    bloom.end()
+    calls = render_queue.flush((LAYER_BACKGROUND, LAYER_CITY_BACK, LAYER_CITY, LAYER_WINDOWS,
+                                LAYER_TRAILS, LAYER_PARTICLES))
+    bloom.composite(settings.bloom_intensity)
+    return calls
+
+def draw_hud(lines):
+    """Menggambar panel teks HUD di pojok kiri atas layar."""
+    global hud_font, hud_cache
+    if not lines:
+        return
     
-    glPopMatrix()
+    # Teks hanya di-render ulang (dengan pygame.font) jika isinya berubah
+    if hud_cache[0] != lines:
+        if hud_font is None:
+            pygame.font.init()
+            hud_font = pygame.font.Font(None, 20)
+        surfaces = [hud_font.render(line, True, (255, 255, 255)) for line in lines]
+        panel_w = max(surface.get_width() for surface in surfaces) + 12
+        panel_h = sum(surface.get_height() for surface in surfaces) + 12
+        panel = pygame.Surface((panel_w, panel_h), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        y = 6
+        for surface in surfaces:
+            panel.blit(surface, (6, y))
+            y += surface.get_height()
+        hud_cache = (list(lines), (panel_w, panel_h, pygame.image.tostring(panel, "RGBA", True)))
     
-    # Reset blend mode ke normal setelah menggambar partikel
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA) 
\ No newline at end of file
+    panel_w, panel_h, pixels = hud_cache[1]
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    glWindowPos2i(8, settings.height - panel_h - 8)
+    glDrawPixels(panel_w, panel_h, GL_RGBA, GL_UNSIGNED_BYTE, pixels)
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""
+Parameter adegan bersama untuk kedua backend render (renderer.py dan
+soft_renderer.py): warna langit, bulan, bintang, dan konstanta bloom.
+Modul ini tidak mengimpor OpenGL, sehingga backend NumPy bisa memakainya
+dan kedua backend tidak bisa saling menyimpang.
+"""
+import math
+import random
+
+SKY_BOTTOM = (0.0, 0.0, 0.1)        # Warna langit di tepi bawah layar
+SKY_TOP = (0.0, 0.1, 0.2)           # Warna langit di tepi atas layar
+MOON_COLOR = (1.0, 1.0, 0.6)
+MOON_RADIUS = 120                   # Radius piringan bulan (piksel)
+MOON_HEIGHT = 0.65                  # Tinggi pusat bulan relatif terhadap tinggi layar
+MOON_GLOW = 0.5                     # Kecerahan piringan bulan sebagai sumber bloom
+
+STAR_SEED = 1729                    # Seed tetap langit berbintang, terlepas dari seed pertunjukan
+
+BLOOM_LEVEL_SCALE = 4               # Level kedua 4x lebih kecil dari level pertama
+BLOOM_TAPS = 4                      # Tap blur di setiap sisi (total 2 * taps + 1)
+BLOOM_SIGMA = 2.0                   # Simpangan baku blur dalam texel level
+BLOOM_LEVEL_WEIGHTS = (0.35, 0.25)  # Bobot pendar sempit (partikel) dan lebar (bulan)
+
+def moon_center(width, height):
+    """Pusat piringan bulan dalam piksel layar."""
+    return width // 2, int(height * MOON_HEIGHT)
+
+def gaussian_weights(taps, sigma):
+    """Bobot kernel Gauss ternormalisasi untuk offset -taps..taps."""
+    weights = [math.exp(-(i * i) / (2 * sigma * sigma)) for i in range(-taps, taps + 1)]
+    total = sum(weights)
+    return [w / total for w in weights]
+
+def generate_stars(width, height, count):
+    """
+    Posisi piksel `count` bintang di setengah atas layar. Stream acak lokal
+    ber-seed tetap membuat langit sama di setiap proses dan tidak menyentuh
+    state random global.
+    """
+    rng = random.Random(STAR_SEED)
+    return [(rng.randint(0, width), rng.randint(height // 2, height)) for _ in range(count)]
\ No newline at end of file
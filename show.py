@@ -0,0 +1,105 @@
+"""
+Pengelola pertunjukan kembang api.
+Setiap kembang api mendapat stream acak sendiri yang diturunkan dari seed
+pertunjukan dan nomor urut peluncurannya. Peluncuran dan perubahan tingkat
+kualitas dicatat per langkah simulasi sehingga satu sesi (seed + konfigurasi
+simulasi + jadwal peluncuran + perubahan kualitas) dapat diputar ulang dengan
+hasil yang identik.
+"""
+import json
+import numpy as np
+
+from config import settings, SIMULATION_KNOBS, update_settings
+from firework import Firework, update_fireworks
+from particle_system import particle_system
+
+# Kunci stream acak yang diturunkan dari seed pertunjukan
+LAUNCH_STREAM = 0           # Posisi peluncuran (tombol spasi / jadwal)
+FIREWORK_STREAM = 1         # Satu stream per kembang api
+TRAIL_STREAM = 2            # Variasi ukuran ekor di sistem partikel
+
+def derive_rng(seed, *key):
+    """Stream acak independen untuk `seed` dan kunci turunan `key`."""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=key))
+
+
+class Show:
+    """
+    Kelas untuk mengelola satu pertunjukan kembang api.
+    Menangani peluncuran, update langkah tetap, rekaman, dan replay.
+    """
+    def __init__(self, seed, system=None, replay=None, replay_quality=None):
+        self.seed = seed
+        # Konfigurasi simulasi saat pertunjukan dimulai (ikut disimpan rekaman)
+        self.config = {name: getattr(settings, name) for name in SIMULATION_KNOBS}
+        self.system = system if system is not None else particle_system
+        self.system.clear()
+        self.system.rng = derive_rng(seed, TRAIL_STREAM)
+        self.launch_rng = derive_rng(seed, LAUNCH_STREAM)
+        self.fireworks = []
+        self.step = 0                       # Jumlah langkah simulasi yang sudah dijalankan
+        self.launch_index = 0               # Nomor urut peluncuran berikutnya
+        self.launches = []                  # Rekaman: [langkah, posisi x]
+        self.quality = []                   # Rekaman: [langkah, kenop kualitas]
+        # Peluncuran yang akan diputar ulang, diurutkan hanya menurut langkah:
+        # peluncuran dalam satu langkah tetap memakai urutan rekaman, karena
+        # urutan itu menentukan launch_index dan stream acaknya
+        self.replay = sorted(replay or [], key=lambda launch: launch[0])
+        self._replay_next = 0
+        self.replay_quality = sorted(replay_quality or [], key=lambda change: change[0])
+        self._replay_quality_next = 0
+
+    def launch(self, x=None):
+        """Luncurkan kembang api di posisi x (acak dari stream peluncuran jika None)."""
+        if x is None:
+            x = float(self.launch_rng.uniform(-5, 5))
+        rng = derive_rng(self.seed, FIREWORK_STREAM, self.launch_index)
+        self.fireworks.append(Firework([x, -8.0], system=self.system, rng=rng))
+        self.launches.append([self.step, x])
+        self.launch_index += 1
+
+    def set_quality(self, knobs):
+        """Terapkan kenop kualitas (dict nama -> nilai) mulai langkah ini dan catat perubahannya."""
+        update_settings(knobs)
+        self.quality.append([self.step, dict(knobs)])
+
+    def update(self, dt=None):
+        """
+        Jalankan satu langkah simulasi. Perubahan kualitas dan peluncuran
+        replay yang terjadwal diproses dulu, dalam urutan yang sama dengan
+        saat direkam (governor berubah di akhir frame, sebelum peluncuran
+        dari tombol di frame berikutnya).
+        """
+        if dt is None:
+            dt = settings.simulation_step
+        while (self._replay_quality_next < len(self.replay_quality)
+               and self.replay_quality[self._replay_quality_next][0] <= self.step):
+            self.set_quality(self.replay_quality[self._replay_quality_next][1])
+            self._replay_quality_next += 1
+        while self._replay_next < len(self.replay) and self.replay[self._replay_next][0] <= self.step:
+            self.launch(self.replay[self._replay_next][1])
+            self._replay_next += 1
+        self.fireworks = update_fireworks(self.fireworks, dt, self.system)
+        self.step += 1
+
+    def save(self, path):
+        """Simpan seed, konfigurasi simulasi, jadwal peluncuran, dan perubahan kualitas ke file JSON."""
+        with open(path, "w") as f:
+            json.dump({"seed": self.seed, "step": 1.0 / self.config["simulation_rate"], "config": self.config,
+                       "launches": self.launches, "quality": self.quality}, f)
+
+    @classmethod
+    def load(cls, path, system=None):
+        """
+        Buat pertunjukan yang memutar ulang rekaman dari file JSON.
+        Konfigurasi simulasi rekaman diterapkan ke `settings` (menimpa preset
+        dan argumen), jadi panggil sebelum settings dipakai untuk menyiapkan
+        jendela, clock, atau backend.
+        """
+        with open(path) as f:
+            data = json.load(f)
+        update_settings(data.get("config", {}))
+        if abs(data["step"] - settings.simulation_step) > 1e-12:
+            raise ValueError("Rekaman dibuat dengan langkah simulasi %r, bukan %r"
+                             % (data["step"], settings.simulation_step))
+        return cls(data["seed"], system, replay=data["launches"], replay_quality=data.get("quality"))
\ No newline at end of file
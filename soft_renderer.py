@@ -0,0 +1,719 @@
+"""
+Backend render perangkat lunak dengan NumPy untuk host tanpa GPU/OpenGL.
+Menyediakan fungsi yang sama dengan renderer.py (init_gl, begin_frame,
+draw_background, draw_particles, submit_frame) tetapi menggambar ke
+framebuffer NumPy. Langit dirasterisasi sekali dan siluet setiap chunk kota
+sekali menjadi masker (atau langsung dari poligon gedung yang terlihat jika
+zoom kamera tidak 1:1); keduanya digabung hanya saat pandangan berubah,
+lalu hasilnya disalin setiap frame. Partikel dan ekor di-splat secara
+vektor menjadi daftar (piksel, level warna 8-bit terkemas) yang dijumlahkan
+dengan np.add.at ke kanvas yang dipakai ulang (blend aditif); bentuk besar
+disimpan sebagai rentang per baris sehingga biayanya mengikuti tingginya,
+bukan luasnya. Bloom dihitung seperti bloom.py dengan parameter yang sama
+dari scene.py: partikel dijumlahkan langsung ke kisi beresolusi rendah,
+diblur, lalu ditambahkan; halo bulan yang statis dibakar ke latar.
+Seperti GL, baris 0 framebuffer adalah bagian bawah layar dan pusat piksel
+berada di (x + 0.5, y + 0.5).
+"""
+import math
+import numpy as np
+from config import settings
+from camera import camera
+import building
+from building import city, WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_DARK
+from particle_system import SHAPE_SQUARE, CULL_MARGIN
+from particle_batch import PARTICLE_SIZE, CURVE_END_BRIGHTNESS
+from trail_batch import TRAIL_POINT_SIZE
+from trail_buffer import TRAIL_MAX_AGE, TRAIL_ALPHA
+from scene import (SKY_BOTTOM, SKY_TOP, MOON_COLOR, MOON_RADIUS, MOON_GLOW, BLOOM_LEVEL_SCALE, BLOOM_TAPS,
+                   BLOOM_SIGMA, BLOOM_LEVEL_WEIGHTS, moon_center, gaussian_weights, generate_stars)
+
+# Framebuffer RGBA uint8 (tinggi, lebar, 4), langit statis, dan latar (langit +
+# kota pada pandangan saat ini) yang disalin tiap frame
+framebuffer = None
+sky = None
+sky_key = None
+background = None
+background_key = None
+
+# Warna siluet gedung belakang dan gedung depan
+CITY_COLORS = (np.zeros(3, dtype=np.uint8), np.rint(np.array(WINDOW_DARK) * 255).astype(np.uint8))
+
+# Bintang (dibuat ulang saat jumlah bintang atau ukuran layar berubah)
+stars = []
+
+# Splat aditif frame ini: (indeks kanvas datar, level terkemas (n,)). spans
+# berisi awal (+level) dan akhir (-level) rentang baris yang dijumlahkan
+# kumulatif per baris saat submit; glow_splats berisi sumber bloom partikel
+# sebagai (indeks kanvas, RGB * alpha (3, n))
+splats = []
+spans = []
+glow_splats = []
+
+# Level warna per sampel dibulatkan ke 8 bit seperti blend GL ke framebuffer
+# 8-bit lalu dikemas dalam satu int64 (merah, hijau << PACK_BITS, biru <<
+# 2 * PACK_BITS), sehingga penjumlahan cukup satu np.add.at dan tetap eksak
+# sampai 2 ** PACK_BITS / 255 (8224) sampel terang per piksel
+PACK_BITS = 21
+PACK_MASK = (1 << PACK_BITS) - 1
+
+# Bentuk selebar ini (piksel) atau lebih digambar sebagai rentang per baris
+# (dua entri per baris, bukan satu per piksel); pada zoom 1 hampir semua
+# partikel dan titik ekor lebih kecil dari ini, saat zoom sebagian besar tidak
+SPAN_MIN_WIDTH = 32
+
+# Bingkai kanvas akumulasi (piksel) di setiap sisi layar, dibuang saat submit.
+# Titik ekor yang lebih kecil dari SPAN_MIN_WIDTH dan menyentuh layar seluruhnya
+# muat di bingkai, begitu juga sampel garis yang dipotong ke layar plus satu
+# piksel, jadi keduanya tidak perlu dijepit atau disaring per piksel
+CANVAS_BORDER = SPAN_MIN_WIDTH
+
+# Sampel garis dibangkitkan per potongan sepanjang ini sebagai kisi 2D
+LINE_CHUNK = 4
+
+# Kernel blur bloom, sama dengan bobot pass GL di bloom.py
+bloom_kernel = np.array(gaussian_weights(BLOOM_TAPS, BLOOM_SIGMA), dtype=np.float32)
+
+# Indeks kanvas -> texel kisi bloom (bin terakhir dibuang), dibangun per ukuran
+bloom_texels = None
+bloom_texels_key = None
+
+# Buffer kerja seukuran layar untuk _add_levels (kanvas level terkemas,
+# kanvas rentang, sementara, level RGBA yang ditambahkan, dan sisa ruang
+# 255 - level). Dipakai ulang setiap frame: array baru sebesar layar per frame
+# lebih mahal daripada operasinya sendiri karena halaman memorinya harus
+# dialokasikan ulang
+workspace = None
+
+def init_gl():
+    """Siapkan framebuffer (nama sama dengan renderer.py agar backend bisa ditukar)."""
+    global framebuffer
+    framebuffer = np.zeros((settings.height, settings.width, 4), dtype=np.uint8)
+
+def begin_frame():
+    """
+    Mulai frame baru dari salinan latar statis. Framebuffer selalu array baru,
+    sehingga frame sebelumnya aman dipegang thread penulis tanpa disalin.
+    """
+    global framebuffer
+    if background is not None and background.shape[:2] == (settings.height, settings.width):
+        framebuffer = background.copy()
+    else:
+        framebuffer = np.zeros((settings.height, settings.width, 4), dtype=np.uint8)
+    del splats[:]
+    del spans[:]
+    del glow_splats[:]
+
+def _fill_polygon(image, outline, color):
+    # Isi poligon dengan aturan genap-ganjil pada pusat piksel di kotak pembatasnya
+    height, width = image.shape[:2]
+    xs, ys = [p[0] for p in outline], [p[1] for p in outline]
+    x0, x1 = max(0, int(math.floor(min(xs)))), min(width, int(math.ceil(max(xs))))
+    y0, y1 = max(0, int(math.floor(min(ys)))), min(height, int(math.ceil(max(ys))))
+    if x0 >= x1 or y0 >= y1:
+        return
+    px = np.arange(x0, x1)[None, :] + 0.5
+    py = np.arange(y0, y1)[:, None] + 0.5
+    inside = np.zeros((y1 - y0, x1 - x0), dtype=bool)
+    for (ax, ay), (bx, by) in zip(outline, outline[1:] + outline[:1]):
+        if ay == by:
+            continue
+        crosses = (ay > py) != (by > py)
+        inside ^= crosses & (px < ax + (py - ay) * (bx - ax) / (by - ay))
+    image[y0:y1, x0:x1][inside] = color
+
+def _fill_rect(image, x, y, w, h, color):
+    image[max(0, y):max(0, y + h), max(0, x):max(0, x + w)] = color
+
+def _draw_moon(image):
+    height, width = image.shape[:2]
+    center_x, center_y = moon_center(width, height)
+    radius = MOON_RADIUS
+    moon = np.array(MOON_COLOR, dtype=np.float32)
+    reach = radius
+    x0, x1 = max(0, center_x - reach), min(width, center_x + reach)
+    y0, y1 = max(0, center_y - reach), min(height, center_y + reach)
+    dx = np.arange(x0, x1)[None, :] + 0.5 - center_x
+    dy = np.arange(y0, y1)[:, None] + 0.5 - center_y
+    distance = np.sqrt(dx * dx + dy * dy)
+    disc = distance <= radius
+    image[y0:y1, x0:x1][disc] = moon
+    return np.flatnonzero(disc.reshape(-1)), x0, y0, x1 - x0, moon * MOON_GLOW
+
+def _rasterize_sky():
+    width, height = settings.width, settings.height
+    image = np.empty((height, width, 3), dtype=np.float32)
+
+    # Langit gradien
+    t = (np.arange(height, dtype=np.float32) + 0.5) / height
+    bottom, top = np.array(SKY_BOTTOM), np.array(SKY_TOP)
+    image[:] = (bottom + (top - bottom) * t[:, None])[:, None, :]
+
+    # Bintang: titik 2x2 piksel
+    for x, y in stars:
+        _fill_rect(image, x - 1, y - 1, 2, 2, 1.0)
+
+    moon = _draw_moon(image)
+
+    pixels = np.empty((height, width, 4), dtype=np.uint8)
+    pixels[:, :, :3] = np.rint(image * 255)
+    pixels[:, :, 3] = 255
+
+    # Halo bulan statis: bloom piringan bulan ditambahkan sekali ke latar
+    if settings.glow:
+        disc, x0, y0, span, color = moon
+        index = _canvas_index(x0 + disc % span, y0 + disc // span)
+        _add_bloom(pixels, _bloom_source(index, np.repeat(color[:, None], len(disc), axis=1)))
+    return pixels
+
+def _resample(image, height, width):
+    # Ubah ukuran dengan interpolasi bilinear di pusat texel (seperti GL_LINEAR
+    # dengan tepi dijepit), dipakai antar level kisi bloom
+    for axis, size in ((0, height), (1, width)):
+        n = image.shape[axis]
+        position = np.clip((np.arange(size, dtype=np.float32) + 0.5) * (n / size) - 0.5, 0, n - 1)
+        low = np.floor(position).astype(np.intp)
+        high = np.minimum(low + 1, n - 1)
+        t = (position - low).astype(np.float32).reshape((-1, 1, 1) if axis == 0 else (1, -1, 1))
+        below = np.take(image, low, axis)
+        image = below + (np.take(image, high, axis) - below) * t
+    return image
+
+def _blur(image):
+    # Blur Gauss terpisah, horizontal lalu vertikal, dengan tepi dijepit
+    for axis in (1, 0):
+        pad = [(0, 0)] * 3
+        pad[axis] = (BLOOM_TAPS, BLOOM_TAPS)
+        padded = np.pad(image, pad, mode="edge")
+        n = image.shape[axis]
+        out = np.zeros_like(image)
+        for offset, weight in enumerate(bloom_kernel):
+            out += weight * (padded[:, offset:offset + n] if axis == 1 else padded[offset:offset + n])
+        image = out
+    return image
+
+def _bloom_source(index, weights):
+    # Jumlahkan warna piksel kanvas `index` ke kisi bloom (rata-rata area per
+    # texel); piksel bingkai jatuh ke bin terakhir yang dibuang
+    global bloom_texels, bloom_texels_key
+    width, height = settings.width, settings.height
+    bloom_width = max(1, width // settings.bloom_downsample)
+    bloom_height = max(1, height // settings.bloom_downsample)
+    size = bloom_height * bloom_width
+    if bloom_texels_key != (width, height, bloom_width, bloom_height):
+        rows = np.arange(-CANVAS_BORDER, height + CANVAS_BORDER)
+        cols = np.arange(-CANVAS_BORDER, width + CANVAS_BORDER)
+        texels = (rows * bloom_height // height)[:, None] * bloom_width + (cols * bloom_width // width)[None, :]
+        inside = ((rows >= 0) & (rows < height))[:, None] & ((cols >= 0) & (cols < width))[None, :]
+        bloom_texels = np.where(inside, texels, size).reshape(-1)
+        bloom_texels_key = (width, height, bloom_width, bloom_height)
+    texel = bloom_texels[index]
+    area = (width / bloom_width) * (height / bloom_height)
+    source = np.empty((bloom_height, bloom_width, 3), dtype=np.float32)
+    for channel in range(3):
+        source[:, :, channel] = np.bincount(texel, weights[channel], minlength=size + 1)[:size] \
+            .reshape(bloom_height, bloom_width) / area
+    return source
+
+def _add_bloom(image, first):
+    """
+    Kisi bloom -> pendar yang ditambahkan secara jenuh ke `image` RGBA uint8
+    (alfa tidak berubah): blur, turunkan ke level kedua dan blur untuk pendar
+    lebar, lalu gabungkan kembali. Pendar dikuantisasi ke uint8 di kisi
+    bloom dan dinaikkan ke layar dengan pengulangan texel (np.repeat), hanya
+    di kotak pembatas texel yang pendarnya masih terlihat, karena langkah
+    selebar layar itu yang paling mahal.
+    """
+    first = _blur(first)
+    height, width = first.shape[:2]
+    second = _blur(_resample(first, max(1, height // BLOOM_LEVEL_SCALE), max(1, width // BLOOM_LEVEL_SCALE)))
+    first += _resample(second, height, width) * (BLOOM_LEVEL_WEIGHTS[1] / BLOOM_LEVEL_WEIGHTS[0])
+    first *= settings.bloom_intensity * BLOOM_LEVEL_WEIGHTS[0] * 255
+    # Kanal alfa nol agar operasi jenuh berjalan pada baris RGBA yang bersambung
+    glow = np.zeros((height, width, 4), dtype=np.uint8)
+    glow[:, :, :3] = np.rint(np.minimum(first, 255))
+
+    visible = glow.view(np.uint32)[:, :, 0] != 0
+    rows, cols = np.flatnonzero(visible.any(axis=1)), np.flatnonzero(visible.any(axis=0))
+    if not len(rows):
+        return
+    # Texel i menutup piksel layar [ceil(i * layar / kisi), ceil((i + 1) * layar / kisi)),
+    # pemetaan yang sama dengan _bloom_source
+    screen_height, screen_width = image.shape[:2]
+    ys = -(-np.arange(height + 1) * screen_height // height)
+    xs = -(-np.arange(width + 1) * screen_width // width)
+    r0, r1, c0, c1 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+    glow = np.repeat(glow[r0:r1, c0:c1], np.diff(xs[c0:c1 + 1]), axis=1)
+    glow = np.repeat(glow, np.diff(ys[r0:r1 + 1]), axis=0)
+    region = image[ys[r0]:ys[r1], xs[c0]:xs[c1]]
+    np.minimum(region, 255 - glow, out=region)
+    region += glow
+
+def _bake_chunk(chunk):
+    # Masker siluet per layer chunk dalam piksel kota: (x kiri, masker (tinggi, lebar))
+    masks = []
+    for layer in (chunk.back, chunk.main):
+        outlines = [outline for item in layer for outline in item.outlines()]
+        points = [point for outline in outlines for point in outline]
+        x0 = int(math.floor(min(x for x, y in points)))
+        x1 = int(math.ceil(max(x for x, y in points)))
+        y1 = int(math.ceil(max(y for x, y in points)))
+        image = np.zeros((y1, x1 - x0, 1), dtype=np.float32)
+        for outline in outlines:
+            _fill_polygon(image, [(x - x0, y) for x, y in outline], 1.0)
+        masks.append((x0, image[:, :, 0] > 0))
+    chunk.baked["soft"] = masks
+    return masks
+
+def _compose_city(image, chunks, view):
+    # Gambar siluet semua chunk (semua gedung belakang dulu, lalu gedung depan).
+    # Pada skala 1:1 masker chunk cukup disalin; selain itu poligon gedung yang
+    # kotak pembatasnya beririsan dengan layar dirasterisasi langsung
+    height, width = image.shape[:2]
+    tx, ty, scale = view
+    for layer, color in enumerate(CITY_COLORS):
+        for chunk in chunks:
+            if scale != 1.0:
+                for item in (chunk.back, chunk.main)[layer]:
+                    left, right = tx + item.x * scale, tx + (item.x + item.width) * scale
+                    if right < 0 or left > width or ty > height:
+                        continue
+                    for outline in item.outlines():
+                        _fill_polygon(image[:, :, :3], [(tx + x * scale, ty + y * scale) for x, y in outline], color)
+                continue
+            x0, mask = (chunk.baked.get("soft") or _bake_chunk(chunk))[layer]
+            left, bottom = x0 + int(tx), int(ty)
+            a, b = max(0, left), min(width, left + mask.shape[1])
+            c, d = max(0, bottom), min(height, bottom + mask.shape[0])
+            if a < b and c < d:
+                image[c:d, a:b, :3][mask[c - bottom:d - bottom, a - left:b - left]] = color
+
+def _window_pixels(chunk, view):
+    # Indeks piksel framebuffer datar yang tertutup jendela chunk beserta
+    # jendela pemiliknya; piksel tertutup jika pusatnya di dalam persegi
+    # jendela (aturan rasterisasi GL). Disimpan di chunk.baked sampai pandangan
+    # atau ukuran layar berubah, karena yang beranimasi hanya warnanya
+    height, width = framebuffer.shape[:2]
+    key = (view, width, height)
+    baked = chunk.baked.get("soft_windows")
+    if baked is not None and baked[0] == key:
+        return baked[1]
+    tx, ty, scale = view
+    span_x = int(math.ceil(WINDOW_WIDTH * scale)) + 1
+    span_y = int(math.ceil(WINDOW_HEIGHT * scale)) + 1
+    positions = chunk.windows.positions
+    x0 = np.ceil(tx + positions[:, 0] * scale - 0.5).astype(np.intp)
+    x1 = np.ceil(tx + (positions[:, 0] + WINDOW_WIDTH) * scale - 0.5).astype(np.intp)
+    y0 = np.ceil(ty + positions[:, 1] * scale - 0.5).astype(np.intp)
+    y1 = np.ceil(ty + (positions[:, 1] + WINDOW_HEIGHT) * scale - 0.5).astype(np.intp)
+    rows = np.flatnonzero((x1 > 0) & (x0 < width) & (y1 > 0) & (y0 < height))
+    ix = x0[rows, None, None] + np.arange(span_x)
+    iy = y0[rows, None, None] + np.arange(span_y)[:, None]
+    inside = ((ix < x1[rows, None, None]) & (iy < y1[rows, None, None]) &
+              (ix >= 0) & (ix < width) & (iy >= 0) & (iy < height))
+    pixels = ((iy * width + ix)[inside], rows[np.nonzero(inside)[0]])
+    chunk.baked["soft_windows"] = (key, pixels)
+    return pixels
+
+def _draw_windows(chunks, view):
+    # Tulis warna jendela semua chunk yang terlihat ke piksel layarnya
+    flat = framebuffer.reshape(-1, 4)
+    for chunk in chunks:
+        index, owner = _window_pixels(chunk, view)
+        if len(index):
+            flat[index, :3] = np.rint(chunk.windows.colors() * 255).astype(np.uint8)[owner]
+
+def draw_background():
+    """
+    Rasterisasi ulang langit, bintang, dan bulan hanya saat kuncinya berubah,
+    gabungkan siluet chunk kota yang terlihat hanya saat pandangan kamera
+    berubah, lalu tulis jendela yang beranimasi.
+    """
+    global sky, sky_key, background, background_key, framebuffer, stars
+    key = (settings.width, settings.height, settings.star_count,
+           settings.glow, settings.bloom_intensity, settings.bloom_downsample)
+    if sky_key != key:
+        if sky_key is None or sky_key[:3] != key[:3]:
+            stars = generate_stars(settings.width, settings.height, settings.star_count)
+        sky = _rasterize_sky()
+        sky_key = key
+    chunks = city.visible()
+    view = camera.city_transform(city.view_x)
+    city_key = (key, view, building.city_version, tuple(chunk.index for chunk in chunks))
+    if background_key != city_key:
+        background = sky.copy()
+        _compose_city(background, chunks, view)
+        background_key = city_key
+        framebuffer = background.copy()
+    _draw_windows(chunks, view)
+
+def _canvas_index(ix, iy):
+    # Indeks datar piksel layar (ix, iy) pada kanvas akumulasi berbingkai
+    width = framebuffer.shape[1]
+    return (iy + CANVAS_BORDER) * (width + 2 * CANVAS_BORDER) + (ix + CANVAS_BORDER)
+
+def _premultiply(colors):
+    # Warna (n, 4) -> bobot aditif (3, n) float32, satu baris per kanal
+    colors = np.clip(colors, 0.0, 1.0)
+    return (colors[:, :3] * colors[:, 3:4]).T.astype(np.float32)
+
+def _levels(weights):
+    # Bobot (3, n) -> level 8-bit terkemas (n,) int64
+    levels = np.rint(weights * np.float32(255)).astype(np.int64)
+    return levels[0] + (levels[1] << PACK_BITS) + (levels[2] << 2 * PACK_BITS)
+
+def _average_levels(a, b):
+    # Rata-rata (dibulatkan ke atas) dua level terkemas langsung per kanal:
+    # jumlah tiap kanal <= 510 sehingga tidak membawa ke kanal lain, dan bit
+    # yang tergeser dari kanal atasnya dibuang oleh masker 8-bit per kanal
+    ones = 1 + (1 << PACK_BITS) + (1 << 2 * PACK_BITS)
+    return ((a + b + ones) >> 1) & (255 * ones)
+
+def _covered(ix, iy, mask):
+    # Indeks kanvas piksel layar yang tertutup beserta baris pemiliknya; sumbu
+    # pertama ix/iy/mask adalah pemilik. Piksel di luar layar dibuang di sini
+    height, width = framebuffer.shape[:2]
+    mask = mask & (ix >= 0) & (ix < width) & (iy >= 0) & (iy < height)
+    owner = np.repeat(np.arange(len(mask)), np.count_nonzero(mask.reshape(len(mask), -1), axis=1))
+    return _canvas_index(ix, iy)[mask], owner
+
+def _add_spans(iy, x0, x1, levels):
+    # Rentang baris piksel [x0, x1] (inklusif, boleh kosong) berlevel terkemas
+    # `levels`, satu per baris. Disimpan sebagai +level di awal dan -level
+    # sesudah akhir, dijumlahkan kumulatif saat submit
+    height, width = framebuffer.shape[:2]
+    start = np.clip(x0, 0, width)
+    end = np.maximum(start, np.clip(x1 + 1, 0, width))
+    keep = (iy >= 0) & (iy < height) & (end > start)
+    if not keep.any():
+        return
+    row = _canvas_index(0, iy[keep])
+    levels = levels[keep]
+    spans.append((np.concatenate([row + start[keep], row + end[keep]]), np.concatenate([levels, -levels])))
+
+def _ragged(counts):
+    # Baris datar untuk `counts` baris per pemilik: (pemilik, urutan dalam pemilik)
+    owner = np.repeat(np.arange(len(counts)), counts)
+    return owner, np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+def _shape_grid(cx, cy, radius, cos, sin, square, size, stride=1):
+    # Kisi piksel (n, k, k) di sekitar setiap pusat dan masker piksel yang
+    # pusatnya di dalam lingkaran atau persegi berotasi. Dengan stride > 1
+    # kisi disampel simetris di sekitar pusat (offset kelipatan stride)
+    offsets = np.arange(-size + size % stride, size + 1, stride)
+    ix = np.floor(cx).astype(np.intp)[:, None, None] + offsets[None, None, :]
+    iy = np.floor(cy).astype(np.intp)[:, None, None] + offsets[None, :, None]
+    dx = ix + 0.5 - cx[:, None, None]
+    dy = iy + 0.5 - cy[:, None, None]
+    r = radius[:, None, None]
+    c, s = cos[:, None, None], sin[:, None, None]
+    box = (np.abs(dx * c + dy * s) <= r) & (np.abs(dy * c - dx * s) <= r)
+    return ix, iy, np.where(square[:, None, None], box, dx * dx + dy * dy <= r * r)
+
+def _shape_rows(cx, cy, radius, cos, sin, square, reach):
+    # Rentang baris piksel [x0, x1] (inklusif, boleh kosong) yang sama dengan
+    # _shape_grid tanpa menguji setiap piksel: lingkaran dari tali busurnya,
+    # persegi berotasi dari irisan dua lajur |dx c + dy s| <= r dan
+    # |dx s - dy c| <= r pada setiap baris. Baris semua bentuk (2 * reach + 1
+    # per bentuk) dihitung sekaligus dalam array datar: (pemilik, iy, x0, x1)
+    owner, offset = _ragged(2 * reach + 1)
+    iy = np.floor(cy).astype(np.intp)[owner] + offset - reach[owner]
+    dy = iy + 0.5 - cy[owner]
+    r = radius[owner]
+    box = square[owner]
+    low, high = np.empty(len(owner)), np.empty(len(owner))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        circle = ~box
+        half = np.sqrt(r[circle] ** 2 - dy[circle] ** 2)
+        low[circle], high[circle] = -half, half
+        d, r = dy[box], r[box]
+        c, s = cos[owner[box]], sin[owner[box]]
+        box_low, box_high = np.full(len(d), -np.inf), np.full(len(d), np.inf)
+        for scale, shift in ((c, d * s), (s, -d * c)):
+            a, b = (-r - shift) / scale, (r - shift) / scale
+            # Lajur sejajar sumbu x (scale 0) menutup seluruh baris atau tidak sama sekali
+            flat, hit = scale == 0, np.abs(shift) <= r
+            box_low = np.maximum(box_low, np.where(flat, np.where(hit, -np.inf, np.inf), np.minimum(a, b)))
+            box_high = np.minimum(box_high, np.where(flat, np.where(hit, np.inf, -np.inf), np.maximum(a, b)))
+        low[box], high[box] = box_low, box_high
+        # Pusat piksel x + 0.5 di dalam [cx + low, cx + high]; NaN = baris kosong
+        width = framebuffer.shape[1]
+        x0 = np.ceil(cx[owner] + low - 0.5)
+        x1 = np.floor(cx[owner] + high - 0.5)
+        empty = ~(x0 <= x1)
+        x0 = np.where(empty, 0, np.clip(x0, -1, width)).astype(np.intp)
+        x1 = np.where(empty, -1, np.clip(x1, -1, width)).astype(np.intp)
+    return owner, iy, x0, x1
+
+def _row_pixels(iy, x0, x1):
+    # Piksel layar rentang baris [x0, x1] (inklusif) sebagai indeks kanvas
+    # beserta baris pemiliknya; bagian di luar layar dibuang
+    height, width = framebuffer.shape[:2]
+    start = np.clip(x0, 0, width)
+    end = np.maximum(start, np.clip(x1 + 1, 0, width))
+    rows = np.flatnonzero((iy >= 0) & (iy < height) & (end > start))
+    row, offset = _ragged(end[rows] - start[rows])
+    return _canvas_index(start[rows], iy[rows])[row] + offset, rows[row]
+
+def _splat_shapes(cx, cy, radius, cos, sin, square, colors, glow=False):
+    # Rentang baris semua bentuk dihitung sekaligus; bentuk selebar
+    # SPAN_MIN_WIDTH atau lebih (misal saat zoom) ditambahkan sebagai rentang,
+    # sisanya diurai menjadi pikselnya. Sumber bloom partikel yang
+    # selebar minimal dua texel cukup disampel sekali per texel (selang
+    # bloom_downsample piksel, berbobot luas texel), sehingga biaya bloom
+    # tidak tumbuh dengan kuadrat zoom; jangkauannya dibulatkan ke kelipatan
+    # texel karena kisi yang disampel tetap sama
+    # Sudut persegi berotasi mencapai radius * sqrt(2) dari pusat
+    step = settings.bloom_downsample
+    reach = np.ceil(radius * np.where(square, math.sqrt(2), 1.0)).astype(np.intp) + 1
+    shapes = (cx, cy, radius, cos, sin, square)
+    wide = 2 * reach + 1 >= SPAN_MIN_WIDTH
+    weights = _premultiply(colors)
+    levels = _levels(weights)
+    owner, iy, x0, x1 = _shape_rows(*shapes, reach)
+    span = wide[owner]
+    if span.any():
+        _add_spans(iy[span], x0[span], x1[span], levels[owner[span]])
+    rows = np.flatnonzero(~span)
+    index, row = _row_pixels(iy[rows], x0[rows], x1[rows])
+    owner = owner[rows][row]
+    splats.append((index, levels[owner]))
+    if not glow:
+        return
+    # Bloom bentuk kecil dari piksel yang sama; sisanya disampel per texel
+    small = np.flatnonzero(reach[owner] < 2 * step)
+    glow_splats.append((index[small], weights[:, owner[small]]))
+    group = np.where(reach < 2 * step, reach, -(-reach // step) * step)
+    pending = wide | (reach >= 2 * step)
+    for size in np.unique(group[pending]):
+        rows = np.flatnonzero((group == size) & pending)
+        stride = 1 if size < 2 * step else step
+        index, owner = _covered(*_shape_grid(*(value[rows] for value in shapes), size, stride))
+        glow_splats.append((index, (_premultiply(colors[rows]) * np.float32(stride * stride))[:, owner]))
+
+def _splat_lines(start, end, levels):
+    # Garis lebar 2 piksel dari titik layar `start` ke `end` (m, 2) dengan level
+    # terkemas per segmen: satu sampel per piksel sepanjang sumbu mayor, ditambah
+    # piksel tetangganya di arah sumbu minor. Sampel dibangkitkan per potongan
+    # LINE_CHUNK sampel sebagai kisi (LINE_CHUNK, potongan), jadi posisinya
+    # dihitung dengan broadcast per potongan, bukan gather per sampel
+    height, width = framebuffer.shape[:2]
+    stride = width + 2 * CANVAS_BORDER
+    # Indeks kanvas dihitung dalam float, eksak di float32 selama kanvas < 2 ** 24 piksel
+    real = np.float32 if (height + 2 * CANVAS_BORDER) * stride < 1 << 24 else np.float64
+    dx = (end[:, 0] - start[:, 0]).astype(real)
+    dy = (end[:, 1] - start[:, 1]).astype(real)
+    x_major = np.abs(dx) >= np.abs(dy)
+    steps = np.maximum(1, np.rint(np.maximum(np.abs(dx), np.abs(dy))))
+    # Piksel pertama digeser setengah piksel ke arah minor, tetangganya +1;
+    # koordinat termasuk bingkai kanvas
+    border = real(CANVAS_BORDER)
+    ax = start[:, 0] + np.where(x_major, border, border - real(0.5))
+    ay = start[:, 1] + np.where(x_major, border - real(0.5), border)
+    neighbour = np.where(x_major, stride, 1)
+
+    # Potong setiap segmen ke layar plus satu piksel (Liang-Barsky) dan ambil
+    # hanya sampel yang jatuh di bagian terlihat [t0, t1]; posisi sampel tetap
+    # sama dengan segmen utuh, jadi zoom tidak membayar sampel di luar layar
+    t0 = np.zeros(len(dx), dtype=real)
+    t1 = np.ones(len(dx), dtype=real)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for origin, delta, size in ((ax, dx, width), (ay, dy, height)):
+            low, high = (border - 1 - origin) / delta, (border + size + 1 - origin) / delta
+            inside = (origin >= border - 1) & (origin < border + size + 1)
+            t0 = np.maximum(t0, np.where(delta == 0, np.where(inside, 0, 1), np.minimum(low, high)))
+            t1 = np.minimum(t1, np.where(delta == 0, np.where(inside, 1, 0), np.maximum(low, high)))
+    first = np.maximum(0, np.ceil(t0 * steps - real(0.5))).astype(np.intp)
+    count = np.maximum(0, np.minimum(steps, np.floor(t1 * steps - real(0.5)) + 1).astype(np.intp) - first)
+    # Segmen tanpa panjang (ekor yang diam) tidak menghasilkan fragmen, seperti GL
+    count[(dx == 0) & (dy == 0)] = 0
+    if not count.any():
+        return
+
+    # Potongan LINE_CHUNK sampel yang menutup [first, first + count) setiap
+    # segmen. Kisinya (LINE_CHUNK, potongan) agar loop dalam NumPy berjalan
+    # sepanjang potongan; nilai per segmen di-broadcast per baris
+    stop = first + count
+    chunks = np.where(count > 0, -(-stop // LINE_CHUNK) - first // LINE_CHUNK, 0)
+    segment, chunk = _ragged(chunks)
+    # Pusat sampel k + 0.5 dalam float, sehingga t = (k + 0.5) / steps
+    center = ((first // LINE_CHUNK)[segment] + chunk).astype(real) * LINE_CHUNK \
+        + (np.arange(LINE_CHUNK, dtype=real) + real(0.5))[:, None]
+    valid = (center > first[segment].astype(real)) & (center < stop[segment].astype(real))
+    x = np.floor(ax[segment] + center * (dx / steps)[segment])
+    y = np.floor(ay[segment] + center * (dy / steps)[segment])
+    # Sampel terpilih diambil sekali dengan indeks datar; segmen pemiliknya
+    # dari baris kisi yang sama
+    sample = np.flatnonzero(valid)
+    index = (y * real(stride) + x).take(sample).astype(np.intp)
+    segment = np.tile(segment, LINE_CHUNK).take(sample)
+    levels = levels[segment]
+    splats.append((index, levels))
+    splats.append((index + neighbour[segment], levels))
+
+def _splat_points(center, levels, pixels):
+    # Titik persegi `pixels` piksel (< SPAN_MIN_WIDTH) yang berpusat di titik
+    # layar `center` (aturan GL_POINTS). Titik yang menyentuh layar seluruhnya
+    # muat di bingkai kanvas, jadi cukup ditambah offset piksel kotaknya
+    height, width = framebuffer.shape[:2]
+    x0 = np.ceil(center[:, 0] - pixels / 2 - 0.5).astype(np.intp)
+    y0 = np.ceil(center[:, 1] - pixels / 2 - 0.5).astype(np.intp)
+    rows = np.flatnonzero((x0 < width) & (x0 + pixels > 0) & (y0 < height) & (y0 + pixels > 0))
+    offsets = _canvas_index(np.arange(pixels), np.arange(pixels)[:, None]) - _canvas_index(0, 0)
+    index = _canvas_index(x0[rows], y0[rows])[:, None] + offsets.reshape(-1)
+    splats.append((index.reshape(-1), np.repeat(levels[rows], pixels * pixels)))
+
+def _span_points(center, levels, pixels):
+    # Titik persegi besar sebagai rentang baris; `pixels` adalah ukuran per titik
+    x0 = np.ceil(center[:, 0] - pixels / 2 - 0.5).astype(np.intp)
+    y0 = np.ceil(center[:, 1] - pixels / 2 - 0.5).astype(np.intp)
+    owner, offset = _ragged(pixels)
+    x0 = x0[owner]
+    _add_spans(y0[owner] + offset, x0, x0 + (pixels[owner] - 1), levels[owner])
+
+def _trail_vertices(system):
+    # Vertex ekor hidup semua partikel langsung dari ring buffer, tertua ke
+    # terbaru per partikel: posisi layar (n, 2), bobot RGB * alpha (3, n),
+    # ukuran titik dalam piksel (n,), dan masker vertex yang bersambung ke
+    # vertex berikutnya di ekor yang sama. Warna dan ukuran sama dengan
+    # TrailBatch.build, tanpa membangun vertex untuk slot yang kedaluwarsa
+    trails = system.trails
+    depth = trails.depth
+    rows = np.flatnonzero(system.time - system.last_seen[:system.count] <= TRAIL_MAX_AGE)
+    counts = np.count_nonzero(system.time - trails.birth[rows] <= TRAIL_MAX_AGE, axis=1)
+    rows, counts = rows[counts > 0], counts[counts > 0]
+    if not len(rows):
+        return None
+    # Slot kedaluwarsa selalu berada di depan urutan ring buffer, jadi cukup
+    # counts.max() slot terbaru setiap baris yang diperiksa
+    order = np.arange(depth - counts.max(), depth)
+    slot = (rows * depth)[:, None] + (trails.head[rows, None] + order) % depth
+    slot = slot[order >= depth - counts[:, None]]
+    owner = np.repeat(rows, counts)
+
+    age = np.minimum(system.time - trails.birth.reshape(-1)[slot], TRAIL_MAX_AGE) / TRAIL_MAX_AGE
+    colors = system.color[owner]
+    colors[:, 3] *= (1.0 - age * np.sqrt(age)) * TRAIL_ALPHA
+    pixels = trails.size.reshape(-1)[slot] * (TRAIL_POINT_SIZE * camera.scale)
+    joined = np.ones(len(slot), dtype=bool)
+    joined[np.cumsum(counts) - 1] = False
+    return (camera.to_screen(trails.position.reshape(-1, 2)[slot]), _premultiply(colors),
+            np.maximum(1, np.rint(pixels)).astype(np.intp), joined)
+
+def draw_trails(system):
+    """
+    Splat garis dan titik ekor. Vertex dan levelnya dibangun sekali per frame;
+    setiap segmen garis memakai rata-rata level kedua ujungnya (bedanya dari
+    interpolasi per piksel hanya beberapa persen alpha karena ekor memudar
+    perlahan), sehingga levelnya cukup diulang per sampel.
+    """
+    vertices = _trail_vertices(system)
+    if vertices is None:
+        return
+    screen, weights, pixels, joined = vertices
+    levels = _levels(weights)
+    start = np.flatnonzero(joined)
+    if len(start):
+        _splat_lines(screen[start], screen[start + 1], _average_levels(levels[start], levels[start + 1]))
+    # Titik dikelompokkan per ukuran piksel bulat; titik selebar SPAN_MIN_WIDTH
+    # atau lebih (saat zoom) digambar sekaligus sebagai rentang baris
+    large = pixels >= SPAN_MIN_WIDTH
+    for size in np.flatnonzero(np.bincount(pixels[~large])):
+        rows = np.flatnonzero(pixels == size)
+        _splat_points(screen[rows], levels[rows], int(size))
+    if large.any():
+        rows = np.flatnonzero(large)
+        _span_points(screen[rows], levels[rows], pixels[rows])
+
+def draw_particles(system):
+    """Splat ekor dan partikel yang berada di pandangan kamera; partikel juga menjadi sumber bloom."""
+    draw_trails(system)
+    rows = np.flatnonzero(system.on_screen())
+    if not len(rows):
+        return
+    center = camera.to_screen(system.render_position[rows])
+    size = system.size[rows]
+    curve_end = system.is_curve_end[rows]
+    square = system.shape[rows] == SHAPE_SQUARE
+    angle = np.radians(system.rotation[rows])
+    cos, sin = np.cos(angle), np.sin(angle)
+    radius = size * (PARTICLE_SIZE / 2 * camera.scale)
+
+    color = system.color[rows].copy()
+    color[curve_end, :3] = np.minimum(1.0, color[curve_end, :3] * CURVE_END_BRIGHTNESS)
+    _splat_shapes(center[:, 0], center[:, 1], radius, cos, sin, square, color, settings.glow)
+
+def _add_levels():
+    # Jumlahkan splat dan rentang frame ini dengan np.add.at ke kanvas int64
+    # yang dipakai ulang (hanya baris kanvas tersentuh yang dibersihkan), buka
+    # kemasannya, lalu tambahkan secara jenuh ke baris RGBA framebuffer
+    global workspace
+    height, width = framebuffer.shape[:2]
+    border = CANVAS_BORDER
+    stride = width + 2 * border
+    entries = [index for index, _ in splats + spans if len(index)]
+    if not entries:
+        return
+    first = min(int(index.min()) for index in entries) // stride
+    last = max(int(index.max()) for index in entries) // stride + 1
+    if workspace is None or workspace[2].shape != (height, width):
+        # Kanal alpha buffer level tetap nol, jadi cukup diisi sekali
+        canvas = (height + 2 * border) * stride
+        workspace = (np.empty(canvas, dtype=np.int64), np.empty(canvas, dtype=np.int64),
+                     np.empty((height, width), dtype=np.int64), np.zeros((height, width, 4), dtype=np.uint8),
+                     np.empty((height, width, 4), dtype=np.uint8))
+    canvas, ranges, scratch, added, room = workspace
+    canvas[first * stride:last * stride] = 0
+    for index, levels in splats:
+        np.add.at(canvas, index, levels)
+    if spans:
+        # Penjumlahan kumulatif hanya pada baris yang disentuh rentang
+        touched = slice(min(int(index.min()) for index, _ in spans) // stride * stride,
+                        (max(int(index.max()) for index, _ in spans) // stride + 1) * stride)
+        ranges[touched] = 0
+        for index, levels in spans:
+            np.add.at(ranges, index, levels)
+        rows = ranges[touched].reshape(-1, stride)
+        np.cumsum(rows, axis=1, out=rows)
+        canvas[touched] += ranges[touched]
+
+    # Hanya baris layar (bukan bingkai) yang dibuka kemasannya
+    top, bottom = max(first, border), min(last, height + border)
+    if top >= bottom:
+        return
+    total = canvas.reshape(-1, stride)[top:bottom, border:width + border]
+    scratch, added, room = (buffer[:bottom - top] for buffer in (scratch, added, room))
+    np.bitwise_and(total, PACK_MASK, out=scratch)
+    np.minimum(scratch, 255, out=added[:, :, 0], casting="unsafe")
+    np.right_shift(total, PACK_BITS, out=scratch)
+    np.bitwise_and(scratch, PACK_MASK, out=scratch)
+    np.minimum(scratch, 255, out=added[:, :, 1], casting="unsafe")
+    np.right_shift(total, 2 * PACK_BITS, out=scratch)
+    np.minimum(scratch, 255, out=added[:, :, 2], casting="unsafe")
+    region = framebuffer[top - border:bottom - border]
+    np.subtract(255, added, out=room)
+    np.minimum(region, room, out=region)
+    region += added
+
+def submit_frame():
+    """
+    Jumlahkan semua splat frame ini ke framebuffer; kembalikan jumlah splat.
+    Biayanya sebanding dengan jumlah sampel dan baris yang tersentuh; rentang
+    baris dijumlahkan kumulatif per baris sebelum ditambahkan.
+    """
+    count = len(splats) + len(spans)
+    _add_levels()
+
+    # Bloom partikel: splat dipetakan langsung ke kisi bloom tanpa kanvas penuh
+    if glow_splats:
+        index = np.concatenate([s[0] for s in glow_splats])
+        weights = np.concatenate([s[1] for s in glow_splats], axis=1)
+        _add_bloom(framebuffer, _bloom_source(index, weights))
+    del splats[:]
+    del spans[:]
+    del glow_splats[:]
+    return count
+
+def read_pixels():
+    """Framebuffer RGBA uint8 frame ini (baris bawah dulu, seperti glReadPixels)."""
+    return framebuffer
\ No newline at end of file
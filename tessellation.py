@@ -0,0 +1,65 @@
+"""
+Cache tesselasi lingkaran bersama untuk renderer dan ParticleBatch.
+Tabel vertex lingkaran satuan dibuat sekali per jumlah segmen, sehingga
+tidak ada sin/cos di jalur per frame. Jumlah segmen dipilih dari radius di
+layar: percikan kecil cukup berupa persegi, hanya bentuk besar yang
+mendapat kipas penuh.
+"""
+import math
+import numpy as np
+
+LOD_LEVELS = (6, 8, 12, 16, 24, 32, 48, 64, 100)  # Jumlah segmen yang tersedia
+LOD_EDGE_PIXELS = 2.0       # Panjang sisi segmen maksimum di layar (piksel)
+LOD_QUAD_RADIUS = 1.25      # Di bawah radius ini (piksel) lingkaran digambar sebagai persegi
+QUAD = 4                    # Kode LOD persegi (4 sudut, tanpa vertex pusat)
+
+# Persegi berluas sama dengan lingkaran satuan (sisi setengah sqrt(pi) / 2)
+QUAD_HALF = math.sqrt(math.pi) / 2
+
+_rings = {}
+_fans = {}
+
+def unit_circle(segments):
+    """Vertex tepi lingkaran satuan (segments + 1, 2); vertex terakhir sama dengan yang pertama."""
+    ring = _rings.get(segments)
+    if ring is None:
+        angles = 2 * math.pi * np.arange(segments + 1) / segments
+        ring = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+        ring[-1] = ring[0]
+        ring.flags.writeable = False
+        _rings[segments] = ring
+    return ring
+
+def circle_fan(segments):
+    """
+    Daftar segitiga (pusat, v_i, v_i+1) lingkaran satuan sebagai array
+    (3 * segments, 2); segments == QUAD memberi dua segitiga persegi.
+    """
+    fan = _fans.get(segments)
+    if fan is None:
+        if segments == QUAD:
+            corners = np.array([(-1, -1), (1, -1), (1, 1), (-1, 1)], dtype=np.float64) * QUAD_HALF
+            fan = corners[[0, 1, 2, 0, 2, 3]]
+        else:
+            ring = unit_circle(segments)
+            fan = np.empty((segments, 3, 2))
+            fan[:, 0] = 0.0
+            fan[:, 1] = ring[:-1]
+            fan[:, 2] = ring[1:]
+            fan = fan.reshape(-1, 2)
+        fan.flags.writeable = False
+        _fans[segments] = fan
+    return fan
+
+def segments_for_radius(radius, max_segments):
+    """
+    Jumlah segmen untuk radius di layar (skalar atau array): cukup agar sisi
+    segmen tidak lebih dari LOD_EDGE_PIXELS, dibulatkan ke atas ke LOD_LEVELS
+    dan dibatasi max_segments; radius kecil memberi QUAD.
+    """
+    radius = np.asarray(radius, dtype=np.float64)
+    needed = np.ceil(2 * math.pi * radius / LOD_EDGE_PIXELS)
+    levels = np.array(LOD_LEVELS)
+    segments = levels[np.minimum(np.searchsorted(levels, needed), len(levels) - 1)]
+    segments = np.minimum(segments, max_segments)
+    return np.where(radius < LOD_QUAD_RADIUS, QUAD, segments)
\ No newline at end of file
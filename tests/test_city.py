@@ -0,0 +1,14 @@
+"""Chunk kota: gedung tidak melewati batas chunk."""
+from building import CHUNK_WIDTH, CityChunk
+
+
+def test_adjacent_chunks_do_not_overlap():
+    chunks = [CityChunk(index) for index in range(-2, 4)]
+    for chunk in chunks:
+        for building in chunk.back + chunk.main:
+            xs = [x for polygon in building.outlines() for x, _ in polygon]
+            assert chunk.start <= min(xs) and max(xs) <= chunk.end
+    # Layer depan (dengan jendela) chunk bersebelahan tidak boleh beririsan di seam
+    for left, right in zip(chunks, chunks[1:]):
+        assert right.start - left.start == CHUNK_WIDTH
+        assert max(b.x + b.width for b in left.main) <= min(b.x for b in right.main)
\ No newline at end of file
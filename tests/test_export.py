@@ -0,0 +1,30 @@
+"""Thread penulis frame ekspor."""
+import time
+import numpy as np
+import pytest
+from export import FrameWriter
+
+
+def test_writer_writes_all_frames(tmp_path):
+    writer = FrameWriter(str(tmp_path), "raw", frame_bytes=4 * 4 * 4, threads=3)
+    for index in range(10):
+        writer.submit(index, np.full((4, 4, 4), index, dtype=np.uint8))
+    writer.close()
+    assert writer.written == 10
+    assert sorted(p.name for p in tmp_path.iterdir())[0] == "frame_00000.rgba"
+    assert (tmp_path / "frame_00007.rgba").read_bytes() == bytes([7]) * 64
+
+
+def test_writer_reports_any_error(tmp_path):
+    # Galat selain OSError (di sini array tanpa kanal warna) tidak boleh hilang
+    # bersama thread: submit berikutnya dan close() melaporkannya
+    writer = FrameWriter(str(tmp_path), "png", frame_bytes=64, threads=2)
+    writer.submit(0, np.zeros(16, dtype=np.uint8))
+    deadline = time.monotonic() + 5
+    while writer.error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert isinstance(writer.error, IndexError)
+    with pytest.raises(IndexError):
+        writer.submit(1, np.zeros((4, 4, 4), dtype=np.uint8))
+    with pytest.raises(IndexError):
+        writer.close()
@@ -0,0 +1,143 @@
+"""Kembang api dengan sistem partikel yang disuntikkan."""
+import math
+from types import SimpleNamespace
+
+import numpy as np
+from particle_system import ParticleSystem, particle_system
+from config import Config, configure
+from explosion_template import ExplosionBurst
+from firework import Firework, update_fireworks
+
+
+def test_isolated_systems():
+    # Sistem baru yang kosong (len() == 0) harus tetap dipakai, bukan sistem global
+    global_count = particle_system.count
+    first, second = ParticleSystem(), ParticleSystem()
+    fireworks = {system: [Firework([0.0, -8.0], system=system, rng=np.random.default_rng(1))]
+                 for system in (first, second)}
+    assert first.count == second.count == 1
+    assert particle_system.count == global_count
+
+    # Jalankan sampai meledak; kedua sistem berkembang sama dan tetap terpisah
+    for _ in range(120):
+        for system in (first, second):
+            fireworks[system] = update_fireworks(fireworks[system], 1 / 60, system)
+    assert first.count > 1
+    assert first.count == second.count
+    assert np.array_equal(first.position[:first.count], second.position[:second.count])
+    assert particle_system.count == global_count
+
+
+# Salinan kecil loop per partikel Firework.update sebelum sistem array
+# (tanpa ekor), sebagai acuan hasil visual update yang divektorkan
+def reference_update(particles, dt):
+    gravity = [0.0, -9.8]
+    expansion_boost = 1.2
+    drag_factor = 0.2
+    for p in particles:
+        if not p.is_launch_particle and not p.has_peaked and p.velocity[1] < 0:
+            p.has_peaked = True
+            p.peak_time = p.age
+        if not p.is_launch_particle and p.expansion_phase and p.age < p.expansion_time:
+            p.velocity[0] *= (1.0 + 0.1 * dt * expansion_boost)
+            p.velocity[1] *= (1.0 + 0.1 * dt * expansion_boost)
+            p.velocity[0] += gravity[0] * dt * 0.3
+            p.velocity[1] += gravity[1] * dt * 0.3
+        else:
+            p.expansion_phase = False
+            if not p.is_launch_particle:
+                speed = math.sqrt(p.velocity[0] ** 2 + p.velocity[1] ** 2)
+                if speed > 0.5:
+                    drag = drag_factor * speed * dt
+                    p.velocity[0] *= (1.0 - drag)
+                    p.velocity[1] *= (1.0 - drag)
+            p.velocity[0] += gravity[0] * dt
+            p.velocity[1] += gravity[1] * dt
+        p.position[0] += p.velocity[0] * dt
+        p.position[1] += p.velocity[1] * dt
+
+        p.age += dt
+        age_ratio = p.age / p.lifetime
+        if not p.is_launch_particle:
+            fade_start = 0.6
+            fade = 1.0 if age_ratio < fade_start else 1.0 - (age_ratio - fade_start) / (1.0 - fade_start)
+            if p.has_peaked:
+                time_since_peak = p.age - p.peak_time
+                fall_fade_factor = min(1.0, abs(p.velocity[1]) / 5.0) * p.fall_fade_speed
+                fade_multiplier = max(0.0, 1.0 - time_since_peak * fall_fade_factor)
+                height_factor = max(0.0, min(1.0, (p.position[1] + 8) / 10.0))
+                fade *= fade_multiplier * height_factor
+            p.alpha = fade
+        else:
+            p.alpha = 1.0 - age_ratio
+
+        if p.is_launch_particle:
+            p.size = p.initial_size * (1.0 + 2.0 * (1.0 - abs(p.velocity[1]) / 15.0))
+        else:
+            if p.is_curve_end:
+                p.size = p.initial_size * (0.7 + 0.2 * math.sin(p.age * 8))
+            elif p.expansion_phase and p.age < p.expansion_time:
+                p.size = p.initial_size * (1.0 + p.age / p.expansion_time * 0.5)
+            else:
+                p.size = p.initial_size * (1.0 - age_ratio * 0.5)
+            p.rotation += p.rotation_speed * dt
+
+def snapshot(system):
+    # Salin keadaan setiap baris sistem menjadi partikel objek untuk acuan
+    return [SimpleNamespace(
+        position=list(system.position[i]), velocity=list(system.velocity[i]), age=system.age[i],
+        lifetime=system.lifetime[i], initial_size=system.initial_size[i], size=system.size[i],
+        alpha=system.color[i, 3], rotation=system.rotation[i], rotation_speed=system.rotation_speed[i],
+        is_launch_particle=bool(system.is_launch_particle[i]), is_curve_end=bool(system.is_curve_end[i]),
+        expansion_phase=bool(system.expansion_phase[i]), expansion_time=system.expansion_time[i],
+        has_peaked=bool(system.has_peaked[i]), peak_time=system.peak_time[i],
+        fall_fade_speed=system.fall_fade_speed[i]) for i in range(system.count)]
+
+def assert_matches(system, particles):
+    n = system.count
+    assert n == len(particles)
+    for name, actual in (("position", system.position[:n]), ("velocity", system.velocity[:n]),
+                         ("alpha", system.color[:n, 3]), ("size", system.size[:n]),
+                         ("rotation", system.rotation[:n])):
+        expected = np.array([getattr(p, name) for p in particles])
+        assert np.allclose(actual, expected), name
+
+def test_vectorized_update_matches_per_particle_loop():
+    configure(Config())
+    dt = 1 / 60
+    system = ParticleSystem()
+    fireworks = [Firework([1.0, -8.0], system=system, rng=np.random.default_rng(5))]
+
+    # Fase peluncuran sampai sebelum puncak
+    particles = snapshot(system)
+    for _ in range(80):
+        fireworks = update_fireworks(fireworks, dt, system)
+        reference_update(particles, dt)
+    assert_matches(system, particles)
+
+    # Fase ledakan: mulai dari partikel yang baru dipancarkan; dalam 0.5 detik
+    # belum ada partikel yang mati atau dibuang sehingga baris tetap sejajar
+    while not fireworks[0].exploded:
+        fireworks = update_fireworks(fireworks, dt, system)
+    assert not system.is_launch_particle[:system.count].any()
+    particles = snapshot(system)
+    for _ in range(30):
+        fireworks = update_fireworks(fireworks, dt, system)
+        reference_update(particles, dt)
+    assert_matches(system, particles)
+
+
+def test_burst_keeps_point_count_per_curve():
+    # Setiap kurva punya jumlah titik sendiri dengan geometri yang sama
+    # seperti loop per kurva aslinya
+    points = [10, 13, 15, 11]
+    burst = ExplosionBurst(points)
+    assert len(burst) == sum(points)
+    for curve, n in enumerate(points):
+        rows = burst.curve == curve
+        i = np.arange(n)
+        bend = np.sin(i / n * math.pi)
+        angle = 2 * math.pi * curve / len(points) + bend * 0.5
+        assert np.allclose(burst.directions[rows], np.column_stack((np.cos(angle), np.sin(angle))))
+        assert np.allclose(burst.speed_profile[rows], 1.0 + bend * 0.4)
+        assert np.array_equal(np.flatnonzero(burst.ends[rows]), [0, n - 1])
@@ -0,0 +1,115 @@
+"""Pertunjukan: sistem partikel sendiri, rekaman, dan replay."""
+import numpy as np
+from config import Config, settings, configure, make_config
+from particle_system import ParticleSystem, particle_system
+from governor import QualityGovernor, DEGRADE_FRAMES
+from show import Show
+
+
+def test_show_uses_empty_system():
+    global_count = particle_system.count
+    system = ParticleSystem()
+    show = Show(7, system=system)
+    assert show.system is system
+    show.launch()
+    assert system.count == 1
+    assert particle_system.count == global_count
+
+def test_replay_keeps_launch_order_within_step(tmp_path):
+    # Beberapa peluncuran dalam satu langkah dengan x menurun: replay tidak
+    # boleh mengurutkannya menurut x (stream acak mengikuti urutan peluncuran)
+    def run(show, launches=()):
+        for step in range(90):
+            for x in launches if step in (0, 3) else ():
+                show.launch(x)
+            show.update()
+        return show.system.position[:show.system.count].copy()
+
+    recorded = Show(11, system=ParticleSystem())
+    expected = run(recorded, launches=(4.0, -1.0, 2.5))
+    path = tmp_path / "sesi.json"
+    recorded.save(path)
+
+    replayed = Show.load(path, system=ParticleSystem())
+    assert np.array_equal(run(replayed), expected)
+    assert replayed.launches == recorded.launches
+
+
+def test_replay_applies_recorded_config(tmp_path):
+    # Rekaman dibuat dengan preset "low"; replay di bawah preset lain harus
+    # menerapkan konfigurasi simulasi rekaman dan memberi hasil yang sama
+    def run(show, launch=False):
+        for step in range(120):
+            if launch and step in (0, 10):
+                show.launch()
+            show.update()
+        return show.system.position[:show.system.count].copy()
+
+    try:
+        configure(make_config("low"))
+        recorded = Show(5, system=ParticleSystem())
+        expected = run(recorded, launch=True)
+        path = tmp_path / "sesi.json"
+        recorded.save(path)
+
+        configure(make_config("ultra", {"gravity": [0.0, -3.0]}))
+        replayed = Show.load(path, system=ParticleSystem())
+        assert settings.points_scale == 0.5
+        assert settings.gravity == (0.0, -9.8)
+        assert np.array_equal(run(replayed), expected)
+    finally:
+        configure(Config())
+
+
+def test_replay_applies_quality_changes(tmp_path):
+    # Governor menurunkan lalu menaikkan kenop simulasi di tengah pertunjukan;
+    # replay harus menerapkan perubahan itu pada langkah yang sama
+    low = {"points_scale": 0.4, "max_particles": 2000, "circle_segments": 4, "glow": False,
+           "trail_interval": 0.08, "trail_count": 1}
+    high = {"points_scale": 1.0, "max_particles": None, "circle_segments": 16, "glow": True,
+            "trail_interval": 0.02, "trail_count": 2}
+
+    def run(show, record=False):
+        for step in range(150):
+            if record and step in (0, 30, 60):
+                show.launch()
+            if record and step == 20:
+                show.set_quality(low)
+            if record and step == 70:
+                show.set_quality(high)
+            show.update()
+        return show.system.position[:show.system.count].copy()
+
+    try:
+        recorded = Show(3, system=ParticleSystem())
+        expected = run(recorded, record=True)
+        path = tmp_path / "sesi.json"
+        recorded.save(path)
+
+        configure(Config())
+        replayed = Show.load(path, system=ParticleSystem())
+        assert np.array_equal(run(replayed), expected)
+        assert replayed.quality == recorded.quality
+    finally:
+        configure(Config())
+
+
+def test_governor_changes_settings_only_through_show():
+    # Governor hanya mengembalikan kenop tingkat baru; settings berubah sekali,
+    # lewat Show.set_quality yang memeriksa dan mencatatnya
+    try:
+        configure(Config())
+        before = {name: getattr(settings, name) for name in ("points_scale", "trail_interval", "glow")}
+        governor = QualityGovernor(0.01)
+        knobs = None
+        for _ in range(DEGRADE_FRAMES):
+            knobs = governor.record(1.0) or knobs
+        assert knobs == governor.levels[1]
+        assert {name: getattr(settings, name) for name in before} == before
+
+        show = Show(5, system=ParticleSystem())
+        show.set_quality(knobs)
+        assert settings.points_scale == knobs["points_scale"]
+        assert show.quality == [[0, knobs]]
+    finally:
+        configure(Config())
@@ -0,0 +1,79 @@
+"""
+Pembangun geometri ekor partikel secara batch.
+Ekor semua partikel dikumpulkan menjadi satu array garis (pasangan vertex)
+dan satu array titik yang diurutkan per kelompok ukuran, sehingga seluruh
+ekor dalam satu frame cukup digambar dengan beberapa glDrawArrays saja.
+Koordinat tetap dalam satuan dunia; transformasi ke layar oleh matriks kamera.
+"""
+import numpy as np
+from trail_buffer import TRAIL_MAX_AGE, TRAIL_ALPHA
+
+VERTEX_SIZE = 6             # x, y, r, g, b, a
+TRAIL_POINT_SIZE = 0.2      # Ukuran titik ekor dalam satuan dunia per satuan size
+
+class TrailBatch:
+    """
+    Kelas untuk membangun buffer garis dan titik semua ekor partikel.
+    Titik dikelompokkan per ukuran piksel bulat, satu glPointSize per
+    kelompok; titik tanpa antialiasing memang dirasterisasi dengan ukuran
+    yang dibulatkan, sehingga hasilnya (hampir) sama dengan ukuran pecahan.
+    """
+    def __init__(self):
+        self.lines = np.zeros((0, VERTEX_SIZE), dtype=np.float32)
+        self.points = np.zeros((0, VERTEX_SIZE), dtype=np.float32)
+        self.line_count = 0                 # Jumlah vertex garis terisi
+        self.point_count = 0                # Jumlah vertex titik terisi
+        self.buckets = []                   # (ukuran piksel, indeks awal, jumlah) per kelompok titik
+
+    def build(self, system, rows, scale, bounds=None):
+        """
+        Isi buffer dari ekor baris partikel `rows`; kembalikan jumlah titik.
+        `scale` adalah piksel layar per satuan dunia (untuk ukuran titik).
+        Ekor yang kotak pembatasnya di luar `bounds` (kiri, kanan, bawah,
+        atas) dibuang sebelum vertexnya dibangun.
+        """
+        trails = system.trails
+        depth = trails.depth
+
+        # Urutan slot dari tertua (posisi head) ke terbaru untuk setiap baris
+        order = (np.arange(depth)[None, :] + trails.head[rows, None]) % depth
+        age = system.time - np.take_along_axis(trails.birth[rows], order, axis=1)
+        alive = age <= TRAIL_MAX_AGE
+        position = trails.position[rows[:, None], order]
+        if bounds is not None:
+            left, right, bottom, top = bounds
+            x = np.where(alive, position[:, :, 0], np.nan)
+            y = np.where(alive, position[:, :, 1], np.nan)
+            keep = ~((np.fmax.reduce(x, axis=1) < left) | (np.fmin.reduce(x, axis=1) > right) |
+                     (np.fmax.reduce(y, axis=1) < bottom) | (np.fmin.reduce(y, axis=1) > top))
+            keep &= alive.any(axis=1)
+            rows, order, age, alive, position = rows[keep], order[keep], age[keep], alive[keep], position[keep]
+
+        # Vertex semua slot: posisi, warna partikel, dan alpha dari umur segmen
+        k = len(rows)
+        vertices = np.empty((k, depth, VERTEX_SIZE), dtype=np.float32)
+        vertices[:, :, :2] = position
+        vertices[:, :, 2:5] = system.color[rows, None, :3]
+        fade = 1.0 - (np.minimum(age, TRAIL_MAX_AGE) / TRAIL_MAX_AGE) ** 1.5
+        vertices[:, :, 5] = fade * (system.color[rows, 3] * TRAIL_ALPHA)[:, None]
+
+        # Garis: setiap pasangan slot berurutan yang keduanya masih hidup
+        pairs = alive[:, :-1] & alive[:, 1:]
+        self.line_count = 2 * int(np.count_nonzero(pairs))
+        if self.line_count > len(self.lines):
+            self.lines = np.zeros((max(self.line_count, 2 * len(self.lines)), VERTEX_SIZE), dtype=np.float32)
+        self.lines[0:self.line_count:2] = vertices[:, :-1][pairs]
+        self.lines[1:self.line_count:2] = vertices[:, 1:][pairs]
+
+        # Titik: diurutkan per ukuran piksel bulat (minimal 1 piksel)
+        points = vertices[alive]
+        pixels = trails.size[rows[:, None], order][alive] * (TRAIL_POINT_SIZE * scale)
+        bucket = np.maximum(1, np.rint(pixels)).astype(np.intp)
+        sort = np.argsort(bucket, kind="stable")
+        self.point_count = len(points)
+        if self.point_count > len(self.points):
+            self.points = np.zeros((max(self.point_count, 2 * len(self.points)), VERTEX_SIZE), dtype=np.float32)
+        self.points[:self.point_count] = points[sort]
+        buckets, starts, counts = np.unique(bucket[sort], return_index=True, return_counts=True)
+        self.buckets = list(zip(buckets.tolist(), starts.tolist(), counts.tolist()))
+        return self.point_count
\ No newline at end of file
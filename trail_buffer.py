@@ -0,0 +1,151 @@
+"""
+Penyimpanan ekor partikel berbasis ring buffer.
+Setiap partikel memiliki slot ekor dengan kapasitas tetap dalam array
+yang dialokasikan di awal, sehingga tidak ada list/dict baru per frame.
+"""
+import math
+import numpy as np
+
+TRAIL_MAX_AGE = 0.7         # Umur maksimum ekor (detik)
+TRAIL_ALPHA = 0.7           # Pengali transparansi ekor terhadap partikel
+
+def trail_depth(interval, count, step):
+    """
+    Kapasitas ekor per partikel yang cukup untuk TRAIL_MAX_AGE: emisi terjadi
+    paling cepat setiap ceil(interval / step) langkah simulasi dengan `count`
+    segmen per emisi, ditambah satu emisi cadangan.
+    """
+    every = max(1, math.ceil(interval / step - 1e-6)) * step
+    return (int(TRAIL_MAX_AGE / every) + 2) * count
+
+
+class TrailBuffer:
+    """
+    Kelas untuk menyimpan ekor semua partikel dalam ring buffer.
+    Menyimpan posisi, waktu lahir, dan ukuran setiap segmen ekor.
+    Transparansi tidak disimpan; dihitung dari umur saat dibaca.
+    """
+    def __init__(self, capacity, depth):
+        self.depth = depth
+        self.capacity = 0
+        self.allocate(capacity, 0)
+        self.view = TrailView(self)
+
+    def allocate(self, capacity, count):
+        # Alokasi (atau perbesar) buffer dengan menyalin `count` baris pertama
+        position = np.zeros((capacity, self.depth, 2), dtype=np.float32)
+        birth = np.full((capacity, self.depth), -np.inf)
+        size = np.zeros((capacity, self.depth), dtype=np.float32)
+        head = np.zeros(capacity, dtype=np.intp)
+        if self.capacity:
+            position[:count] = self.position[:count]
+            birth[:count] = self.birth[:count]
+            size[:count] = self.size[:count]
+            head[:count] = self.head[:count]
+        self.position, self.birth, self.size, self.head = position, birth, size, head
+        self.capacity = capacity
+
+    def deepen(self, depth, count):
+        """
+        Perbesar kapasitas ekor per partikel menjadi `depth` untuk `count`
+        baris pertama; segmen lama disusun ulang dari tertua di slot 0.
+        """
+        order = (np.arange(self.depth)[None, :] + self.head[:count, None]) % self.depth
+        position = np.zeros((self.capacity, depth, 2), dtype=np.float32)
+        birth = np.full((self.capacity, depth), -np.inf)
+        size = np.zeros((self.capacity, depth), dtype=np.float32)
+        position[:count, :self.depth] = np.take_along_axis(self.position[:count], order[:, :, None], axis=1)
+        birth[:count, :self.depth] = np.take_along_axis(self.birth[:count], order, axis=1)
+        size[:count, :self.depth] = np.take_along_axis(self.size[:count], order, axis=1)
+        self.head[:] = 0
+        self.head[:count] = self.depth
+        self.position, self.birth, self.size = position, birth, size
+        self.depth = depth
+        self.view = TrailView(self)
+
+    def clear(self, rows):
+        """Kosongkan ekor untuk baris partikel yang baru dipakai."""
+        self.birth[rows] = -np.inf
+        self.head[rows] = 0
+
+    def push(self, rows, position, size, time):
+        """Tambahkan satu segmen ekor ke setiap baris di `rows`."""
+        slot = self.head[rows]
+        self.position[rows, slot] = position
+        self.birth[rows, slot] = time
+        self.size[rows, slot] = size
+        self.head[rows] = (slot + 1) % self.depth
+
+    def compact(self, indices):
+        # Ikuti compaction ParticleSystem agar baris ekor tetap sejajar
+        n = len(indices)
+        for array in (self.position, self.birth, self.size, self.head):
+            array[:n] = array[indices]
+
+    def lengths(self, count, time):
+        """Jumlah segmen ekor yang masih hidup untuk `count` baris pertama."""
+        return np.count_nonzero(time - self.birth[:count] <= TRAIL_MAX_AGE, axis=1)
+
+
+class TrailView:
+    """
+    Tampilan ekor satu partikel, diurutkan dari segmen tertua ke terbaru.
+    Memakai ulang array scratch yang sama untuk setiap pembacaan, sehingga
+    isinya hanya valid sampai `load` dipanggil lagi.
+    """
+    def __init__(self, buffer):
+        depth = buffer.depth
+        self.buffer = buffer
+        self.start = depth                  # Indeks segmen hidup pertama
+        self._steps = np.arange(depth)
+        self._order = np.zeros(depth, dtype=np.intp)
+        self._age = np.zeros(depth)
+        self._alive = np.zeros(depth, dtype=np.bool_)
+        self._positions = np.zeros((depth, 2), dtype=np.float32)
+        self._colors = np.zeros((depth, 4), dtype=np.float32)
+        self._sizes = np.zeros(depth, dtype=np.float32)
+
+    def load(self, row, color, time):
+        buffer = self.buffer
+        order = self._order
+        age = self._age
+
+        # Urutan slot dari tertua (posisi head) ke terbaru
+        np.add(self._steps, buffer.head[row], out=order)
+        np.remainder(order, buffer.depth, out=order)
+        np.take(buffer.birth[row], order, out=age)
+        np.subtract(time, age, out=age)
+
+        # Segmen kosong dan kedaluwarsa selalu berada di depan urutan
+        np.less_equal(age, TRAIL_MAX_AGE, out=self._alive)
+        self.start = buffer.depth - np.count_nonzero(self._alive)
+        if self.start == buffer.depth:
+            return self
+
+        np.take(buffer.position[row], order, axis=0, out=self._positions)
+        np.take(buffer.size[row], order, out=self._sizes)
+
+        # Memudar ekor seiring waktu dengan kurva lebih lambat
+        alpha = self._colors[:, 3]
+        np.minimum(age, TRAIL_MAX_AGE, out=age)
+        np.divide(age, TRAIL_MAX_AGE, out=age)
+        np.power(age, 1.5, out=age)
+        np.subtract(1.0, age, out=age)
+        np.multiply(age, color[3] * TRAIL_ALPHA, out=alpha, casting="unsafe")
+        self._colors[:, :3] = color[:3]
+        return self
+
+    def __len__(self):
+        return self.buffer.depth - self.start
+
+    @property
+    def positions(self):
+        return self._positions[self.start:]
+
+    @property
+    def colors(self):
+        return self._colors[self.start:]
+
+    @property
+    def sizes(self):
+        return self._sizes[self.start:]
\ No newline at end of file
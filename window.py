@@ -0,0 +1,158 @@
+"""
+Mode jendela: game loop interaktif dengan pygame dan OpenGL.
+"""
+import pygame
+from pygame.locals import *
+from OpenGL.GL import *
+from OpenGL.GLUT import *
+import time
+import sys
+
+from config import settings
+from clock import FixedStepClock
+from building import generate_city, city
+from camera import camera
+import renderer
+import render_queue
+import bloom
+from renderer import init_gl, begin_frame, draw_background, draw_particles, submit_frame, draw_hud
+from profiler import FrameProfiler
+from governor import QualityGovernor
+from particle_system import particle_system
+from show import Show
+
+CAMERA_ZOOM_STEP = 1.15     # Pengali zoom per langkah roda mouse
+
+# Fase dan counter profiler yang dicatat game loop (kolom CSV)
+PROFILE_PHASES = ("events", "update", "background", "particles", "submit", "hud", "flip", "tick")
+PROFILE_COUNTERS = ("steps", "particles", "draw_calls", "state_changes", "state_saved", "quality",
+                    "trail_segments")
+
+def run_window(args):
+    """
+    Menjalankan simulasi dengan jendela pygame/OpenGL.
+    Menangani inisialisasi, game loop, dan cleanup.
+    """
+    # Setup pertunjukan: dari rekaman, seed argumen, atau seed acak baru.
+    # Rekaman menerapkan konfigurasi simulasinya (termasuk ukuran layar), jadi
+    # dimuat sebelum jendela dibuat
+    if args.replay:
+        show = Show.load(args.replay)
+    else:
+        show = Show(args.seed if args.seed is not None else int(time.time() * 1000) % 10000)
+    print("Seed pertunjukan: %d" % show.seed)
+    
+    # Inisialisasi
+    pygame.init()
+    display = pygame.display.set_mode((settings.width, settings.height), DOUBLEBUF | OPENGL)
+    pygame.display.set_caption("Kota Malam dengan Kembang Api - PyOpenGL")
+    glutInit()
+    
+    init_gl()
+    generate_city()
+    camera.reset()
+    
+    # Setup variabel game
+    last_time = time.perf_counter()
+    clock = pygame.time.Clock()
+    sim_clock = FixedStepClock(settings.simulation_step, settings.max_simulation_steps)
+    
+    # Profiler fase per frame (panggilan GL dihitung di modul yang menggambar)
+    profiler = FrameProfiler(gl_modules=(renderer, render_queue, bloom, sys.modules[__name__]),
+                             csv_path=args.profile_csv, phases=PROFILE_PHASES, counters=PROFILE_COUNTERS)
+    if args.profile:
+        profiler.toggle_hud()
+    
+    # Governor kualitas adaptif untuk menjaga anggaran waktu frame. Saat
+    # replay, perubahan kualitas diambil dari rekaman, bukan dari governor
+    governor = None
+    if settings.adaptive_quality and not args.replay:
+        governor = QualityGovernor(1.0 / settings.fps, log_path=args.quality_log)
+    
+    # Game loop
+    running = True
+    while running:
+        # Update waktu
+        current_time = time.perf_counter()
+        frame_time = current_time - last_time
+        last_time = current_time
+        profiler.begin_frame()
+        
+        # Handle events
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    # Luncurkan kembang api
+                    show.launch()
+                elif event.key == pygame.K_F3:
+                    profiler.toggle_hud()
+                elif event.key == pygame.K_HOME:
+                    camera.reset()
+                elif event.key == pygame.K_ESCAPE:
+                    running = False
+            elif event.type == pygame.MOUSEWHEEL:
+                # Zoom ke arah kursor (y layar pygame dihitung dari atas)
+                mouse_x, mouse_y = pygame.mouse.get_pos()
+                camera.zoom_at(CAMERA_ZOOM_STEP ** event.y, mouse_x, settings.height - mouse_y)
+            elif event.type == pygame.MOUSEMOTION and event.buttons[0]:
+                # Seret dengan tombol kiri untuk menggeser pandangan
+                camera.pan(event.rel[0], -event.rel[1])
+        profiler.mark("events")
+        
+        # Update dengan langkah tetap, lalu interpolasi posisi untuk render
+        steps = sim_clock.advance(frame_time)
+        for _ in range(steps):
+            show.update(sim_clock.step)
+        particle_system.interpolate(sim_clock.alpha)
+        city.update(particle_system.time)
+        profiler.mark("update")
+        
+        # Render
+        begin_frame()
+        
+        # Kumpulkan latar belakang (display list) dan kembang api ke antrian
+        # render, lalu kirim ke GL terurut per state
+        draw_background()
+        profiler.mark("background")
+        draw_particles(particle_system)
+        profiler.mark("particles")
+        submit_frame()
+        profiler.mark("submit")
+        
+        if profiler.show_hud:
+            draw_hud(profiler.hud_lines)
+            profiler.mark("hud")
+        
+        # Finalisasi render; waktu kerja diukur sebelum flip karena flip bisa
+        # menunggu vsync. Kenop tingkat baru diterapkan (dan direkam) hanya
+        # lewat pertunjukan
+        if governor is not None:
+            knobs = governor.record(time.perf_counter() - current_time)
+            if knobs is not None:
+                show.set_quality(knobs)
+        pygame.display.flip()
+        profiler.mark("flip")
+        clock.tick(settings.fps)
+        profiler.mark("tick")
+        
+        if profiler.enabled:
+            profiler.count("steps", steps)
+            profiler.count("particles", particle_system.count)
+            profiler.count("draw_calls", renderer.render_queue.draw_calls)
+            profiler.count("state_changes", renderer.render_queue.state_changes)
+            profiler.count("state_saved", renderer.render_queue.state_saved)
+            if governor is not None:
+                profiler.count("quality", governor.level)
+            profiler.count("trail_segments", int(particle_system.trails.lengths(
+                particle_system.count, particle_system.time).sum()))
+        profiler.end_frame()
+    
+    # Cleanup
+    if args.record_launches:
+        show.save(args.record_launches)
+    if governor is not None:
+        governor.close()
+    profiler.close()
+    pygame.quit()
\ No newline at end of file